@@ -0,0 +1,90 @@
+"""Copies of the model classes as this package started out, for benchmarks
+
+Plain (dict backed, mutable) attrs classes with the original validators and
+no derived metrics, so a benchmark's "legacy" side costs what the original
+code did rather than what today's classes do.
+"""
+
+from typing import Any, List, Optional
+
+import attr
+
+
+@attr.s
+class LegacyDriver(object):
+    name: str = attr.ib()
+
+    @name.validator
+    def is_name_at_least_one_character(
+            self, attribute: attr.Attribute, value: Any
+    ) -> Optional[ValueError]:
+        if len(value) < 1:
+            raise ValueError("'name' needs to be at least 1 character long")
+
+
+@attr.s
+class LegacyTripTime(object):
+    hour: int = attr.ib()
+    min: int = attr.ib()
+
+    @hour.validator
+    def is_between_zero_and_twenty_three(
+            self, attribute: attr.Attribute, value: Any
+    ) -> Optional[ValueError]:
+        if value < 0 or value > 23:
+            raise ValueError("'hour' should be between 0 and 23, inclusive")
+
+    @min.validator
+    def is_between_zero_and_fifty_nine(
+            self, attribute: attr.Attribute, value: Any
+    ) -> Optional[ValueError]:
+        if value < 0 or value > 59:
+            raise ValueError("'hour' should be between 0 and 59, inclusive")
+
+    def __sub__(self, other: "LegacyTripTime") -> int:
+        hours_difference = self.hour - other.hour
+        mins_difference = self.min - other.min
+        return (hours_difference * 60) + mins_difference
+
+
+@attr.s
+class LegacyTrip(object):
+    start_time: LegacyTripTime = attr.ib()
+    end_time: LegacyTripTime = attr.ib()
+    miles_driven: float = attr.ib()
+
+    @start_time.validator
+    def starts_before_end_time(
+            self, attribute: attr.Attribute, value: Any
+    ) -> Optional[ValueError]:
+        if value >= self.end_time:
+            raise ValueError(
+                'start_time should be before end_time'
+            )
+
+    @property
+    def duration(self) -> int:
+        return self.end_time - self.start_time
+
+    @property
+    def mph(self) -> float:
+        return self.miles_driven / ((self.end_time - self.start_time) / 60)
+
+
+@attr.s
+class LegacyTripLog(object):
+    driver: LegacyDriver = attr.ib()
+    _trips: List[LegacyTrip] = attr.ib(init=False, default=attr.Factory(list))
+
+    @driver.validator
+    def is_a_driver(self, attribute, value) -> Optional[TypeError]:
+        if value.__class__ != LegacyDriver:
+            raise TypeError("'driver' needs to be a Driver object")
+
+    @property
+    def trips(self) -> List[LegacyTrip]:
+        return self._trips
+
+    def add_trip(self, trip: LegacyTrip) -> "LegacyTripLog":
+        self._trips.append(trip)
+        return self
@@ -0,0 +1,60 @@
+"""Measures resident memory of many in-memory trips, before and after slots
+
+Each variant is built in a fresh process so peak RSS deltas do not overlap.
+Run from the repository root with ``python -m benchmarks.memory``.
+"""
+
+import multiprocessing
+import resource
+
+import click
+
+from root_driving_history.trip import Trip, TripTime
+
+from .legacy import LegacyTrip, LegacyTripTime
+
+
+VARIANTS = {
+    "dict": (LegacyTrip, LegacyTripTime),
+    "slots": (Trip, TripTime),
+}
+
+
+def _build_trips(variant: str, trips: int, queue) -> None:
+    trip_class, trip_time_class = VARIANTS[variant]
+    # A plain list: TripLog needs the metrics that LegacyTrip lacks
+    held_trips = []
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    for index in range(trips):
+        start = index % (23 * 60)
+        held_trips.append(trip_class(
+            trip_time_class(*divmod(start, 60)),
+            trip_time_class(*divmod(start + 1 + index % 59, 60)),
+            float(index % 100)
+        ))
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux
+    queue.put((after - before) * 1024)
+
+
+@click.command()
+@click.option("--trips", default=10_000_000, show_default=True)
+def main(trips):
+    queue = multiprocessing.Queue()
+    results = {}
+    for variant in VARIANTS:
+        process = multiprocessing.Process(
+            target=_build_trips, args=(variant, trips, queue)
+        )
+        process.start()
+        results[variant] = queue.get()
+        process.join()
+        click.echo("{:<6} {:10.1f} MiB {:8.1f} bytes/trip".format(
+            variant, results[variant] / 2 ** 20, results[variant] / trips
+        ))
+
+    click.echo("reduction {:7.2f}x".format(results["dict"] / results["slots"]))
+
+
+if __name__ == "__main__":
+    main()
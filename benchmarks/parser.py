@@ -0,0 +1,143 @@
+"""Compares the single-pass tokenizer with the original three-regex parser
+
+Run from the repository root with ``python -m benchmarks.parser``.
+"""
+
+import re
+import time
+from collections import defaultdict
+
+import click
+
+from root_driving_history.parser import DRIVER_KEYWORD_REGEX
+from root_driving_history.parser import TRIP_KEYWORD_REGEX
+from root_driving_history.parser import parse_input_log
+from root_driving_history.parser import tokenize
+from root_driving_history.trip import to_milli_miles
+
+from .legacy import LegacyDriver, LegacyTrip, LegacyTripLog, LegacyTripTime
+from .synthetic import generate_log_lines
+
+
+def legacy_parse_input_log(raw_data: str):
+    """The findall + re.match + split parser this package started with,
+    building the model classes it started with."""
+    driver_lines = re.findall(DRIVER_KEYWORD_REGEX, raw_data)
+    trip_lines = re.findall(TRIP_KEYWORD_REGEX, raw_data)
+    trip_logs = [
+        LegacyTripLog(LegacyDriver(line.split(" ")[1]))
+        for line in driver_lines if re.match(DRIVER_KEYWORD_REGEX, line)
+    ]
+    trips_by_driver = defaultdict(list)
+    for line in trip_lines:
+        if re.match(TRIP_KEYWORD_REGEX, line):
+            _, driver_name, _, _, _ = line.split(" ")
+        if re.match(TRIP_KEYWORD_REGEX, line):
+            _, _, start, end, miles = line.split(" ")
+            start_hour, start_min = [int(p) for p in start.split(":")]
+            end_hour, end_min = [int(p) for p in end.split(":")]
+            trips_by_driver[driver_name].append(LegacyTrip(
+                LegacyTripTime(start_hour, start_min),
+                LegacyTripTime(end_hour, end_min),
+                float(miles)
+            ))
+    driver_names = [trip_log.driver.name for trip_log in trip_logs]
+    for driver_name, trips in trips_by_driver.items():
+        try:
+            index = driver_names.index(driver_name)
+        except ValueError:
+            continue
+        for trip in trips:
+            trip_logs[index].add_trip(trip)
+    return trip_logs
+
+
+def legacy_tokenize(raw_data: str):
+    """Only the regex work of ``legacy_parse_input_log``."""
+    tokens = [
+        ("Driver", line.split(" ")[1])
+        for line in re.findall(DRIVER_KEYWORD_REGEX, raw_data)
+        if re.match(DRIVER_KEYWORD_REGEX, line)
+    ]
+    for line in re.findall(TRIP_KEYWORD_REGEX, raw_data):
+        if re.match(TRIP_KEYWORD_REGEX, line):
+            _, driver_name, _, _, _ = line.split(" ")
+        if re.match(TRIP_KEYWORD_REGEX, line):
+            _, _, start, end, miles = line.split(" ")
+            start_hour, start_min = [int(p) for p in start.split(":")]
+            end_hour, end_min = [int(p) for p in end.split(":")]
+            tokens.append((
+                "Trip", driver_name,
+                start_hour * 60 + start_min, end_hour * 60 + end_min,
+                float(miles)
+            ))
+    return tokens
+
+
+def in_milli_miles(legacy_tokens):
+    """The legacy tokens with their miles in thousandths, as ``tokenize``
+    yields them."""
+    return [
+        token[:-1] + (to_milli_miles(token[-1]),)
+        if token[0] == "Trip" else token
+        for token in legacy_tokens
+    ]
+
+
+def trip_rows(trip_logs):
+    """Each driver's name and trips in minutes and thousandths of a mile,
+    for legacy and current TripLogs alike."""
+    return [
+        (trip_log.driver.name, [
+            (
+                trip.start_time.hour * 60 + trip.start_time.min,
+                trip.end_time.hour * 60 + trip.end_time.min,
+                to_milli_miles(trip.miles_driven),
+            )
+            for trip in trip_log.trips
+        ])
+        for trip_log in trip_logs
+    ]
+
+
+def _best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+@click.command()
+@click.option("--drivers", default=1000, show_default=True)
+@click.option("--trips-per-driver", default=100, show_default=True)
+@click.option("--repeat", default=3, show_default=True)
+def main(drivers, trips_per_driver, repeat):
+    raw_data = "".join(generate_log_lines(drivers, trips_per_driver))
+    lines = raw_data.count("\n")
+
+    # Each side's results are made comparable outside of the timed calls
+    stages = [
+        ("tokenize", legacy_tokenize, in_milli_miles, lambda data: list(
+            tokenize(data.splitlines())
+        ), list),
+        ("parse", legacy_parse_input_log, trip_rows,
+         parse_input_log, trip_rows),
+    ]
+    for stage, legacy_func, legacy_rows, func, rows in stages:
+        legacy_seconds, legacy_result = _best_of(repeat, legacy_func, raw_data)
+        seconds, result = _best_of(repeat, func, raw_data)
+        assert sorted(rows(result), key=repr) == \
+            sorted(legacy_rows(legacy_result), key=repr)
+
+        click.echo("{}: {:,} lines".format(stage, lines))
+        for label, elapsed in [("legacy", legacy_seconds), ("new", seconds)]:
+            click.echo("  {:<8} {:8.3f}s {:12,.0f} lines/s".format(
+                label, elapsed, lines / elapsed
+            ))
+        click.echo("  speedup  {:8.2f}x".format(legacy_seconds / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Times the parse, filter and report stages and the end-to-end CLI
+
+Every stage runs on the same synthetic log. Timings are the best of
+``--repeat`` runs; peak memory is measured in one extra run of each stage
+under tracemalloc (Python allocations) and, for the CLI, as the peak RSS of
+the child process. Results are written as JSON so runs of different
+versions can be compared with ``--baseline``.
+
+Run from the repository root with ``python -m benchmarks.suite``.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional
+
+import click
+
+from root_driving_history.parser import parse_input_log
+from root_driving_history.report import _remove_slow_and_fast_trips
+from root_driving_history.report import create_driving_report
+
+from .synthetic import generate_log_lines
+
+
+RESULTS_VERSION = 1
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cli.py")
+
+
+def run_suite(
+        drivers: int,
+        trips_per_driver: int,
+        invalid_share: float,
+        out_of_range_share: float,
+        repeat: int,
+        seed: int = 0
+) -> Dict[str, Any]:
+    raw_data = "".join(generate_log_lines(
+        drivers, trips_per_driver, seed, invalid_share, out_of_range_share
+    ))
+    lines = raw_data.count("\n")
+    trip_logs = parse_input_log(raw_data)
+
+    stages = {
+        "parse_input_log": lambda: parse_input_log(raw_data),
+        "_remove_slow_and_fast_trips": lambda: [
+            _remove_slow_and_fast_trips(trip_log) for trip_log in trip_logs
+        ],
+        "create_driving_report": lambda: create_driving_report(trip_logs),
+    }
+    results = {
+        stage: _measure(func, repeat, lines) for stage, func in stages.items()
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "log.txt")
+        with open(log_path, "w") as f:
+            f.write(raw_data)
+        results["cli"] = _measure_cli(log_path, repeat, lines)
+
+    return {
+        "version": RESULTS_VERSION,
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "parameters": {
+            "drivers": drivers,
+            "trips_per_driver": trips_per_driver,
+            "invalid_share": invalid_share,
+            "out_of_range_share": out_of_range_share,
+            "repeat": repeat,
+            "seed": seed,
+            "lines": lines,
+        },
+        "stages": results,
+    }
+
+
+def _measure(
+        func: Callable[[], Any], repeat: int, lines: int
+) -> Dict[str, float]:
+    seconds = min(_elapsed(func) for _ in range(repeat))
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return _result(seconds, lines, peak)
+
+
+def _measure_cli(log_path: str, repeat: int, lines: int) -> Dict[str, float]:
+    timings = []
+    peak_rss = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, CLI_PATH, "--file", log_path],
+            stdout=subprocess.DEVNULL
+        )
+        # wait4 reports the resources of this one child only
+        _, status, usage = os.wait4(process.pid, 0)
+        timings.append(time.perf_counter() - start)
+        # Already reaped; stops Popen from waiting for it again
+        process.returncode = status
+        if status != 0:
+            raise RuntimeError("cli.py failed, wait status {}".format(status))
+        # ru_maxrss is reported in kilobytes on Linux
+        peak_rss = max(peak_rss, usage.ru_maxrss * 1024)
+    return _result(min(timings), lines, peak_rss)
+
+
+def _elapsed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _result(seconds: float, lines: int, peak_bytes: int) -> Dict[str, float]:
+    return {
+        "seconds": seconds,
+        "lines_per_second": lines / seconds,
+        "peak_memory_bytes": peak_bytes,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(CLI_PATH),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            check=True, universal_newlines=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _echo_results(
+        results: Dict[str, Any], baseline: Optional[Dict[str, Any]]
+) -> None:
+    click.echo("{:,} lines".format(results["parameters"]["lines"]))
+    for stage, result in results["stages"].items():
+        line = "  {:<28} {:8.3f}s {:12,.0f} lines/s {:9.1f} MiB".format(
+            stage, result["seconds"], result["lines_per_second"],
+            result["peak_memory_bytes"] / 2 ** 20
+        )
+        if baseline is not None and stage in baseline["stages"]:
+            line += " {:6.2f}x".format(
+                baseline["stages"][stage]["seconds"] / result["seconds"]
+            )
+        click.echo(line)
+
+
+@click.command()
+@click.option("--drivers", default=1000, show_default=True)
+@click.option("--trips-per-driver", default=100, show_default=True)
+@click.option("--invalid-share", default=0.0, show_default=True)
+@click.option("--out-of-range-share", default=0.1, show_default=True)
+@click.option("--repeat", default=3, show_default=True)
+@click.option(
+    "--output", "-o",
+    type=click.Path(dir_okay=False),
+    default="benchmark-results.json",
+    show_default=True,
+)
+@click.option(
+    "--baseline", "-b",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Earlier results file; prints the speedup of each stage against it",
+)
+def main(
+        drivers, trips_per_driver, invalid_share, out_of_range_share,
+        repeat, output, baseline
+):
+    results = run_suite(
+        drivers, trips_per_driver, invalid_share, out_of_range_share, repeat
+    )
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        with open(baseline) as f:
+            baseline = json.load(f)
+        if baseline["parameters"] != results["parameters"]:
+            click.echo("warning: the baseline used different parameters")
+    _echo_results(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Deterministic synthetic driving logs for benchmarks"""
+
+import random
+from typing import Iterator
+
+from root_driving_history.trip import FAST_THRESHOLD, SLOW_THRESHOLD
+
+
+# Lines the tokenizer skips without raising, as found in messy real logs
+INVALID_LINES = [
+    "# exported by the fleet gateway\n",
+    "\n",
+    "Drive {name}\n",
+    "Trip {name} 7:15 7:45 17.3\n",
+    "Trip {name} 07:15 07:45 miles\n",
+    "trip {name} 07:15 07:45 17.3\n",
+]
+
+
+def generate_log_lines(
+        drivers: int = 1000,
+        trips_per_driver: int = 100,
+        seed: int = 0,
+        invalid_share: float = 0.0,
+        out_of_range_share: float = 0.1
+) -> Iterator[str]:
+    """Yields the same log for the same arguments.
+
+    Every driver is registered first, then trips are interleaved across
+    drivers. ``invalid_share`` of the lines after the registrations are
+    malformed, and ``out_of_range_share`` of the trips are slower or faster
+    than the default speed thresholds.
+    """
+    if not 0 <= invalid_share < 1 or not 0 <= out_of_range_share <= 1:
+        raise ValueError("shares need to be between 0 and 1")
+
+    rng = random.Random(seed)
+    names = [_driver_name(i) for i in range(drivers)]
+    for name in names:
+        yield "Driver {}\n".format(name)
+
+    for _ in range(trips_per_driver):
+        for name in names:
+            while rng.random() < invalid_share:
+                yield rng.choice(INVALID_LINES).format(name=name)
+            yield _trip_line(rng, name, rng.random() < out_of_range_share)
+
+
+def _trip_line(rng: random.Random, name: str, out_of_range: bool) -> str:
+    start = rng.randrange(0, 23 * 60)
+    end = rng.randrange(start + 1, 24 * 60)
+    if not out_of_range:
+        mph = rng.uniform(SLOW_THRESHOLD, FAST_THRESHOLD)
+    elif rng.random() < 0.5:
+        mph = rng.uniform(0, SLOW_THRESHOLD * 0.9)
+    else:
+        mph = rng.uniform(FAST_THRESHOLD * 1.1, FAST_THRESHOLD * 2)
+    # Round down to the 0.1 miles written to the log, so the rounding never
+    # pushes a trip across a threshold
+    miles = int(mph * (end - start) / 60 * 10) / 10
+    if not out_of_range and miles / ((end - start) / 60) < SLOW_THRESHOLD:
+        miles = round(miles + 0.1, 1)
+    return "Trip {} {:02}:{:02} {:02}:{:02} {:.1f}\n".format(
+        name, *divmod(start, 60), *divmod(end, 60), miles
+    )
+
+
+def _driver_name(index: int) -> str:
+    letters = []
+    index += 26
+    while index:
+        index, remainder = divmod(index, 26)
+        letters.append(chr(ord("a") + remainder))
+    return "D" + "".join(reversed(letters))
@@ -1,13 +1,28 @@
 """CLI to create driving reports given input files"""
 
-import io
+import cProfile
+import os
 import sys
 import logging
+from contextlib import ExitStack
 
 import click
 
-from root_driving_history import parse_input_log
-from root_driving_history import create_driving_report
+from root_driving_history.compiled import cached_log
+from root_driving_history.database import TripDatabase
+from root_driving_history.follow import ReportFollower, follow
+from root_driving_history.incremental import update_summary
+from root_driving_history.inputs import LineCounter, detect_compression
+from root_driving_history.inputs import expand_paths, open_log
+from root_driving_history.parallel import report_files, summarize_file
+from root_driving_history.parallel import summarize_files
+from root_driving_history.partials import dump_partial, load_partial
+from root_driving_history.partials import merge_partials
+from root_driving_history.report import create_ranked_summary_report
+from root_driving_history.report import rank_summaries
+from root_driving_history.stats import RunStats
+from root_driving_history.summary import SummaryEngine
+from root_driving_history.trip import FAST_THRESHOLD, SLOW_THRESHOLD
 
 
 logging.basicConfig(
@@ -17,13 +32,26 @@ logging.basicConfig(
 )
 LOGGER = logging.getLogger(__file__)
 LOGGER.setLevel(logging.ERROR)
+# The numpy engine parses straight into the columns of a TripTable (or maps
+# those of a compiled cache) and reports on them
+ENGINES = ("python", "numpy")
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option(
     "--file", "-f",
-    required=True,
-    help="Input file with driving records",
+    multiple=True,
+    help="Input file with driving records, or '-' to read from stdin; "
+         "repeat it, or give a directory or a quoted glob, to report on a "
+         "batch of files",
+)
+@click.option(
+    "--merge", "-m",
+    is_flag=True,
+    default=False,
+    help="With a batch of files, print one report across all of them "
+         "instead of one report per file",
+    show_default=True,
 )
 @click.option(
     "--verbose", "-v",
@@ -32,37 +60,516 @@ LOGGER.setLevel(logging.ERROR)
     help="If verbose, then outputs INFO log items",
     show_default=True,
 )
-def cli(file, verbose):
+@click.option(
+    "--workers", "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes used to parse the input file, or the files "
+         "of a batch",
+    show_default=True,
+)
+@click.option(
+    "--state", "-s",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="State file for incremental runs over a log that only grows; "
+         "only lines appended since the previous run are parsed",
+)
+@click.option(
+    "--follow", "-F", "follow_input",
+    is_flag=True,
+    default=False,
+    help="Keep reading the input like 'tail -f' and reprint the report "
+         "whenever the ranking changes (and at most every --interval "
+         "seconds otherwise)",
+    show_default=True,
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    help="Minimum seconds between reports in --follow mode",
+    show_default=True,
+)
+@click.option(
+    "--top", "-t",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only report the drivers with the most miles",
+)
+@click.option(
+    "--slow-threshold",
+    type=click.FLOAT,
+    default=SLOW_THRESHOLD,
+    help="Trips slower than this many mph are left out of the report",
+    show_default=True,
+)
+@click.option(
+    "--fast-threshold",
+    type=click.FLOAT,
+    default=FAST_THRESHOLD,
+    help="Trips faster than this many mph are left out of the report",
+    show_default=True,
+)
+@click.option(
+    "--engine", "-e",
+    type=click.Choice(ENGINES),
+    default="python",
+    help="Compute the report in pure Python or on NumPy columns; both "
+         "print the same report",
+    show_default=True,
+)
+@click.option(
+    "--cache", "-c",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Compiled binary copy of --file that later runs memory-map "
+         "instead of parsing the text; rebuilt whenever the file changes",
+)
+@click.option(
+    "--database", "-d",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="SQLite database that --file is added to, unless it was added "
+         "before; the report then covers every log added so far. Without "
+         "--file, reports on the database as it is",
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    default=False,
+    help="Print the wall time, CPU time, peak RSS and counts of every "
+         "stage to stderr",
+    show_default=True,
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Write cProfile statistics of the run to this file, to be read "
+         "with pstats",
+)
+@click.pass_context
+def cli(
+        ctx, file, merge, verbose, workers, state, follow_input, interval,
+        top, slow_threshold, fast_threshold, engine, cache, database,
+        show_stats, profile
+):
+    """Prints the driving report of --file, or runs one of the commands
+    below to summarize and merge the shards of a multi-node run."""
     if verbose:
         LOGGER.setLevel(logging.INFO)
+    if ctx.invoked_subcommand is not None:
+        if file:
+            raise click.UsageError(
+                "--file goes after the '{}' command".format(
+                    ctx.invoked_subcommand
+                )
+            )
+        return
+    if not file and database is None:
+        raise click.UsageError("Missing option '--file' / '-f'.")
+    if slow_threshold > fast_threshold:
+        raise click.UsageError(
+            "--slow-threshold can't be above --fast-threshold"
+        )
     try:
-        LOGGER.info("Attempting to open and read {}...".format(file))
-        with open(file, "r") as f:
-            file_buffer = io.StringIO(f.read())
-    except FileNotFoundError:
-        LOGGER.error("'{}' does not exist".format(file))
+        # A --database without --file is reported as it is
+        files = expand_paths(file) if file else [None]
+    except FileNotFoundError as e:
+        LOGGER.error(e)
         sys.exit(1)
+    if len(files) > 1 and (
+            "-" in files or state is not None or follow_input
+            or engine == "numpy" or cache is not None or database is not None
+    ):
+        raise click.UsageError(
+            "a batch of files can't include stdin or be combined with "
+            "--state, --follow, --engine numpy, --cache or --database"
+        )
+    if len(files) > 1:
+        _report_batch(
+            files, workers, merge, top,
+            (slow_threshold, fast_threshold), show_stats, profile
+        )
+        return
+    file = files[0]
+    if file == "-" and workers > 1:
+        raise click.UsageError("stdin can only be parsed with one worker")
+    if state is not None and (file == "-" or workers > 1):
+        raise click.UsageError(
+            "--state needs a regular --file and a single worker"
+        )
+    if follow_input and (state is not None or workers > 1):
+        raise click.UsageError(
+            "--follow can't be combined with --state or --workers"
+        )
+    if engine == "numpy" and (
+            state is not None or follow_input or workers > 1
+    ):
+        raise click.UsageError(
+            "--engine numpy can't be combined with --state, --follow "
+            "or --workers"
+        )
+    if cache is not None and (
+            file == "-" or state is not None or follow_input or workers > 1
+    ):
+        raise click.UsageError(
+            "--cache needs a regular --file and can't be combined with "
+            "--state, --follow or --workers"
+        )
+    if database is not None and (
+            state is not None or follow_input or workers > 1
+            or cache is not None or engine == "numpy"
+    ):
+        raise click.UsageError(
+            "--database can't be combined with --state, --follow, "
+            "--workers, --cache or --engine numpy"
+        )
+    if follow_input and (show_stats or profile is not None):
+        raise click.UsageError(
+            "--stats and --profile can't be combined with --follow"
+        )
+    thresholds = (slow_threshold, fast_threshold)
+    if follow_input:
+        _follow(file, interval, top, thresholds)
+        return
+
+    stats = RunStats()
+    profiler = cProfile.Profile() if profile is not None else None
+    if profiler is not None:
+        profiler.enable()
+    if cache is not None:
+        report = _report_from_cache(
+            file, cache, top, thresholds, engine, stats
+        )
+    elif database is not None:
+        report = _report_from_database(file, database, top, thresholds, stats)
     else:
-        LOGGER.info("Contents received from {}".format(file))
+        report = _report_from_file(
+            file, workers, state, top, thresholds, engine, stats,
+            LineCounter() if show_stats else None
+        )
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(profile)
+
+    print(report)
+    if show_stats:
+        click.echo(stats.format(), err=True)
+
 
-    LOGGER.info("Parsing input file for data...")
+@cli.command("summarize")
+@click.option(
+    "--file", "-f",
+    required=True,
+    multiple=True,
+    help="Input file with driving records, or '-' to read from stdin; "
+         "repeat it, or give a directory or a quoted glob, to summarize a "
+         "shard of many files",
+)
+@click.option(
+    "--output", "-o",
+    type=click.File("w", atomic=True),
+    default="-",
+    help="Where to write the partial aggregate",
+    show_default=True,
+)
+@click.option(
+    "--workers", "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes used to parse the input files",
+    show_default=True,
+)
+@click.option(
+    "--slow-threshold",
+    type=click.FLOAT,
+    default=SLOW_THRESHOLD,
+    help="Trips slower than this many mph are left out of the partial",
+    show_default=True,
+)
+@click.option(
+    "--fast-threshold",
+    type=click.FLOAT,
+    default=FAST_THRESHOLD,
+    help="Trips faster than this many mph are left out of the partial",
+    show_default=True,
+)
+def summarize_shard(file, output, workers, slow_threshold, fast_threshold):
+    """Writes the partial aggregate of one shard of the logs."""
+    if slow_threshold > fast_threshold:
+        raise click.UsageError(
+            "--slow-threshold can't be above --fast-threshold"
+        )
+    thresholds = (slow_threshold, fast_threshold)
+    LOGGER.info("Summarizing {}...".format(", ".join(file)))
     try:
-        parsed_data = parse_input_log(file_buffer)
+        files = expand_paths(file)
+        if len(files) == 1:
+            # Split into byte ranges, as one task would use one worker
+            engine = summarize_file(files[0], workers, *thresholds)
+        elif "-" in files:
+            raise click.UsageError("stdin can't be summarized with files")
+        else:
+            engine = summarize_files(files, workers, *thresholds)
+    except click.UsageError:
+        raise
+    except FileNotFoundError as e:
+        LOGGER.error(e)
+        sys.exit(1)
     except Exception as e:
         LOGGER.error(e)
+        sys.exit(1)
+    else:
+        LOGGER.info("Partial aggregate created")
+
+    dump_partial(engine, output)
+
+
+@cli.command("merge")
+@click.argument("partials", nargs=-1, required=True, type=click.File("r"))
+@click.option(
+    "--top", "-t",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only report the drivers with the most miles",
+)
+@click.option(
+    "--output", "-o",
+    type=click.File("w", atomic=True),
+    default=None,
+    help="Write the merged partial aggregate here instead of printing the "
+         "report, e.g. to merge it again later",
+)
+def merge_shards(partials, top, output):
+    """Prints the report of partial aggregates, given in log order."""
+    LOGGER.info("Merging {} partials...".format(len(partials)))
+    try:
+        engine = merge_partials(map(load_partial, partials))
+    except Exception as e:
+        LOGGER.error(e)
+        sys.exit(1)
+    else:
+        LOGGER.info("Partial aggregates merged")
+
+    if output is not None:
+        dump_partial(engine, output)
+    else:
+        print(_rank_and_render(engine.summaries, top, RunStats()))
+
+
+def _report_batch(files, workers, merge, top, thresholds, show_stats, profile):
+    stats = RunStats()
+    profiler = cProfile.Profile() if profile is not None else None
+    if profiler is not None:
+        profiler.enable()
+    LOGGER.info("Summarizing {} files...".format(len(files)))
+    try:
+        if merge:
+            with stats.stage("parse") as stage:
+                engine = summarize_files(files, workers, *thresholds)
+                stage.counts["files"] = len(files)
+                stage.counts.update(_engine_counts(engine))
+            reports = [_rank_and_render(engine.summaries, top, stats)]
+        else:
+            with stats.stage("report") as stage:
+                reports = [
+                    "==> {} <==\n{}".format(path, report)
+                    for path, report in report_files(
+                        files, workers, top, *thresholds
+                    )
+                ]
+                stage.counts["files"] = len(files)
+    except FileNotFoundError as e:
+        LOGGER.error("'{}' does not exist".format(e.filename))
+        sys.exit(1)
+    except Exception as e:
+        LOGGER.error(e)
+        sys.exit(1)
+    else:
+        LOGGER.info("Summary reports created")
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(profile)
+
+    print("\n\n".join(reports))
+    if show_stats:
+        click.echo(stats.format(), err=True)
+
+
+def _report_from_file(
+        file, workers, state, top, thresholds, engine, stats, line_counter
+):
+    LOGGER.info("Attempting to open and parse {}...".format(file))
+    try:
+        # Reading, tokenizing, speed filtering and aggregating (and counting
+        # lines, with --stats) share a single pass
+        with stats.stage("parse") as stage:
+            if engine == "numpy":
+                parsed_data = _parse_table(file, line_counter)
+            elif state is not None:
+                parsed_data = update_summary(
+                    file, state, *thresholds, line_counter=line_counter
+                )
+            else:
+                parsed_data = summarize_file(
+                    file, workers, *thresholds, line_counter=line_counter
+                )
+            if line_counter is not None:
+                stage.counts["lines"] = line_counter.lines
+            if engine == "numpy":
+                stage.counts["trips"] = len(parsed_data)
+                stage.counts["drivers"] = len(parsed_data.driver_names)
+            else:
+                stage.counts.update(_engine_counts(parsed_data))
+    except FileNotFoundError:
+        LOGGER.error("'{}' does not exist".format(file))
+        sys.exit(1)
+    except Exception as e:
+        LOGGER.error(e)
+        sys.exit(1)
     else:
         LOGGER.info("Input data parsed")
 
     LOGGER.info("Creating a driving summary report...")
     try:
-        report = create_driving_report(parsed_data)
+        if engine == "numpy":
+            with stats.stage("report"):
+                report = parsed_data.create_report(top, *thresholds)
+        else:
+            report = _rank_and_render(parsed_data.summaries, top, stats)
     except Exception as e:
         LOGGER.error(e)
         sys.exit(1)
     else:
         LOGGER.info("Summary report created")
 
-    print(report)
+    return report
+
+
+def _report_from_cache(file, cache, top, thresholds, engine, stats):
+    LOGGER.info("Opening the compiled copy of {}...".format(file))
+    try:
+        with ExitStack() as stack:
+            with stats.stage("load") as stage:
+                compiled_log = stack.enter_context(cached_log(file, cache))
+                stage.counts["trips"] = len(compiled_log)
+            if engine == "numpy":
+                with stats.stage("report"):
+                    report = compiled_log.to_table().create_report(
+                        top, *thresholds
+                    )
+            else:
+                with stats.stage("aggregate") as stage:
+                    engine = compiled_log.to_summary(*thresholds)
+                    stage.counts.update(_engine_counts(engine))
+                report = _rank_and_render(engine.summaries, top, stats)
+    except FileNotFoundError:
+        LOGGER.error("'{}' does not exist".format(file))
+        sys.exit(1)
+    except Exception as e:
+        LOGGER.error(e)
+        sys.exit(1)
+    else:
+        LOGGER.info("Summary report created")
+
+    return report
+
+
+def _report_from_database(file, database, top, thresholds, stats):
+    if file is None and not os.path.exists(database):
+        LOGGER.error("'{}' does not exist".format(database))
+        sys.exit(1)
+    try:
+        with TripDatabase(database) as trip_database:
+            if file is not None:
+                LOGGER.info("Adding {} to {}...".format(file, database))
+                with stats.stage("load"):
+                    if not trip_database.add_log(file):
+                        LOGGER.warning(
+                            "'{}' was already added to {}, so it is not "
+                            "added again".format(file, database)
+                        )
+            with stats.stage("aggregate") as stage:
+                summaries = trip_database.get_summaries(*thresholds)
+                stage.counts["trips_accepted"] = sum(
+                    summary.trip_count for summary in summaries
+                )
+                stage.counts["drivers"] = len(summaries)
+            report = _rank_and_render(summaries, top, stats)
+    except FileNotFoundError:
+        LOGGER.error("'{}' does not exist".format(file))
+        sys.exit(1)
+    except Exception as e:
+        LOGGER.error(e)
+        sys.exit(1)
+    else:
+        LOGGER.info("Summary report created")
+
+    return report
+
+
+def _rank_and_render(summaries, top, stats):
+    with stats.stage("sort"):
+        ranked_summaries = rank_summaries(summaries, top)
+    with stats.stage("render"):
+        return create_ranked_summary_report(ranked_summaries)
+
+
+def _engine_counts(engine):
+    return {
+        "trips_accepted": engine.accepted_trip_count,
+        "trips_discarded": engine.discarded_trip_count,
+        "drivers": len(engine),
+    }
+
+
+def _parse_table(file, line_counter):
+    # Imported here so NumPy is only needed with --engine numpy
+    from root_driving_history.trip_table import TripTable
+
+    with open_log(file) as log:
+        if line_counter is not None:
+            log = line_counter.counting(log)
+        return TripTable.from_lines(log)
+
+
+def _follow(file, interval, top, thresholds):
+    def emit(report):
+        print(report, end="\n\n", flush=True)
+
+    follower = ReportFollower(
+        SummaryEngine(*thresholds), interval=interval, top=top
+    )
+    LOGGER.info("Following {}...".format(file))
+    try:
+        if file == "-":
+            _check_not_compressed(file, sys.stdin.buffer)
+            follow(sys.stdin, follower, emit, stop_at_eof=True)
+        else:
+            with open(file, "r") as f:
+                _check_not_compressed(file, f.buffer)
+                follow(f, follower, emit)
+    except KeyboardInterrupt:
+        LOGGER.info("Stopped following {}".format(file))
+    except FileNotFoundError:
+        LOGGER.error("'{}' does not exist".format(file))
+        sys.exit(1)
+    except Exception as e:
+        LOGGER.error(e)
+        sys.exit(1)
+
+
+def _check_not_compressed(file, binary_file):
+    compression = detect_compression(binary_file.peek(16))
+    if compression is not None:
+        raise ValueError(
+            "'{}' is {} compressed and can't be followed".format(
+                file, compression
+            )
+        )
 
 
 if __name__ == "__main__":
@@ -1,2 +1,10 @@
 from .parser import parse_input_log  # noqa
+from .parser import parse_input_stream  # noqa
+from .parser import parse_into_registry  # noqa
+from .parser import parse_into_summary  # noqa
+from .parser import summarize_input_stream  # noqa
+from .registry import DriverRegistry  # noqa
 from .report import create_driving_report  # noqa
+from .report import create_summary_report  # noqa
+from .summary import DriverSummary  # noqa
+from .summary import SummaryEngine  # noqa
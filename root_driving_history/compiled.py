@@ -0,0 +1,272 @@
+"""Contains the compiled log, a binary columnar cache of a parsed text log
+
+Compiling tokenizes a log once and writes its registered drivers and their
+trips to a fixed-width file, keyed by a hash of the log's contents. Later
+reports memory-map that file instead of parsing the text again, whatever
+thresholds or top-K they ask for. A compressed log is keyed by the hash of
+its compressed bytes, so it is only decompressed when it is compiled.
+
+Layout (little-endian)::
+
+    header      magic, version, sha1 of the log, sizes (see HEADER)
+    names       registered driver names, utf-8, newline separated
+    padding     up to a multiple of 8 bytes
+    driver_ids  int64 per trip, indexes the names
+    miles       int64 per trip, in thousandths of a mile
+    start, end  int16 per trip, minutes since midnight
+
+Trips keep their logged order, and the columns hold exactly the values the
+parser produces, so reports from them are identical to reports from the
+text.
+"""
+
+import hashlib
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from itertools import compress
+from typing import Any, Dict, Iterator, List
+
+import attr
+
+from .inputs import mapped_file, open_log, replacing_file
+from .parser import BUFFER_TYPES, Buffer, DRIVER_TOKEN
+from .parser import tokenize, tokenize_buffer
+from .summary import SummaryEngine
+from .symbols import DriverSymbols
+from .trip import FAST_THRESHOLD, SLOW_THRESHOLD
+
+
+COMPILED_MAGIC = b"RDHC"
+COMPILED_VERSION = 2
+HEADER = struct.Struct("<4sH20sQQQ")
+_ALIGNMENT = 8
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+@attr.s(slots=True, eq=False)
+class CompiledLog(object):
+    """The columns of a compiled log, usually views into a memory map."""
+    source_digest: bytes = attr.ib()
+    driver_names: List[str] = attr.ib()
+    driver_ids: Any = attr.ib()
+    milli_miles: Any = attr.ib()
+    start_minutes: Any = attr.ib()
+    end_minutes: Any = attr.ib()
+
+    @classmethod
+    def from_buffer(cls, buffer: Buffer) -> "CompiledLog":
+        if len(buffer) < HEADER.size:
+            raise ValueError("not a compiled log: the header is cut short")
+        (
+            magic, version, source_digest,
+            names_size, driver_count, trip_count
+        ) = HEADER.unpack_from(buffer)
+        if magic != COMPILED_MAGIC:
+            raise ValueError("not a compiled log: unknown magic bytes")
+        if version != COMPILED_VERSION:
+            raise ValueError(
+                "compiled log version {} is not supported".format(version)
+            )
+
+        offset = HEADER.size + names_size
+        columns_size = trip_count * (8 + 8 + 2 + 2)
+        if len(buffer) != _aligned(offset) + columns_size:
+            raise ValueError("not a compiled log: the columns are cut short")
+
+        names = bytes(buffer[HEADER.size:offset]).decode("utf-8")
+        driver_names = names.split("\n") if driver_count else []
+        columns = []
+        offset = _aligned(offset)
+        for typecode in ("q", "q", "h", "h"):
+            size = trip_count * array(typecode).itemsize
+            columns.append(_column(buffer, offset, size, typecode))
+            offset += size
+        return cls(source_digest, driver_names, *columns)
+
+    def __len__(self) -> int:
+        return len(self.driver_ids)
+
+    def to_summary(
+            self,
+            slow_threshold: float = SLOW_THRESHOLD,
+            fast_threshold: float = FAST_THRESHOLD
+    ) -> SummaryEngine:
+        """Feeds every trip into a new SummaryEngine, skipping the text
+        parsing altogether."""
+        engine = SummaryEngine(slow_threshold, fast_threshold)
+        # The compiled ids are the registration order, and so are the
+        # engine's; mapping them anyway keeps the engine the only authority
+        engine_ids = [engine.driver_id(name) for name in self.driver_names]
+        for engine_id in engine_ids:
+            engine.register_id(engine_id)
+        add_trip_for_id = engine.add_trip_for_id
+        for driver_id, milli_miles, start, end in zip(
+                self.driver_ids, self.milli_miles,
+                self.start_minutes, self.end_minutes
+        ):
+            add_trip_for_id(engine_ids[driver_id], start, end, milli_miles)
+        return engine
+
+    def to_table(self):
+        """A TripTable over the same memory, without copying the columns.
+
+        Requires NumPy. The table must not be kept past the ``with`` block
+        of ``open_compiled``.
+        """
+        # Imported here so NumPy stays optional for compiled logs
+        from .trip_table import TripTable
+
+        return TripTable(
+            self.driver_names,
+            self.driver_ids,
+            self.start_minutes,
+            self.end_minutes,
+            self.milli_miles,
+        )
+
+    def release(self) -> None:
+        """Releases the views so the underlying memory map can close."""
+        for column in (
+                self.driver_ids, self.milli_miles,
+                self.start_minutes, self.end_minutes
+        ):
+            if isinstance(column, memoryview):
+                column.release()
+
+
+def compile_log(path: str, compiled_path: str) -> None:
+    """Parses the log at ``path``, which may be compressed, and writes it
+    to ``compiled_path``."""
+    with mapped_file(path) as buffer:
+        _check_is_mapped(path, buffer)
+        digest = _digest(buffer)
+    _write_compiled(path, digest, compiled_path)
+
+
+@contextmanager
+def open_compiled(compiled_path: str) -> Iterator[CompiledLog]:
+    """Memory-maps the compiled log at ``compiled_path``.
+
+    The columns are only valid inside the ``with`` block.
+    """
+    with mapped_file(compiled_path) as buffer:
+        _check_is_mapped(compiled_path, buffer)
+        compiled_log = CompiledLog.from_buffer(buffer)
+        try:
+            yield compiled_log
+        finally:
+            compiled_log.release()
+
+
+@contextmanager
+def cached_log(path: str, compiled_path: str) -> Iterator[CompiledLog]:
+    """Opens the compiled log of ``path``, (re)compiling it first when
+    ``compiled_path`` is missing, outdated or was compiled from a log with
+    different contents."""
+    with mapped_file(path) as buffer:
+        _check_is_mapped(path, buffer)
+        digest = _digest(buffer)
+    if not _is_compiled_from(compiled_path, digest):
+        _write_compiled(path, digest, compiled_path)
+
+    with open_compiled(compiled_path) as compiled_log:
+        yield compiled_log
+
+
+def _is_compiled_from(compiled_path: str, digest: bytes) -> bool:
+    try:
+        with open(compiled_path, "rb") as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return False
+
+    if len(header) < HEADER.size or header[:4] != COMPILED_MAGIC:
+        raise ValueError(
+            "'{}' exists but is not a compiled log".format(compiled_path)
+        )
+    _, version, source_digest, *_ = HEADER.unpack(header)
+    return version == COMPILED_VERSION and source_digest == digest
+
+
+def _write_compiled(path: str, digest: bytes, compiled_path: str) -> None:
+    symbols = DriverSymbols()
+    registered: Dict[int, None] = {}
+    driver_ids = array("q")
+    milli_miles = array("q")
+    start_minutes = array("h")
+    end_minutes = array("h")
+    with open_log(path) as log:
+        # Not bound to a name: a live scanner would keep the map from
+        # closing when a bad record raises
+        for token in (
+                tokenize_buffer(log)
+                if isinstance(log, BUFFER_TYPES)
+                else tokenize(log)
+        ):
+            if token[0] == DRIVER_TOKEN:
+                registered[symbols.intern(token[1])] = None
+                continue
+            _, name, start_minute, end_minute, trip_milli_miles = token
+            if start_minute >= end_minute:
+                raise ValueError("start_time should be before end_time")
+            driver_ids.append(symbols.intern(name))
+            milli_miles.append(trip_milli_miles)
+            start_minutes.append(start_minute)
+            end_minutes.append(end_minute)
+
+    # Renumber the drivers in registration order and drop the trips of
+    # names that were never registered, as the parser does
+    new_ids = [-1] * len(symbols)
+    for new_id, driver_id in enumerate(registered):
+        new_ids[driver_id] = new_id
+    driver_ids = array("q", map(new_ids.__getitem__, driver_ids))
+    keep = [driver_id >= 0 for driver_id in driver_ids]
+    if not all(keep):
+        driver_ids = array("q", compress(driver_ids, keep))
+        milli_miles = array("q", compress(milli_miles, keep))
+        start_minutes = array("h", compress(start_minutes, keep))
+        end_minutes = array("h", compress(end_minutes, keep))
+
+    names_blob = "\n".join(
+        map(symbols.get_name, registered)
+    ).encode("utf-8")
+    header = HEADER.pack(
+        COMPILED_MAGIC, COMPILED_VERSION, digest,
+        len(names_blob), len(registered), len(driver_ids)
+    )
+    names_end = len(header) + len(names_blob)
+    padding = bytes(_aligned(names_end) - names_end)
+    with replacing_file(compiled_path, "wb") as f:
+        f.write(header)
+        f.write(names_blob)
+        f.write(padding)
+        for column in (driver_ids, milli_miles, start_minutes, end_minutes):
+            if not _LITTLE_ENDIAN:
+                column.byteswap()
+            column.tofile(f)
+
+
+def _column(buffer: Buffer, offset: int, size: int, typecode: str) -> Any:
+    view = memoryview(buffer)[offset:offset + size]
+    if _LITTLE_ENDIAN:
+        return view.cast("B").cast(typecode)
+    column = array(typecode, view.tobytes())
+    column.byteswap()
+    return column
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _digest(buffer: Buffer) -> bytes:
+    return hashlib.sha1(buffer).digest()
+
+
+def _check_is_mapped(path: str, buffer: Buffer) -> None:
+    if buffer is None:
+        raise ValueError(
+            "'{}' is not a regular file and cannot be compiled".format(path)
+        )
@@ -0,0 +1,278 @@
+"""Contains the TripDatabase, a SQLite backed store of drivers and trips
+
+Drivers and trips are kept in two normalized tables so history accumulates
+across runs and reports can cover more trips than fit in memory. Loading a
+log inserts its records in batches inside a single transaction, together
+with the SHA-1 of its contents so the same log is never added twice. The
+filtered per-driver totals of a report come from one aggregate query. Trips
+store whole thousandths of a mile, so the speed filter and the totals are
+integer arithmetic and match the other engines exactly.
+"""
+
+import hashlib
+import sqlite3
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Tuple, Union
+
+import attr
+
+from .inputs import open_log
+from .parser import BUFFER_TYPES, Buffer, DRIVER_TOKEN, TRIP_TOKEN, Token
+from .parser import tokenize, tokenize_buffer
+from .summary import DriverSummary, SpeedFilter
+from .trip import FAST_THRESHOLD, SLOW_THRESHOLD, MINUTES_PER_DAY
+
+
+BATCH_SIZE = 10000
+# Stored as the database's user_version; bumped when the tables change
+SCHEMA_VERSION = 3
+# Older versions that SCHEMA brings up to date by adding tables; version 2
+# only lacks the sources table
+UPGRADABLE_VERSIONS = (2,)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drivers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    -- Position in registration order, NULL until the driver is registered
+    registration INTEGER UNIQUE
+);
+CREATE TABLE IF NOT EXISTS trips (
+    id INTEGER PRIMARY KEY,
+    driver_id INTEGER NOT NULL REFERENCES drivers (id),
+    start_minute INTEGER NOT NULL,
+    end_minute INTEGER NOT NULL,
+    milli_miles INTEGER NOT NULL,
+    CHECK (0 <= start_minute AND start_minute < end_minute
+           AND end_minute < {minutes_per_day})
+);
+-- Entries are ordered by (driver_id, trip id), i.e. each driver's trips in
+-- logged order
+CREATE INDEX IF NOT EXISTS trips_by_driver ON trips (driver_id);
+-- Logs added by add_log, by the SHA-1 of their (decompressed) contents
+CREATE TABLE IF NOT EXISTS sources (
+    digest BLOB PRIMARY KEY,
+    path TEXT NOT NULL
+);
+""".format(minutes_per_day=MINUTES_PER_DAY)
+
+INSERT_NAME = "INSERT OR IGNORE INTO drivers (name) VALUES (?)"
+REGISTER_DRIVER = """
+UPDATE drivers
+SET registration = (SELECT COALESCE(MAX(registration), -1) + 1 FROM drivers)
+WHERE name = ? AND registration IS NULL
+"""
+INSERT_TRIP = """
+INSERT INTO trips (driver_id, start_minute, end_minute, milli_miles)
+VALUES ((SELECT id FROM drivers WHERE name = ?), ?, ?, ?)
+"""
+INSERT_SOURCE = "INSERT OR IGNORE INTO sources (digest, path) VALUES (?, ?)"
+# The bounds are the integer coefficients of SpeedFilter.get_bounds()
+SUMMARIES = """
+SELECT
+    drivers.name,
+    COALESCE(SUM(trips.milli_miles), 0),
+    COALESCE(SUM(trips.end_minute - trips.start_minute), 0),
+    COUNT(trips.id)
+FROM drivers
+LEFT JOIN trips INDEXED BY trips_by_driver
+    ON trips.driver_id = drivers.id
+    AND :slow_minutes * (trips.end_minute - trips.start_minute)
+        <= :slow_miles * trips.milli_miles
+    AND :fast_miles * trips.milli_miles
+        <= :fast_minutes * (trips.end_minute - trips.start_minute)
+WHERE drivers.registration IS NOT NULL
+GROUP BY drivers.id
+ORDER BY drivers.registration
+"""
+
+
+@attr.s(slots=True, eq=False)
+class TripDatabase(object):
+    """Drivers and trips stored in the SQLite database at ``path``.
+
+    Registration and unregistered trips follow the ``DriverRegistry``
+    rules: a driver is registered once, and trips of names that are never
+    registered are kept but left out of reports. Databases written before
+    trips were stored in thousandths of a mile are refused rather than
+    misread.
+    """
+    path: str = attr.ib()
+    _connection: sqlite3.Connection = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._connection = sqlite3.connect(self.path)
+        try:
+            self._check_schema_version()
+        except ValueError:
+            self._connection.close()
+            raise
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(
+                "PRAGMA user_version = {}".format(SCHEMA_VERSION)
+            )
+
+    def __enter__(self) -> "TripDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        """Number of registered drivers."""
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM drivers WHERE registration IS NOT NULL"
+        ).fetchone()[0]
+
+    def __contains__(self, driver_name: str) -> bool:
+        return self._connection.execute(
+            "SELECT 1 FROM drivers WHERE name = ? "
+            "AND registration IS NOT NULL",
+            (driver_name,)
+        ).fetchone() is not None
+
+    def get_trip_count(self) -> int:
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM trips"
+        ).fetchone()[0]
+
+    def register_driver(self, driver_name: str) -> "TripDatabase":
+        return self.add_tokens([(DRIVER_TOKEN, driver_name)])
+
+    def add_trip(
+            self,
+            driver_name: str,
+            start_minute: int,
+            end_minute: int,
+            milli_miles: int
+    ) -> "TripDatabase":
+        return self.add_tokens(
+            [(TRIP_TOKEN, driver_name, start_minute, end_minute, milli_miles)]
+        )
+
+    def has_log(self, digest: bytes) -> bool:
+        """Whether a log whose contents have the SHA-1 ``digest`` was
+        added by ``add_log``."""
+        return self._connection.execute(
+            "SELECT 1 FROM sources WHERE digest = ?", (digest,)
+        ).fetchone() is not None
+
+    def add_log(self, path: str) -> bool:
+        """Stores every record of the log at ``path`` (see ``open_log``),
+        unless a log with the same contents was added before.
+
+        Returns whether the log was added. Memory-mapped logs are hashed
+        before they are parsed; streamed ones (pipes, compressed files) are
+        hashed as they are parsed, and their load is rolled back if they
+        turn out to be added already.
+        """
+        sha1 = hashlib.sha1()
+        with open_log(path) as log:
+            if isinstance(log, BUFFER_TYPES):
+                sha1.update(log)
+                if self.has_log(sha1.digest()):
+                    return False
+                tokens = tokenize_buffer(log)
+            else:
+                tokens = tokenize(_hashed(log, sha1))
+            try:
+                with self._connection:
+                    self._insert_tokens(tokens)
+                    if not self._connection.execute(
+                            INSERT_SOURCE, (sha1.digest(), path)
+                    ).rowcount:
+                        raise _AlreadyAdded
+            except _AlreadyAdded:
+                return False
+        return True
+
+    def add_lines(
+            self, lines: Union[Iterable[str], Buffer]
+    ) -> "TripDatabase":
+        """Stores every record of ``lines``, an iterable of text lines
+        such as an open log file or a bytes-like buffer."""
+        return self.add_tokens(
+            tokenize_buffer(lines)
+            if isinstance(lines, BUFFER_TYPES)
+            else tokenize(lines)
+        )
+
+    def add_tokens(self, tokens: Iterable[Token]) -> "TripDatabase":
+        """Stores parser tokens in batches of ``BATCH_SIZE``.
+
+        Everything is inserted in one transaction, so a bad record leaves
+        the database as it was.
+        """
+        with self._connection:
+            self._insert_tokens(tokens)
+        return self
+
+    def get_summaries(
+            self,
+            slow_threshold: float = SLOW_THRESHOLD,
+            fast_threshold: float = FAST_THRESHOLD
+    ) -> List[DriverSummary]:
+        """Totals of every registered driver's trips inside the speed
+        thresholds, in registration order."""
+        rows = self._connection.execute(
+            SUMMARIES,
+            SpeedFilter(slow_threshold, fast_threshold).get_bounds()
+        )
+        return [
+            DriverSummary(name, milli_miles, minutes, count)
+            for name, milli_miles, minutes, count in rows
+        ]
+
+    def _check_schema_version(self) -> None:
+        version = self._connection.execute(
+            "PRAGMA user_version"
+        ).fetchone()[0]
+        has_trips = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+            "AND name = 'trips'"
+        ).fetchone() is not None
+        if has_trips and version != SCHEMA_VERSION \
+                and version not in UPGRADABLE_VERSIONS:
+            raise ValueError(
+                "'{}' was written by an incompatible version (schema {}, "
+                "expected {})".format(self.path, version, SCHEMA_VERSION)
+            )
+
+    def _insert_tokens(self, tokens: Iterable[Token]) -> None:
+        tokens = iter(tokens)
+        while True:
+            batch = list(islice(tokens, BATCH_SIZE))
+            if not batch:
+                break
+            self._insert_batch(batch)
+
+    def _insert_batch(self, batch: List[Token]) -> None:
+        registrations: List[Tuple[str]] = []
+        trips: List[Token] = []
+        for token in batch:
+            if token[0] == DRIVER_TOKEN:
+                registrations.append((token[1],))
+            else:
+                if token[2] >= token[3]:
+                    raise ValueError("start_time should be before end_time")
+                trips.append(token[1:])
+
+        self._connection.executemany(
+            INSERT_NAME, dict.fromkeys((token[1],) for token in batch)
+        )
+        self._connection.executemany(REGISTER_DRIVER, registrations)
+        self._connection.executemany(INSERT_TRIP, trips)
+
+
+class _AlreadyAdded(Exception):
+    """Rolls back the load of a log that was added before."""
+
+
+def _hashed(blocks: Iterable[bytes], sha1: Any) -> Iterator[bytes]:
+    for block in blocks:
+        sha1.update(block)
+        yield block
@@ -5,7 +5,7 @@ from typing import Any, Optional
 import attr
 
 
-@attr.s
+@attr.s(slots=True, frozen=True)
 class Driver(object):
     name: str = attr.ib()
 
@@ -0,0 +1,179 @@
+"""Contains the ReportFollower, which keeps a report current as lines arrive
+"""
+
+import threading
+import time
+from queue import Empty, Queue
+from typing import Callable, Optional, TextIO
+
+import attr
+
+from .leaderboard import Leaderboard
+from .parser import DRIVER_TOKEN, tokenize
+from .report import create_ranked_summary_report
+from .summary import SummaryEngine
+
+
+# Lines the reader thread may queue up ahead of the follow loop
+READ_AHEAD_LINES = 10000
+_EOF = object()
+
+
+@attr.s(slots=True)
+class ReportFollower(object):
+    """Feeds log lines into a SummaryEngine and a Leaderboard.
+
+    ``poll`` hands back a fresh report as soon as the ranking changed, and
+    otherwise at most every ``interval`` seconds while totals keep changing.
+    With ``top`` only the drivers with the most miles are reported, and
+    changes further down the ranking are ignored.
+    """
+    engine: SummaryEngine = attr.ib(default=attr.Factory(SummaryEngine))
+    interval: float = attr.ib(default=1.0)
+    top: Optional[int] = attr.ib(default=None)
+    _leaderboard: Leaderboard = attr.ib(
+        init=False, default=attr.Factory(Leaderboard)
+    )
+    _ranking_changed: bool = attr.ib(init=False, default=False)
+    _totals_changed: bool = attr.ib(init=False, default=False)
+    _last_report_time: Optional[float] = attr.ib(init=False, default=None)
+
+    def feed(self, line: str) -> "ReportFollower":
+        engine = self.engine
+        leaderboard = self._leaderboard
+        for token in tokenize([line]):
+            driver_name = token[1]
+            driver_id = engine.driver_id(driver_name)
+            if token[0] == DRIVER_TOKEN:
+                engine.register_id(driver_id)
+                if leaderboard.add(
+                        driver_name,
+                        engine.get_summary(driver_name).milli_miles
+                ) and self._is_reported(driver_name):
+                    self._ranking_changed = True
+                continue
+
+            discarded_trip_count = engine.discarded_trip_count
+            engine.add_trip_for_id(driver_id, *token[2:])
+            if engine.discarded_trip_count != discarded_trip_count or \
+                    driver_name not in engine:
+                continue
+
+            was_reported = self._is_reported(driver_name)
+            rank_changed = leaderboard.update(
+                driver_name, engine.get_summary(driver_name).milli_miles
+            )
+            if was_reported or self._is_reported(driver_name):
+                self._totals_changed = True
+                self._ranking_changed |= rank_changed
+        return self
+
+    @property
+    def report(self) -> str:
+        ranked_names = self._leaderboard if self.top is None \
+            else self._leaderboard.top(self.top)
+        return create_ranked_summary_report(
+            self.engine.get_summary(driver_name)
+            for driver_name in ranked_names
+        )
+
+    def _is_reported(self, driver_name: str) -> bool:
+        return self.top is None or \
+            self._leaderboard.rank_of(driver_name, self.top) is not None
+
+    def poll(self, now: float, flush: bool = False) -> Optional[str]:
+        """Returns the report if it is due at ``now``, otherwise None.
+
+        With ``flush`` any pending change is reported right away.
+        """
+        due = (
+            self._last_report_time is None
+            or self._ranking_changed
+            or (
+                self._totals_changed
+                and (flush or now - self._last_report_time >= self.interval)
+            )
+        )
+        if not due:
+            return None
+
+        self._ranking_changed = self._totals_changed = False
+        self._last_report_time = now
+        return self.report
+
+
+def follow(
+        f: TextIO,
+        follower: ReportFollower,
+        emit: Callable[[str], None],
+        poll_interval: float = 0.25,
+        stop_at_eof: bool = False
+) -> None:
+    """Reads ``f`` like ``tail -f`` and emits reports as they become due.
+
+    Reports are checked for whenever the input goes idle, at least every
+    ``poll_interval`` seconds while it stays idle, and at most once per
+    ``follower.interval`` while lines keep streaming in. A line is only fed
+    once its newline arrived. With ``stop_at_eof`` (e.g. for a pipe on
+    stdin) reading ends at EOF; otherwise it waits for appended lines until
+    interrupted.
+
+    Lines are read by a daemon thread, so a read blocked on a quiet pipe
+    doesn't hold back reports that came due in the meantime.
+    """
+    lines: Queue = Queue(READ_AHEAD_LINES)
+    reader = threading.Thread(
+        target=_read_lines, args=(f, lines, poll_interval, stop_at_eof),
+        daemon=True
+    )
+    reader.start()
+
+    partial_line = ""
+    last_poll = time.monotonic()
+    while True:
+        try:
+            line = lines.get(timeout=poll_interval)
+        except Empty:
+            line = ""
+        if line is _EOF:
+            break
+        if isinstance(line, BaseException):
+            raise line
+        if line:
+            partial_line += line
+            if partial_line.endswith("\n"):
+                follower.feed(partial_line)
+                partial_line = ""
+
+        now = time.monotonic()
+        idle = not line or lines.empty()
+        if idle or now - last_poll >= follower.interval:
+            last_poll = now
+            report = follower.poll(now)
+            if report is not None:
+                emit(report)
+
+    if partial_line:
+        follower.feed(partial_line)
+    report = follower.poll(time.monotonic(), flush=True)
+    if report is not None:
+        emit(report)
+
+
+def _read_lines(
+        f: TextIO, lines: Queue, poll_interval: float, stop_at_eof: bool
+) -> None:
+    try:
+        while True:
+            line = f.readline()
+            if line:
+                lines.put(line)
+            elif stop_at_eof:
+                break
+            else:
+                # A regular file at its end; wait for it to grow
+                time.sleep(poll_interval)
+    except BaseException as e:
+        lines.put(e)
+        return
+    lines.put(_EOF)
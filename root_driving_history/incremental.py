@@ -0,0 +1,143 @@
+"""Contains the incremental summarizer for append-only log files
+
+The per-driver totals and the byte offset up to which the log has been
+processed are kept in a JSON state file. Each run only scans the bytes
+appended since the previous run, so its cost follows the size of the delta
+rather than the size of the whole history.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from .inputs import LineCounter, detect_compression, mapped_file
+from .inputs import replacing_file
+from .parser import parse_into_summary
+from .summary import SummaryEngine
+from .trip import FAST_THRESHOLD, SLOW_THRESHOLD
+
+
+STATE_VERSION = 2
+# Bytes before the saved offset that have to be unchanged for the log to
+# count as the same, appended-to file
+FINGERPRINT_SIZE = 4096
+
+
+def update_summary(
+        path: str,
+        state_path: str,
+        slow_threshold: float = SLOW_THRESHOLD,
+        fast_threshold: float = FAST_THRESHOLD,
+        line_counter: Optional[LineCounter] = None
+) -> SummaryEngine:
+    """Brings the state at ``state_path`` up to date with the log at
+    ``path`` and returns the engine for the whole log.
+
+    Only complete lines are committed to the state. A trailing line without
+    its newline yet is included in the returned engine but scanned again on
+    the next run. The state starts over when the log was replaced, shrunk
+    or rewritten, or when the thresholds changed. A ``line_counter`` also
+    counts the lines scanned by this run.
+    """
+    with mapped_file(path) as buffer:
+        if buffer is None:
+            raise ValueError(
+                "'{}' is not a regular file and cannot be followed "
+                "incrementally".format(path)
+            )
+        if detect_compression(buffer[:16]) is not None:
+            raise ValueError(
+                "'{}' is compressed and cannot be followed "
+                "incrementally".format(path)
+            )
+
+        file_stat = os.stat(path)
+        engine, offset = _load_state(
+            state_path, file_stat, buffer, slow_threshold, fast_threshold
+        )
+
+        newline = buffer.rfind(b"\n", offset)
+        end = offset if newline == -1 else newline + 1
+        with memoryview(buffer) as view:
+            if line_counter is not None:
+                line_counter.count(view[offset:])
+            parse_into_summary(view[offset:end], engine)
+            _save_state(state_path, file_stat, buffer, end, engine)
+            parse_into_summary(view[end:], engine)
+
+    return engine
+
+
+def _fingerprint(buffer, offset: int) -> str:
+    start = max(offset - FINGERPRINT_SIZE, 0)
+    return hashlib.sha1(buffer[start:offset]).hexdigest()
+
+
+def _load_state(
+        state_path: str,
+        file_stat: os.stat_result,
+        buffer,
+        slow_threshold: float,
+        fast_threshold: float
+) -> Tuple[SummaryEngine, int]:
+    fresh_start = SummaryEngine(slow_threshold, fast_threshold), 0
+    state = _read_state(state_path)
+    if state is None or state.get("version") != STATE_VERSION:
+        return fresh_start
+
+    try:
+        source = state["source"]
+        offset = source["offset"]
+        same_file = (
+            source["device"] == file_stat.st_dev
+            and source["inode"] == file_stat.st_ino
+            and offset <= len(buffer)
+            and source["fingerprint"] == _fingerprint(buffer, offset)
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(
+            "'{}' is not a valid state file: {!r}".format(state_path, e)
+        )
+    if not same_file:
+        return fresh_start
+
+    engine = SummaryEngine.from_state(state["summary"])
+    if (engine.slow_threshold, engine.fast_threshold) != \
+            (slow_threshold, fast_threshold):
+        return fresh_start
+
+    return engine, offset
+
+
+def _read_state(state_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(state_path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as e:
+        raise ValueError(
+            "'{}' is not a valid state file: {}".format(state_path, e)
+        )
+
+
+def _save_state(
+        state_path: str,
+        file_stat: os.stat_result,
+        buffer,
+        offset: int,
+        engine: SummaryEngine
+) -> None:
+    state = {
+        "version": STATE_VERSION,
+        "source": {
+            "device": file_stat.st_dev,
+            "inode": file_stat.st_ino,
+            "offset": offset,
+            "fingerprint": _fingerprint(buffer, offset),
+        },
+        "summary": engine.to_state(),
+    }
+    with replacing_file(state_path) as f:
+        json.dump(state, f)
@@ -0,0 +1,312 @@
+"""Contains helpers for opening input logs and replacing output files"""
+
+import bz2
+import glob
+import lzma
+import mmap
+import os
+import stat
+import sys
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from functools import partial
+from queue import Empty, Full, Queue
+from typing import IO, Any, BinaryIO, Callable, Iterable, Iterator, List
+from typing import Optional, Union
+
+import attr
+
+from .parser import BUFFER_TYPES, Buffer
+
+
+# Bytes read from a stream at a time, and how many blocks of them the
+# background thread may read and decompress ahead of the parser
+BLOCK_SIZE = 1 << 20
+READ_AHEAD_BLOCKS = 4
+# Leading bytes of each stdlib codec's streams, with a factory of the
+# decompressor objects that decode one stream
+COMPRESSIONS = {
+    "gzip": (b"\x1f\x8b", partial(zlib.decompressobj, 16 + zlib.MAX_WBITS)),
+    "bzip2": (b"BZh", bz2.BZ2Decompressor),
+    "xz": (b"\xfd7zXZ\x00", lzma.LZMADecompressor),
+}
+_MAGIC_SIZE = max(len(magic) for magic, _ in COMPRESSIONS.values())
+_DONE = object()
+
+
+@contextmanager
+def mapped_file(path: str) -> Iterator[Optional[Buffer]]:
+    """Memory-maps the regular file at ``path`` read-only.
+
+    Yields None for anything that cannot be mapped (pipes, character
+    devices such as /dev/stdin), so callers can fall back to streaming.
+    Empty files yield an empty ``bytes`` since they cannot be mapped.
+    """
+    with open(path, "rb") as f:
+        file_stat = os.fstat(f.fileno())
+        if not stat.S_ISREG(file_stat.st_mode):
+            yield None
+        elif file_stat.st_size == 0:
+            yield b""
+        else:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield buffer
+            except BaseException:
+                try:
+                    buffer.close()
+                except BufferError:
+                    # A scanner in the error's traceback still holds a view;
+                    # the map closes once it is collected
+                    pass
+                raise
+            buffer.close()
+
+
+def detect_compression(header: bytes) -> Optional[str]:
+    """The name of the codec whose magic bytes start ``header``, if any."""
+    for name, (magic, _) in COMPRESSIONS.items():
+        if header[:len(magic)] == magic:
+            return name
+    return None
+
+
+@contextmanager
+def open_log(path: str) -> Iterator[Union[Buffer, Iterator[bytes]]]:
+    """Opens the log at ``path``, or stdin for '-', for the parse functions.
+
+    Uncompressed regular files are memory-mapped. Anything else (gzip,
+    bzip2 or xz compressed files, recognized by their magic bytes, as well
+    as pipes and devices) is yielded as an iterator of bytes blocks of whole
+    lines, which a background thread reads and decompresses ahead of the
+    parser.
+    """
+    if path == "-":
+        blocks = stream_blocks(sys.stdin.buffer)
+        try:
+            yield blocks
+        finally:
+            blocks.close()
+        return
+
+    with open(path, "rb") as f:
+        file_stat = os.fstat(f.fileno())
+        if stat.S_ISREG(file_stat.st_mode) and \
+                detect_compression(f.peek(_MAGIC_SIZE)) is None:
+            with mapped_file(path) as buffer:
+                yield buffer
+            return
+
+        blocks = stream_blocks(f)
+        try:
+            yield blocks
+        finally:
+            blocks.close()
+
+
+def stream_blocks(
+        f: BinaryIO, block_size: int = BLOCK_SIZE
+) -> Iterator[bytes]:
+    """Yields the contents of the binary file ``f`` in blocks that end on
+    line boundaries (only the last may lack its newline).
+
+    Compressed input is decompressed on the fly. Reading and decompressing
+    run in a background thread up to ``READ_AHEAD_BLOCKS`` blocks ahead.
+    Each block of compressed bytes is decoded in a single call, during
+    which zlib, bz2 and lzma release the GIL, so decompression overlaps
+    with parsing.
+    """
+    return _read_ahead(
+        lambda: _line_blocks(_chunks_of(f, block_size)), READ_AHEAD_BLOCKS
+    )
+
+
+@attr.s(slots=True)
+class LineCounter(object):
+    """Counts the lines of a log from the buffers and blocks it is parsed
+    from, so counting needs no pass over the input of its own."""
+    lines: int = attr.ib(default=0)
+
+    def counting(
+            self, log: Union[Buffer, Iterable[bytes]]
+    ) -> Union[Buffer, Iterator[bytes]]:
+        """Returns ``log`` for the parser, as ``open_log`` yields it.
+
+        A buffer is counted right away, while its pages are being scanned
+        anyway; blocks are counted as the parser takes them.
+        """
+        if isinstance(log, BUFFER_TYPES):
+            self.count(log)
+            return log
+        return self._counted(log)
+
+    def count(self, data: Buffer) -> None:
+        """Adds the lines of ``data``, which ends on a line boundary unless
+        it is the end of the log."""
+        for start in range(0, len(data), BLOCK_SIZE):
+            # bytes() copies a slice of a map or view, but not a block
+            self.lines += bytes(data[start:start + BLOCK_SIZE]).count(b"\n")
+        # A last line without its newline still counts
+        if len(data) and data[-1:] != b"\n":
+            self.lines += 1
+
+    def _counted(self, blocks: Iterable[bytes]) -> Iterator[bytes]:
+        for block in blocks:
+            self.count(block)
+            yield block
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """Replaces every directory with the regular files in it and every glob
+    pattern with the regular files it matches, each in sorted order.
+
+    Other paths are kept as they are, so a missing file fails when opened.
+    A directory or pattern without any file raises FileNotFoundError.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(
+                entry.path for entry in os.scandir(pattern) if entry.is_file()
+            )
+        elif glob.has_magic(pattern):
+            matches = sorted(filter(os.path.isfile, glob.glob(pattern)))
+        else:
+            paths.append(pattern)
+            continue
+        if not matches:
+            raise FileNotFoundError("No files match '{}'".format(pattern))
+        paths.extend(matches)
+    return paths
+
+
+@contextmanager
+def replacing_file(path: str, mode: str = "w") -> Iterator[IO]:
+    """Opens a new temporary file next to ``path`` for writing, and moves
+    it over ``path`` once the ``with`` block completes.
+
+    A run that fails or is interrupted leaves ``path`` as it was, and
+    concurrent runs never write into each other's file: the last one to
+    finish replaces ``path`` whole.
+    """
+    f = tempfile.NamedTemporaryFile(
+        mode,
+        dir=os.path.dirname(path) or ".",
+        prefix=os.path.basename(path) + ".",
+        suffix=".tmp",
+        delete=False,
+    )
+    try:
+        with f:
+            yield f
+        # NamedTemporaryFile is private to its owner; give the result the
+        # permissions open() would have
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(f.name, 0o666 & ~umask)
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _chunks_of(f: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Yields the (decompressed) contents of ``f`` in chunks of any size."""
+    chunks = iter(partial(f.read, chunk_size), b"")
+    compression = detect_compression(f.peek(_MAGIC_SIZE))
+    if compression is None:
+        return chunks
+    return _decompressed(chunks, COMPRESSIONS[compression][1])
+
+
+def _decompressed(
+        chunks: Iterator[bytes], new_decompressor: Callable[[], Any]
+) -> Iterator[bytes]:
+    # Concatenated streams (e.g. of 'cat a.gz b.gz') are decoded one after
+    # another, like the stdlib's file classes do
+    decompressor = new_decompressor()
+    has_input = False
+    for data in chunks:
+        while data:
+            has_input = True
+            yield decompressor.decompress(data)
+            if not decompressor.eof:
+                break
+            data = decompressor.unused_data
+            decompressor = new_decompressor()
+            has_input = False
+    if has_input and not decompressor.eof:
+        raise EOFError(
+            "Compressed file ended before the end-of-stream marker was "
+            "reached"
+        )
+
+
+def _line_blocks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    rest = b""
+    for block in chunks:
+        end = block.rfind(b"\n") + 1
+        if end == 0:
+            rest += block
+            continue
+        yield rest + block[:end]
+        rest = block[end:]
+    if rest:
+        yield rest
+
+
+def _read_ahead(
+        produce: Callable[[], Iterable[bytes]], depth: int
+) -> Iterator[bytes]:
+    """Yields the items of ``produce()`` while a daemon thread produces the
+    following ones into a queue of at most ``depth`` items.
+
+    Errors of the producer are raised in the consumer. Closing the iterator
+    early stops the thread before the caller closes the underlying file.
+    """
+    queue: Queue = Queue(depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def run() -> None:
+        try:
+            for item in produce():
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(e)
+        else:
+            put(_DONE)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Unblock a producer waiting for room, then wait for it to finish
+        try:
+            while True:
+                queue.get_nowait()
+        except Empty:
+            pass
+        thread.join()
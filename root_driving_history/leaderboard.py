@@ -0,0 +1,129 @@
+"""Contains the Leaderboard object definition"""
+
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import attr
+
+
+# (-milli_miles, registration number): ascending order is report order
+RankKey = Tuple[int, int]
+
+# Bucket size of the ranking; buckets are split once they double
+LOAD = 512
+
+
+@attr.s(slots=True)
+class Leaderboard(object):
+    """Drivers ranked by total miles, kept sorted as totals change.
+
+    Ties keep registration order, matching the stable sort of
+    ``create_driving_report``. Keys live in a list of sorted buckets of at
+    most ``2 * LOAD`` entries: an update is two binary searches over the
+    bucket maxima and within one bucket, plus a short in-bucket shift, so
+    it stays cheap with millions of drivers. The top ``k`` drivers are read
+    from the first buckets without visiting the rest.
+    """
+    _buckets: List[List[RankKey]] = attr.ib(
+        init=False, default=attr.Factory(list)
+    )
+    _maxes: List[RankKey] = attr.ib(init=False, default=attr.Factory(list))
+    _key_by_name: Dict[str, RankKey] = attr.ib(
+        init=False, default=attr.Factory(dict)
+    )
+    _names: List[str] = attr.ib(init=False, default=attr.Factory(list))
+
+    def __len__(self) -> int:
+        return len(self._key_by_name)
+
+    def __contains__(self, driver_name: str) -> bool:
+        return driver_name in self._key_by_name
+
+    def __iter__(self) -> Iterator[str]:
+        """Driver names, most miles first."""
+        return (
+            self._names[number]
+            for bucket in self._buckets
+            for _, number in bucket
+        )
+
+    def top(self, k: int) -> List[str]:
+        """The ``k`` drivers with the most miles, most miles first."""
+        return list(islice(self, k))
+
+    def add(self, driver_name: str, milli_miles: int) -> bool:
+        """Adds a driver; returns False if it was already ranked."""
+        if driver_name in self._key_by_name:
+            return False
+
+        key = (-milli_miles, len(self._names))
+        self._names.append(driver_name)
+        self._key_by_name[driver_name] = key
+        self._insert(key)
+        return True
+
+    def update(self, driver_name: str, milli_miles: int) -> bool:
+        """Moves a driver to its new total; returns True if its rank changed.
+        """
+        old_key = self._key_by_name[driver_name]
+        new_key = (-milli_miles, old_key[1])
+        if new_key == old_key:
+            return False
+
+        self._remove(old_key)
+        # The rank is unchanged iff both keys fall in the same gap between
+        # the remaining keys
+        rank_changed = self._locate(old_key) != self._locate(new_key)
+        self._insert(new_key)
+        self._key_by_name[driver_name] = new_key
+        return rank_changed
+
+    def rank_of(
+            self, driver_name: str, stop: Optional[int] = None
+    ) -> Optional[int]:
+        """Zero-based position of the driver in the ranking.
+
+        With ``stop`` only the first ``stop`` ranks are searched, and None is
+        returned for drivers ranked further down.
+        """
+        key = self._key_by_name[driver_name]
+        bucket_index, position = self._locate(key)
+        rank = 0
+        for bucket in islice(self._buckets, bucket_index):
+            rank += len(bucket)
+            if stop is not None and rank >= stop:
+                return None
+        rank += position
+        return None if stop is not None and rank >= stop else rank
+
+    def _locate(self, key: RankKey) -> Tuple[int, int]:
+        bucket_index = bisect_left(self._maxes, key)
+        if bucket_index == len(self._maxes):
+            return bucket_index, 0
+        return bucket_index, bisect_left(self._buckets[bucket_index], key)
+
+    def _insert(self, key: RankKey) -> None:
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            return
+
+        bucket_index = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        bucket = self._buckets[bucket_index]
+        insort(bucket, key)
+        self._maxes[bucket_index] = bucket[-1]
+        if len(bucket) > 2 * LOAD:
+            self._buckets.insert(bucket_index + 1, bucket[LOAD:])
+            del bucket[LOAD:]
+            self._maxes.insert(bucket_index, bucket[-1])
+
+    def _remove(self, key: RankKey) -> None:
+        bucket_index, position = self._locate(key)
+        bucket = self._buckets[bucket_index]
+        del bucket[position]
+        if bucket:
+            self._maxes[bucket_index] = bucket[-1]
+        else:
+            del self._buckets[bucket_index]
+            del self._maxes[bucket_index]
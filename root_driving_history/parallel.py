@@ -0,0 +1,165 @@
+"""Contains the multi-process summarizer for large log files
+
+The file is memory-mapped and split into byte ranges that start and end on
+line boundaries, every range is scanned in place into a SummaryEngine in a
+worker process, and the partial engines are merged in file order.
+Totals are exact integers, so the merged engine, and its report, are
+identical to a serial ``parse_into_summary`` over the whole file.
+
+Batches of files share one pool instead: every file is a task of its own, so
+a batch of many small logs pays for starting the workers only once.
+"""
+
+import os
+from multiprocessing import Pool
+from typing import Iterator, List, Optional, Tuple
+
+from .inputs import LineCounter, mapped_file, open_log
+from .parser import BUFFER_TYPES, Buffer, parse_into_summary
+from .report import create_summary_report
+from .summary import SummaryEngine
+from .trip import FAST_THRESHOLD, SLOW_THRESHOLD
+
+
+def summarize_file(
+        path: str,
+        workers: Optional[int] = None,
+        slow_threshold: float = SLOW_THRESHOLD,
+        fast_threshold: float = FAST_THRESHOLD,
+        line_counter: Optional[LineCounter] = None
+) -> SummaryEngine:
+    """Summarizes the log at ``path`` using ``workers`` processes.
+
+    ``workers`` defaults to the number of CPUs; with a single worker the
+    file is simply streamed through ``parse_into_summary``. So are
+    compressed files and pipes, which can't be split (see ``open_log``).
+    A ``line_counter`` also counts the lines of the log as it is parsed.
+    """
+    workers = _worker_count(workers)
+    engine = SummaryEngine(slow_threshold, fast_threshold)
+    with open_log(path) as log:
+        if workers == 1 or not isinstance(log, BUFFER_TYPES):
+            if line_counter is not None:
+                log = line_counter.counting(log)
+            return parse_into_summary(log, engine)
+
+        byte_ranges = split_into_line_ranges(log, workers)
+
+    count_lines = line_counter is not None
+    with Pool(min(workers, len(byte_ranges) or 1)) as pool:
+        chunk_results = pool.imap(_summarize_chunk, [
+            (path, start, end, slow_threshold, fast_threshold, count_lines)
+            for start, end in byte_ranges
+        ])
+        for chunk_engine, chunk_lines in chunk_results:
+            engine.add_engine(chunk_engine)
+            if count_lines:
+                line_counter.lines += chunk_lines
+
+    return engine
+
+
+def summarize_files(
+        paths: List[str],
+        workers: Optional[int] = None,
+        slow_threshold: float = SLOW_THRESHOLD,
+        fast_threshold: float = FAST_THRESHOLD
+) -> SummaryEngine:
+    """Summarizes the logs at ``paths`` as one log, read in the given order.
+
+    Each file is a task for one of ``workers`` processes, and the partial
+    results are merged in file order, so the report is identical to the
+    report of the files parsed one after another into a single engine.
+    """
+    engine = SummaryEngine(slow_threshold, fast_threshold)
+    tasks = [(path, slow_threshold, fast_threshold) for path in paths]
+    for file_engine in _map_files(
+        _summarize_log, tasks, _worker_count(workers)
+    ):
+        engine.add_engine(file_engine)
+    return engine
+
+
+def report_files(
+        paths: List[str],
+        workers: Optional[int] = None,
+        top: Optional[int] = None,
+        slow_threshold: float = SLOW_THRESHOLD,
+        fast_threshold: float = FAST_THRESHOLD
+) -> Iterator[Tuple[str, str]]:
+    """Yields the path and the report of every log, in the given order.
+
+    The reports are built by ``workers`` processes, one file per task.
+    """
+    tasks = [
+        (path, top, slow_threshold, fast_threshold) for path in paths
+    ]
+    return zip(paths, _map_files(
+        _report_log, tasks, _worker_count(workers)
+    ))
+
+
+def split_into_line_ranges(
+        buffer: Buffer, chunks: int
+) -> List[Tuple[int, int]]:
+    """Splits the buffer into at most ``chunks`` [start, end) byte ranges,
+    each starting at the beginning of a line."""
+    size = len(buffer)
+    boundaries = [0]
+    for chunk in range(1, chunks):
+        offset = max(size * chunk // chunks, boundaries[-1], 1)
+        # Move to the start of the next line (unless already there)
+        newline = buffer.find(b"\n", offset - 1)
+        if newline == -1 or newline + 1 >= size:
+            break
+        boundaries.append(newline + 1)
+    boundaries.append(size)
+
+    return [
+        (start, end)
+        for start, end in zip(boundaries, boundaries[1:])
+        if start < end
+    ]
+
+
+def _summarize_chunk(
+        args: Tuple[str, int, int, float, float, bool]
+) -> Tuple[SummaryEngine, int]:
+    path, start, end, slow_threshold, fast_threshold, count_lines = args
+    engine = SummaryEngine(slow_threshold, fast_threshold)
+    line_counter = LineCounter()
+    with mapped_file(path) as buffer, memoryview(buffer) as view, \
+            view[start:end] as chunk:
+        if count_lines:
+            line_counter.count(chunk)
+        return parse_into_summary(chunk, engine), line_counter.lines
+
+
+def _summarize_log(args: Tuple[str, float, float]) -> SummaryEngine:
+    path, slow_threshold, fast_threshold = args
+    return summarize_file(path, 1, slow_threshold, fast_threshold)
+
+
+def _report_log(args: Tuple[str, Optional[int], float, float]) -> str:
+    path, top, slow_threshold, fast_threshold = args
+    return create_summary_report(
+        summarize_file(path, 1, slow_threshold, fast_threshold), top
+    )
+
+
+def _worker_count(workers: Optional[int]) -> int:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("'workers' should be at least 1")
+    return workers
+
+
+def _map_files(func, tasks: List[tuple], workers: int) -> Iterator:
+    # Results come back in task order; one worker runs them in this process
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        yield from map(func, tasks)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap(func, tasks)
@@ -2,97 +2,260 @@
 
 import re
 from io import StringIO
-from collections import defaultdict
-from typing import Union, List, Optional
+from mmap import mmap
+from typing import (
+    Callable, Dict, Union, List, Optional, Iterable, Iterator, Match, Tuple
+)
 
+from .registry import DriverRegistry
+from .storage import ListTripStore, TripStore
+from .summary import DriverSummary
+from .summary import SummaryEngine
 from .trip_log import TripLog
 from .driver import Driver
 from .trip import Trip
-from .trip import TripTime
 
 
 DRIVER_KEYWORD_REGEX = "Driver [A-Za-z]{2,}"
 TRIP_KEYWORD_REGEX = r"Trip [A-Za-z]{2,} \d{2}:\d{2} \d{2}:\d{2} \d+\.?\d*"
 
+# Single pattern classifying both keywords at once; the named groups carry
+# every field needed downstream so no line is ever matched or split twice.
+TOKEN_REGEX = re.compile(
+    r"Driver (?P<driver>[A-Za-z]{2,})"
+    r"|Trip (?P<trip_driver>[A-Za-z]{2,})"
+    r" (?P<start_hour>\d{2}):(?P<start_min>\d{2})"
+    r" (?P<end_hour>\d{2}):(?P<end_min>\d{2})"
+    r" (?P<miles>\d+)\.?(?P<miles_fraction>\d*)"
+)
+TOKEN_BYTES_REGEX = re.compile(TOKEN_REGEX.pattern.encode("ascii"))
+DRIVER_TOKEN = "Driver"
+TRIP_TOKEN = "Trip"
 
-def parse_input_log(raw_data: Union[str, StringIO]) -> List[TripLog]:
+# Thousandths of a mile per unit of the last digit, by fraction length
+_FRACTION_SCALES = (1000, 100, 10, 1)
+
+Token = Tuple
+Buffer = Union[bytes, bytearray, memoryview, mmap]
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap)
+
+
+def parse_input_log(
+        raw_data: Union[str, StringIO],
+        trip_store: Callable[[], TripStore] = ListTripStore
+) -> List[TripLog]:
     if raw_data.__class__ not in [str, StringIO]:
         raise TypeError(
             "'raw_data' needs to be a str or io.StringIO buffer, if given"
         )
 
-    if raw_data.__class__ == StringIO:
-        raw_data = raw_data.getvalue()
+    if raw_data.__class__ == str:
+        raw_data = StringIO(raw_data)
+    else:
+        raw_data.seek(0)
+
+    return parse_input_stream(raw_data, trip_store)
+
 
-    driver_lines = re.findall(DRIVER_KEYWORD_REGEX, raw_data)
-    trip_lines = re.findall(TRIP_KEYWORD_REGEX, raw_data)
+def parse_input_stream(
+        lines: Iterable[str],
+        trip_store: Callable[[], TripStore] = ListTripStore
+) -> List[TripLog]:
+    """Parses the log one line at a time from any iterable of text lines.
 
-    if driver_lines:
-        drivers = [
-            _create_driver_from_regex_driver_line(driver_line)
-            for driver_line in driver_lines
-        ]
-        trip_logs = [TripLog(driver) for driver in drivers]
+    Only the TripLogs and the trips of drivers that have not (yet) been
+    registered are held in memory, so open files and ``sys.stdin`` can be
+    given directly without reading them into a single buffer first. Each
+    TripLog keeps its trips in a new ``trip_store``.
+    """
+    return parse_into_registry(lines, DriverRegistry(trip_store)).trip_logs
 
-        # Add trips to each Driver's TripLog
-        trips_by_driver = defaultdict(list)
-        for trip_line in trip_lines:
-            trips_by_driver[_get_driver_of_regex_trip_line(trip_line)].append(
-                _create_trip_from_regex_trip_line(trip_line)
+
+def parse_into_registry(
+        lines: Union[Iterable[str], Buffer],
+        registry: Optional[DriverRegistry] = None
+) -> DriverRegistry:
+    tokens = _tokens_of(lines)
+    if registry is None:
+        registry = DriverRegistry()
+    elif registry.__class__ != DriverRegistry:
+        raise TypeError("'registry' needs to be a DriverRegistry object")
+
+    for token in tokens:
+        if token[0] == DRIVER_TOKEN:
+            registry.register(Driver(token[1]))
+        else:
+            _, driver_name, start_minute, end_minute, milli_miles = token
+            registry.add_trip(
+                driver_name,
+                _create_trip(start_minute, end_minute, milli_miles)
             )
 
-        driver_names = [trip_log.driver.name for trip_log in trip_logs]
-        for driver_name, trips in trips_by_driver.items():
-            try:
-                driver_log_index = driver_names.index(driver_name)
-            except ValueError:
-                continue
+    return registry
 
-            for trip in trips:
-                trip_logs[driver_log_index].add_trip(trip)
 
-    else:
-        trip_logs = []
+def summarize_input_stream(lines: Iterable[str]) -> List[DriverSummary]:
+    """Like ``parse_input_stream`` but only keeps per-driver totals."""
+    return parse_into_summary(lines).summaries
+
+
+def parse_into_summary(
+        lines: Union[Iterable[str], Buffer],
+        engine: Optional[SummaryEngine] = None
+) -> SummaryEngine:
+    """Feeds every record of ``lines`` into ``engine`` (or a new one).
 
-    return trip_logs
+    ``lines`` is either an iterable of text lines (or of bytes blocks of
+    whole lines, see ``tokenize``) or a bytes-like buffer such as an
+    ``mmap``, which is scanned in place by ``tokenize_buffer``.
+    """
+    tokens = _tokens_of(lines)
+    if engine is None:
+        engine = SummaryEngine()
+    elif engine.__class__ != SummaryEngine:
+        raise TypeError("'engine' needs to be a SummaryEngine object")
+
+    # Names are looked up once per record here rather than by the engine
+    driver_ids: Dict[str, int] = {}
+    register_id = engine.register_id
+    add_trip_for_id = engine.add_trip_for_id
+    for token in tokens:
+        driver_id = driver_ids.get(token[1])
+        if driver_id is None:
+            driver_id = driver_ids[token[1]] = engine.driver_id(token[1])
+        if token[0] == DRIVER_TOKEN:
+            register_id(driver_id)
+        else:
+            add_trip_for_id(driver_id, *token[2:])
+
+    return engine
+
+
+def tokenize(lines: Iterable[Union[str, Buffer]]) -> Iterator[Token]:
+    """Yields one token per Driver or Trip record found in ``lines``.
+
+    Driver records become ``("Driver", name)`` and Trip records become
+    ``("Trip", name, start_minute, end_minute, milli_miles)``, where the
+    times are minutes since midnight and the distance is in whole
+    thousandths of a mile.
+
+    Besides text lines, ``lines`` may hold bytes-like blocks of whole lines,
+    such as the lines of a binary file or the blocks of ``inputs.open_log``;
+    those are scanned by ``tokenize_buffer``.
+    """
+    finditer = TOKEN_REGEX.finditer
+    for line in lines:
+        if isinstance(line, str):
+            for match in finditer(line):
+                yield _token_from_match(match)
+        else:
+            yield from tokenize_buffer(line)
+
+
+def tokenize_buffer(
+        buffer: Buffer, start: int = 0, end: Optional[int] = None
+) -> Iterator[Token]:
+    """Like ``tokenize`` but scans ``buffer[start:end]`` in place.
+
+    The buffer (e.g. an ``mmap`` of the log file) is never copied or decoded
+    as a whole; only the names and numbers of each record are.
+    """
+    if end is None:
+        end = len(buffer)
+    for match in TOKEN_BYTES_REGEX.finditer(buffer, start, end):
+        token = _token_from_match(match)
+        yield (token[0], token[1].decode("ascii")) + token[2:]
+
+
+def _tokens_of(lines: Union[Iterable[str], Buffer]) -> Iterator[Token]:
+    if isinstance(lines, BUFFER_TYPES):
+        return tokenize_buffer(lines)
+    if isinstance(lines, str) or not hasattr(lines, "__iter__"):
+        raise TypeError(
+            "'lines' needs to be an iterable of text lines or a bytes buffer"
+        )
+    return tokenize(lines)
+
+
+def _token_from_match(match: Match) -> Token:
+    (
+        driver_name, trip_driver_name,
+        start_hour, start_min, end_hour, end_min, miles, miles_fraction
+    ) = match.groups()
+    if driver_name is not None:
+        return DRIVER_TOKEN, driver_name
+
+    return (
+        TRIP_TOKEN,
+        trip_driver_name,
+        _minute_of_day(start_hour, start_min),
+        _minute_of_day(end_hour, end_min),
+        _milli_miles(miles, miles_fraction),
+    )
+
+
+def _minute_of_day(
+        hour: Union[str, bytes], minute: Union[str, bytes]
+) -> int:
+    hour, minute = int(hour), int(minute)
+    if hour > 23:
+        raise ValueError("'hour' should be between 0 and 23, inclusive")
+    if minute > 59:
+        raise ValueError("'min' should be between 0 and 59, inclusive")
+    return hour * 60 + minute
+
+
+def _milli_miles(
+        miles: Union[str, bytes], miles_fraction: Union[str, bytes]
+) -> int:
+    # Read straight from the digits, so "17.3" is exactly 17300
+    digits = len(miles_fraction)
+    if digits < len(_FRACTION_SCALES):
+        return int(miles + miles_fraction) * _FRACTION_SCALES[digits]
+    milli_miles, rest = divmod(
+        int(miles + miles_fraction), 10 ** (digits - 3)
+    )
+    if rest:
+        raise ValueError("a trip's miles can have at most three decimals")
+    return milli_miles
+
+
+def _create_trip(
+        start_minute: int, end_minute: int, milli_miles: int
+) -> Trip:
+    return Trip.from_minutes(start_minute, end_minute, milli_miles)
+
+
+def _match_token(line: str) -> Optional[Token]:
+    match = TOKEN_REGEX.match(line)
+    return None if match is None else _token_from_match(match)
 
 
 def _create_driver_from_regex_driver_line(
         regex_driver_line: str
 ) -> Optional[Driver]:
-    if not re.match(DRIVER_KEYWORD_REGEX, regex_driver_line):
+    token = _match_token(regex_driver_line)
+    if token is None or token[0] != DRIVER_TOKEN:
         return None
 
-    keyword, driver_name = regex_driver_line.split(" ")
-
-    return Driver(driver_name)
+    return Driver(token[1])
 
 
 def _create_trip_from_regex_trip_line(
         regex_trip_line: str
 ) -> Optional[Trip]:
-    if not re.match(TRIP_KEYWORD_REGEX, regex_trip_line):
+    token = _match_token(regex_trip_line)
+    if token is None or token[0] != TRIP_TOKEN:
         return None
 
-    keyword, driver, start_time, end_time, miles = regex_trip_line.split(" ")
-
-    start_time_hour, start_time_min = [int(p) for p in start_time.split(":")]
-    end_time_hour, end_time_min = [int(p) for p in end_time.split(":")]
-    miles_driven = float(miles)
-
-    return Trip(
-        TripTime(start_time_hour, start_time_min),
-        TripTime(end_time_hour, end_time_min),
-        miles_driven
-    )
+    return _create_trip(*token[2:])
 
 
 def _get_driver_of_regex_trip_line(
         regex_trip_line: str
-) -> Optional[Driver]:
-    if not re.match(TRIP_KEYWORD_REGEX, regex_trip_line):
+) -> Optional[str]:
+    token = _match_token(regex_trip_line)
+    if token is None or token[0] != TRIP_TOKEN:
         return None
 
-    _, driver_name, _, _, _ = regex_trip_line.split(" ")
-
-    return driver_name
+    return token[1]
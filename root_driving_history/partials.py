@@ -0,0 +1,69 @@
+"""Contains the partial aggregate files of sharded, multi-node runs
+
+Each node summarizes its share of the logs into a partial: the JSON state of
+a SummaryEngine, i.e. the drivers registered in that share (in registration
+order) and the speed filtered miles, minutes and trip count of every driver
+name seen there. Totals are exact integers, so merging the partials of
+consecutive shards in log order gives the report of one run over all of the
+logs, whichever node produced which partial.
+"""
+
+import json
+from typing import Iterable, TextIO
+
+from .summary import SummaryEngine
+
+
+PARTIAL_FORMAT = "root-driving-history-partial"
+PARTIAL_VERSION = 1
+
+
+def dump_partial(engine: SummaryEngine, f: TextIO) -> None:
+    """Writes ``engine`` to the text file ``f`` as a partial."""
+    json.dump({
+        "format": PARTIAL_FORMAT,
+        "version": PARTIAL_VERSION,
+        "summary": engine.to_state(),
+    }, f)
+    f.write("\n")
+
+
+def load_partial(f: TextIO) -> SummaryEngine:
+    """Reads a partial written by ``dump_partial`` back into an engine."""
+    name = getattr(f, "name", "partial")
+    try:
+        partial = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError("'{}' is not a valid partial: {}".format(name, e))
+    if not isinstance(partial, dict) or \
+            partial.get("format") != PARTIAL_FORMAT:
+        raise ValueError("'{}' is not a valid partial".format(name))
+    if partial.get("version") != PARTIAL_VERSION:
+        raise ValueError(
+            "'{}' is a version {!r} partial, expected version {}".format(
+                name, partial.get("version"), PARTIAL_VERSION
+            )
+        )
+    return SummaryEngine.from_state(partial.get("summary"))
+
+
+def merge_partials(engines: Iterable[SummaryEngine]) -> SummaryEngine:
+    """Merges the engines of consecutive shards, given in log order.
+
+    Drivers are registered in the order their shards are given, so ties in
+    the report rank the same as for a single run over the joined logs.
+    """
+    merged = None
+    for engine in engines:
+        thresholds = (engine.slow_threshold, engine.fast_threshold)
+        if merged is None:
+            merged = SummaryEngine(*thresholds)
+        elif thresholds != (merged.slow_threshold, merged.fast_threshold):
+            raise ValueError(
+                "partials summarized with different speed thresholds "
+                "can't be merged"
+            )
+        merged.add_engine(engine)
+    if merged is None:
+        raise ValueError("there are no partials to merge")
+    return merged
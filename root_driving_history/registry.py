@@ -0,0 +1,70 @@
+"""Contains the DriverRegistry object definition"""
+
+from collections import defaultdict
+from typing import Callable, DefaultDict, Dict, Iterator, List, Optional
+
+import attr
+
+from .driver import Driver
+from .storage import ListTripStore, TripStore
+from .trip import Trip
+from .trip_log import TripLog
+
+
+@attr.s(slots=True)
+class DriverRegistry(object):
+    """Maps driver names to their TripLog, in registration order.
+
+    Registering a name that is already known is a no-op that returns the
+    existing TripLog, so duplicate Driver lines never produce duplicate
+    TripLogs. Trips for names that are not registered yet are held back
+    and attributed once (and if) their Driver is registered.
+
+    ``trip_store`` is called for the TripStore of each new TripLog, e.g.
+    ``ArrayTripStore`` to hold many trips compactly.
+    """
+    trip_store: Callable[[], TripStore] = attr.ib(default=ListTripStore)
+    _trip_logs: Dict[str, TripLog] = attr.ib(
+        init=False, default=attr.Factory(dict)
+    )
+    _unregistered_trips: DefaultDict[str, List[Trip]] = attr.ib(
+        init=False, default=attr.Factory(lambda: defaultdict(list))
+    )
+
+    @property
+    def trip_logs(self) -> List[TripLog]:
+        return list(self._trip_logs.values())
+
+    def __len__(self) -> int:
+        return len(self._trip_logs)
+
+    def __iter__(self) -> Iterator[TripLog]:
+        return iter(self._trip_logs.values())
+
+    def __contains__(self, driver_name: str) -> bool:
+        return driver_name in self._trip_logs
+
+    def get_trip_log(self, driver_name: str) -> Optional[TripLog]:
+        return self._trip_logs.get(driver_name)
+
+    def register(self, driver: Driver) -> TripLog:
+        if driver.__class__ != Driver:
+            raise TypeError("'driver' needs to be a Driver object")
+
+        trip_log = self._trip_logs.get(driver.name)
+        if trip_log is None:
+            trip_log = self._trip_logs[driver.name] = TripLog(
+                driver, trip_store=self.trip_store()
+            )
+            for trip in self._unregistered_trips.pop(driver.name, []):
+                trip_log.add_trip(trip)
+
+        return trip_log
+
+    def add_trip(self, driver_name: str, trip: Trip) -> "DriverRegistry":
+        trip_log = self._trip_logs.get(driver_name)
+        if trip_log is None:
+            self._unregistered_trips[driver_name].append(trip)
+        else:
+            trip_log.add_trip(trip)
+        return self
@@ -1,39 +1,139 @@
 """Contains the definition for report functions"""
 
-from typing import List
-
+import heapq
+from typing import Iterable, List, Optional, Union
+
+from .database import TripDatabase
+from .registry import DriverRegistry
+from .summary import DriverSummary
+from .summary import SummaryEngine
+from .trip import FAST_THRESHOLD, MILLI_MILES_PER_MILE, SLOW_THRESHOLD
+from .trip import round_ratio
 from .trip_log import TripLog
 
 
-def create_driving_report(trip_logs: List[TripLog]) -> str:
+NO_DATA_REPORT = "No data collected"
+NO_TRIPS_LINE = "{name}: 0 miles"
+HAD_TRIPS_LINE = "{name}: {total_miles} miles @ {avg_speed} mph"
+
+
+def create_driving_report(
+        trip_logs: Union[List[TripLog], DriverRegistry, TripDatabase],
+        top: Optional[int] = None,
+        slow_threshold: float = SLOW_THRESHOLD,
+        fast_threshold: float = FAST_THRESHOLD
+) -> str:
+    """Renders the report, optionally limited to the ``top`` drivers with
+    the most miles.
+
+    Trips outside of the speed thresholds are skipped while summing; the
+    TripLogs themselves are never copied. A TripDatabase is summed by a
+    single aggregate query. Trips that are already in columns, such as a
+    ``TripTable``, render the same report with ``TripTable.create_report``.
+    """
+    if trip_logs.__class__ == TripDatabase:
+        return create_summary_report(
+            trip_logs.get_summaries(slow_threshold, fast_threshold), top
+        )
+
+    if trip_logs.__class__ == DriverRegistry:
+        trip_logs = trip_logs.trip_logs
+
     if any([trip_log.__class__ != TripLog for trip_log in trip_logs]):
         raise TypeError("'trip_logs' should be a list of TripLog objects")
 
-    if trip_logs:
-        prepared_trip_logs = [
-            _remove_slow_and_fast_trips(trip_log)
-            for trip_log in trip_logs
-        ]
-        report_items_with_total_miles = [
-            (
-                prepared_trip_log.get_total_miles_driven(),
-                create_summary_for_trip_log(prepared_trip_log)
-            )
-            for prepared_trip_log in prepared_trip_logs
-        ]
-        sorted_report_items = [
-            report_item
-            for _, report_item in sorted(
-                report_items_with_total_miles, key=lambda k: k[0], reverse=True
-            )
-        ]
-        report = "\n".join(sorted_report_items)
+    return create_summary_report([
+        trip_log.get_filtered_summary(slow_threshold, fast_threshold)
+        for trip_log in trip_logs
+    ], top)
+
+
+def create_summary_report(
+        summaries: Union[List[DriverSummary], SummaryEngine],
+        top: Optional[int] = None
+) -> str:
+    """Renders the same report as ``create_driving_report`` from totals
+    that were already speed filtered, e.g. by a SummaryEngine."""
+    if summaries.__class__ == SummaryEngine:
+        summaries = summaries.summaries
+
+    if any([summary.__class__ != DriverSummary for summary in summaries]):
+        raise TypeError(
+            "'summaries' should be a list of DriverSummary objects"
+        )
+
+    if summaries:
+        report = "\n".join([
+            create_summary_for_driver_summary(summary)
+            for summary in rank_summaries(summaries, top)
+        ])
     else:
-        report = "No data collected"
+        report = NO_DATA_REPORT
 
     return report
 
 
+def rank_summaries(
+        summaries: Union[List[DriverSummary], SummaryEngine],
+        top: Optional[int] = None
+) -> List[DriverSummary]:
+    """Orders summaries as the report lists them: most miles first, ties
+    in their original order, only the first ``top`` if given."""
+    if summaries.__class__ == SummaryEngine:
+        summaries = summaries.summaries
+
+    return [
+        summaries[index]
+        for index in _rank_by_most_miles(
+            [summary.milli_miles for summary in summaries], top
+        )
+    ]
+
+
+def create_ranked_summary_report(
+        ranked_summaries: Iterable[DriverSummary]
+) -> str:
+    """Renders summaries that are already in report order (most miles
+    first), e.g. as kept by a Leaderboard."""
+    lines = [
+        create_summary_for_driver_summary(summary)
+        for summary in ranked_summaries
+    ]
+    return "\n".join(lines) if lines else NO_DATA_REPORT
+
+
+def create_summary_for_driver_summary(summary: DriverSummary) -> str:
+    if summary.__class__ != DriverSummary:
+        raise TypeError("'summary' needs to be a DriverSummary object")
+
+    if summary.isempty():
+        return NO_TRIPS_LINE.format(name=summary.name)
+
+    # Rounded half to even like round(), but on the exact integer totals
+    return HAD_TRIPS_LINE.format(**{
+        "name": summary.name,
+        "total_miles": round_ratio(summary.milli_miles, MILLI_MILES_PER_MILE),
+        "avg_speed": round_ratio(
+            summary.milli_miles * 60, summary.minutes * MILLI_MILES_PER_MILE
+        )
+    })
+
+
+def _rank_by_most_miles(
+        total_miles: List[int], top: Optional[int] = None
+) -> List[int]:
+    """Indices of ``total_miles`` from most to least miles, ties in their
+    original order; only the first ``top`` are selected if given."""
+    if top is not None and top < 0:
+        raise ValueError("'top' should not be negative")
+
+    indices = range(len(total_miles))
+    if top is None:
+        return sorted(indices, key=total_miles.__getitem__, reverse=True)
+    # Documented to equal sorted(..., reverse=True)[:top], in O(n log top)
+    return heapq.nlargest(top, indices, key=total_miles.__getitem__)
+
+
 def create_summary_for_trip_log(trip_log: TripLog) -> str:
     if trip_log.__class__ != TripLog:
         raise TypeError("'trip_log' needs to be a TripLog object")
@@ -50,7 +150,7 @@ def _add_no_trips_line(trip_log: TripLog) -> str:
     if not trip_log.isempty():
         raise ValueError("'trip_log' is expected to be empty")
 
-    return "{}: 0 miles".format(trip_log.driver.name)
+    return NO_TRIPS_LINE.format(name=trip_log.driver.name)
 
 
 def _add_had_trips_line(trip_log: TripLog) -> str:
@@ -60,28 +160,24 @@ def _add_had_trips_line(trip_log: TripLog) -> str:
     if trip_log.isempty():
         raise ValueError("'trip_log' is expected to have at least one trip")
 
-    return "{name}: {total_miles} miles @ {avg_speed} mph".format(**{
-        "name": trip_log.driver.name,
-        "total_miles": round(trip_log.get_total_miles_driven()),
-        "avg_speed": round(trip_log.get_average_speed())
-    })
+    return create_summary_for_driver_summary(trip_log.get_summary())
 
 
 def _remove_slow_and_fast_trips(
-        trip_log: TripLog, slow_threshold=5, fast_threshold=100
+        trip_log: TripLog,
+        slow_threshold=SLOW_THRESHOLD,
+        fast_threshold=FAST_THRESHOLD
 ) -> TripLog:
+    """Returns a filtered copy of ``trip_log``.
+
+    Reports no longer need this; prefer ``TripLog.filtered_trips`` or
+    ``TripLog.get_filtered_summary``, which do not copy anything.
+    """
     if trip_log.__class__ != TripLog:
         raise TypeError("'trip_log' needs to be a TripLog object")
 
-    driver = trip_log.driver
-    trips = [
-        trip
-        for trip in trip_log.trips
-        if slow_threshold <= trip.mph <= fast_threshold
-    ]
-
-    return_log = TripLog(driver)
-    for trip in trips:
+    return_log = TripLog(trip_log.driver)
+    for trip in trip_log.filtered_trips(slow_threshold, fast_threshold):
         return_log.add_trip(trip)
 
     return return_log
@@ -0,0 +1,74 @@
+"""Contains the RunStats recorder behind the CLI's --stats option"""
+
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+import attr
+
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+@attr.s(slots=True)
+class StageStats(object):
+    name: str = attr.ib()
+    wall_seconds: float = attr.ib(default=0)
+    cpu_seconds: float = attr.ib(default=0)
+    peak_rss_bytes: int = attr.ib(default=0)
+    counts: Dict[str, int] = attr.ib(default=attr.Factory(dict))
+
+
+@attr.s(slots=True)
+class RunStats(object):
+    """Wall time, CPU time and peak RSS of each stage of a run, plus
+    whatever the stage counted (lines, trips, drivers...)."""
+    stages: List[StageStats] = attr.ib(default=attr.Factory(list))
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageStats]:
+        """Times the ``with`` block; add counts to the yielded stage."""
+        stage = StageStats(name)
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        try:
+            yield stage
+        finally:
+            stage.wall_seconds = time.perf_counter() - wall
+            stage.cpu_seconds = _cpu_seconds() - cpu
+            stage.peak_rss_bytes = peak_rss_bytes()
+            self.stages.append(stage)
+
+    def format(self) -> str:
+        lines = ["{:<10} {:>9} {:>9} {:>13}  {}".format(
+            "stage", "wall s", "cpu s", "peak RSS MiB", "counts"
+        )]
+        for stage in self.stages:
+            lines.append("{:<10} {:9.3f} {:9.3f} {:13.1f}  {}".format(
+                stage.name, stage.wall_seconds, stage.cpu_seconds,
+                stage.peak_rss_bytes / 2 ** 20,
+                " ".join(
+                    "{}={:,}".format(name, count)
+                    for name, count in stage.counts.items()
+                )
+            ).rstrip())
+        return "\n".join(lines)
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident size of this process or of its largest finished
+    child, e.g. a --workers process."""
+    return _RSS_UNIT * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+
+def _cpu_seconds() -> float:
+    # Includes finished children, so pool workers are accounted for
+    times = os.times()
+    return times.user + times.system \
+        + times.children_user + times.children_system
@@ -0,0 +1,91 @@
+"""Contains the TripStore interface and its implementations
+
+A TripStore holds a single driver's trips for a TripLog, in the order they
+were added. The TripLog keeps the running totals, so a store only has to
+append and iterate; picking an implementation trades speed for memory.
+"""
+
+import abc
+from array import array
+from typing import Any, Iterator, List
+
+import attr
+
+from .trip import Trip
+
+
+class TripStore(abc.ABC):
+    """Append-only storage for the trips of one TripLog."""
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def add_trip(self, trip: Trip) -> None:
+        """Stores ``trip`` after the trips added before it."""
+
+    @abc.abstractmethod
+    def __iter__(self) -> Iterator[Trip]:
+        """Yields the stored trips in the order they were added."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of stored trips."""
+
+    def __eq__(self, other: Any) -> bool:
+        # Stores are equal when they hold equal trips, whatever their kind
+        if not isinstance(other, TripStore):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            trip == other_trip for trip, other_trip in zip(self, other)
+        )
+
+    __hash__ = None
+
+
+@attr.s(slots=True, eq=False)
+class ListTripStore(TripStore):
+    """Keeps the Trip objects themselves; the fastest to iterate."""
+    _trips: List[Trip] = attr.ib(init=False, default=attr.Factory(list))
+
+    def add_trip(self, trip: Trip) -> None:
+        self._trips.append(trip)
+
+    def __iter__(self) -> Iterator[Trip]:
+        return iter(self._trips)
+
+    def __len__(self) -> int:
+        return len(self._trips)
+
+
+@attr.s(slots=True, eq=False)
+class ArrayTripStore(TripStore):
+    """Keeps each trip as 12 bytes of columns instead of a Trip object.
+
+    Trips are rebuilt with ``Trip.from_minutes`` while iterating, so their
+    ``miles_driven`` always comes back as a float of whole thousandths.
+    """
+    _start_minutes: array = attr.ib(
+        init=False, default=attr.Factory(lambda: array("h"))
+    )
+    _end_minutes: array = attr.ib(
+        init=False, default=attr.Factory(lambda: array("h"))
+    )
+    _milli_miles: array = attr.ib(
+        init=False, default=attr.Factory(lambda: array("q"))
+    )
+
+    def add_trip(self, trip: Trip) -> None:
+        # Miles first: it is the only column that can reject a value
+        self._milli_miles.append(trip.milli_miles)
+        self._start_minutes.append(
+            trip.start_time.hour * 60 + trip.start_time.min
+        )
+        self._end_minutes.append(trip.end_time.hour * 60 + trip.end_time.min)
+
+    def __iter__(self) -> Iterator[Trip]:
+        return map(
+            Trip.from_minutes,
+            self._start_minutes, self._end_minutes, self._milli_miles
+        )
+
+    def __len__(self) -> int:
+        return len(self._milli_miles)
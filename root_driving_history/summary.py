@@ -0,0 +1,312 @@
+"""Contains the DriverSummary, SpeedFilter and SummaryEngine definitions"""
+
+from math import isfinite
+from typing import Any, Dict, List, Optional, Tuple
+
+import attr
+
+from .symbols import DriverSymbols
+from .trip import FAST_THRESHOLD, MILLI_MILES_PER_MILE, SLOW_THRESHOLD
+from .trip import decimal_fraction
+
+
+@attr.s(slots=True)
+class DriverSummary(object):
+    """Running totals of the trips that passed the speed filter.
+
+    Distances are whole thousandths of a mile and durations whole minutes,
+    so totals are exact and summaries of any split of the trips add up to
+    the same totals.
+    """
+    name: str = attr.ib()
+    milli_miles: int = attr.ib(default=0)
+    minutes: int = attr.ib(default=0)
+    trip_count: int = attr.ib(default=0)
+
+    @property
+    def total_miles(self) -> float:
+        return self.milli_miles / MILLI_MILES_PER_MILE
+
+    @property
+    def total_hours(self) -> float:
+        return self.minutes / 60
+
+    def isempty(self) -> bool:
+        return self.trip_count == 0
+
+    def add_trip(self, milli_miles: int, minutes: int) -> "DriverSummary":
+        self.milli_miles += milli_miles
+        self.minutes += minutes
+        self.trip_count += 1
+        return self
+
+    def add_summary(self, other: "DriverSummary") -> "DriverSummary":
+        """Adds the totals of ``other``, e.g. from another part of the
+        log."""
+        self.milli_miles += other.milli_miles
+        self.minutes += other.minutes
+        self.trip_count += other.trip_count
+        return self
+
+    def get_average_speed(self) -> Optional[float]:
+        if self.isempty():
+            return None
+        return self.milli_miles * 60 / (self.minutes * MILLI_MILES_PER_MILE)
+
+
+@attr.s(slots=True, frozen=True)
+class SpeedFilter(object):
+    """The speed thresholds, checked with integer arithmetic only.
+
+    A trip of ``milli_miles`` over ``minutes`` averages
+    ``3 * milli_miles / (50 * minutes)`` mph. Each threshold is held as the
+    exact ratio ``n / d`` of its decimal value (so 0.1 is 1/10), and
+    comparing it to a trip's speed is a comparison of
+    ``3 * d * milli_miles`` and ``50 * n * minutes``.
+    """
+    slow_threshold: float = attr.ib(default=SLOW_THRESHOLD)
+    fast_threshold: float = attr.ib(default=FAST_THRESHOLD)
+    _slow: Tuple[int, int] = attr.ib(init=False, eq=False, repr=False)
+    _fast: Tuple[int, int] = attr.ib(init=False, eq=False, repr=False)
+
+    @slow_threshold.validator
+    @fast_threshold.validator
+    def is_finite(self, attribute, value) -> Optional[ValueError]:
+        if not isfinite(value):
+            raise ValueError(
+                "'{}' should be a finite number".format(attribute.name)
+            )
+
+    def __attrs_post_init__(self) -> None:
+        for name, threshold in [
+                ("_slow", self.slow_threshold),
+                ("_fast", self.fast_threshold)
+        ]:
+            ratio = decimal_fraction(threshold)
+            object.__setattr__(self, name, (
+                3 * ratio.denominator, 50 * ratio.numerator
+            ))
+
+    def accepts(self, milli_miles: int, minutes: int) -> bool:
+        """Whether the trip's average speed is inside the thresholds."""
+        slow_miles, slow_minutes = self._slow
+        fast_miles, fast_minutes = self._fast
+        return slow_minutes * minutes <= slow_miles * milli_miles and \
+            fast_miles * milli_miles <= fast_minutes * minutes
+
+    def get_bounds(self) -> Dict[str, int]:
+        """The integer coefficients of both comparisons, e.g. to run them
+        in SQL."""
+        return {
+            "slow_miles": self._slow[0], "slow_minutes": self._slow[1],
+            "fast_miles": self._fast[0], "fast_minutes": self._fast[1],
+        }
+
+
+DEFAULT_SPEED_FILTER = SpeedFilter()
+
+
+@attr.s(slots=True)
+class SummaryEngine(object):
+    """Aggregates Driver/Trip tokens into per-driver totals as they arrive.
+
+    No Trip objects are created; memory grows with the number of distinct
+    driver names rather than with the number of trips. Totals are kept for
+    every name seen so trips logged before their Driver line still count.
+
+    Names are interned into dense driver ids on first sight and the totals
+    live in lists indexed by id; DriverSummary objects (and names) only
+    come back out of ``summaries`` and ``get_summary``. Callers that keep
+    an id from ``driver_id`` can use ``register_id``/``add_trip_for_id``
+    and skip the name lookup. All totals are integers (thousandths of a
+    mile, minutes), so engines over parts of a log merge exactly.
+    """
+    slow_threshold: float = attr.ib(default=SLOW_THRESHOLD)
+    fast_threshold: float = attr.ib(default=FAST_THRESHOLD)
+    _speed_filter: SpeedFilter = attr.ib(init=False, eq=False, repr=False)
+    _symbols: DriverSymbols = attr.ib(
+        init=False, default=attr.Factory(DriverSymbols)
+    )
+    _registered: Dict[int, None] = attr.ib(
+        init=False, default=attr.Factory(dict)
+    )
+    _milli_miles: List[int] = attr.ib(init=False, default=attr.Factory(list))
+    _minutes: List[int] = attr.ib(init=False, default=attr.Factory(list))
+    _trip_counts: List[int] = attr.ib(init=False, default=attr.Factory(list))
+    _discarded_trip_count: int = attr.ib(init=False, default=0)
+
+    def __attrs_post_init__(self) -> None:
+        self._speed_filter = SpeedFilter(
+            self.slow_threshold, self.fast_threshold
+        )
+
+    @property
+    def summaries(self) -> List[DriverSummary]:
+        """The registered drivers' summaries, in registration order."""
+        return [self._summary_of(driver_id) for driver_id in self._registered]
+
+    @property
+    def accepted_trip_count(self) -> int:
+        """Trips inside the speed thresholds, registered drivers or not."""
+        return sum(self._trip_counts)
+
+    @property
+    def discarded_trip_count(self) -> int:
+        """Trips left out for being too slow or too fast."""
+        return self._discarded_trip_count
+
+    def __len__(self) -> int:
+        return len(self._registered)
+
+    def __contains__(self, driver_name: str) -> bool:
+        return self._symbols.get_id(driver_name) in self._registered
+
+    def get_summary(self, driver_name: str) -> DriverSummary:
+        """A copy of the running totals of any driver name, registered or
+        not."""
+        driver_id = self._symbols.get_id(driver_name)
+        if driver_id is None:
+            return DriverSummary(driver_name)
+        return self._summary_of(driver_id)
+
+    def driver_id(self, driver_name: str) -> int:
+        """The dense id of ``driver_name``, interning it if it is new."""
+        driver_id = self._symbols.intern(driver_name)
+        if driver_id == len(self._trip_counts):
+            self._milli_miles.append(0)
+            self._minutes.append(0)
+            self._trip_counts.append(0)
+        return driver_id
+
+    def register_driver(self, driver_name: str) -> "SummaryEngine":
+        return self.register_id(self.driver_id(driver_name))
+
+    def register_id(self, driver_id: int) -> "SummaryEngine":
+        if not 0 <= driver_id < len(self._trip_counts):
+            raise IndexError("unknown driver id {}".format(driver_id))
+        self._registered[driver_id] = None
+        return self
+
+    def add_trip(
+            self,
+            driver_name: str,
+            start_minute: int,
+            end_minute: int,
+            milli_miles: int
+    ) -> "SummaryEngine":
+        return self.add_trip_for_id(
+            self.driver_id(driver_name), start_minute, end_minute,
+            milli_miles
+        )
+
+    def add_trip_for_id(
+            self,
+            driver_id: int,
+            start_minute: int,
+            end_minute: int,
+            milli_miles: int
+    ) -> "SummaryEngine":
+        minutes = end_minute - start_minute
+        if minutes <= 0:
+            raise ValueError("start_time should be before end_time")
+
+        if self._speed_filter.accepts(milli_miles, minutes):
+            if driver_id < 0:
+                # Would silently index from the end of the columns
+                raise IndexError("unknown driver id {}".format(driver_id))
+            self._milli_miles[driver_id] += milli_miles
+            self._minutes[driver_id] += minutes
+            self._trip_counts[driver_id] += 1
+        else:
+            self._discarded_trip_count += 1
+        return self
+
+    def add_summary(self, summary: DriverSummary) -> "SummaryEngine":
+        """Adds totals that already passed this engine's speed filter,
+        e.g. those of another engine over a different part of the log."""
+        driver_id = self.driver_id(summary.name)
+        self._milli_miles[driver_id] += summary.milli_miles
+        self._minutes[driver_id] += summary.minutes
+        self._trip_counts[driver_id] += summary.trip_count
+        return self
+
+    def add_engine(self, other: "SummaryEngine") -> "SummaryEngine":
+        """Adds the totals and registrations of an engine over the part of
+        the log that follows this engine's part.
+
+        Totals are exact, so merging the engines of a split log gives the
+        engine of the whole log.
+        """
+        for summary in map(other._summary_of, range(len(other._symbols))):
+            self.add_summary(summary)
+        for driver_id in other._registered:
+            self.register_driver(other._symbols.get_name(driver_id))
+        self._discarded_trip_count += other._discarded_trip_count
+        return self
+
+    def add_discarded_trips(self, count: int) -> "SummaryEngine":
+        """Counts trips that another engine's speed filter left out."""
+        self._discarded_trip_count += count
+        return self
+
+    def to_state(self) -> Dict[str, Any]:
+        """A JSON serializable snapshot that ``from_state`` restores."""
+        names = self._symbols.names
+        return {
+            "slow_threshold": self.slow_threshold,
+            "fast_threshold": self.fast_threshold,
+            "registered": [names[driver_id] for driver_id in self._registered],
+            # In driver id order, so a restored engine numbers them alike
+            "drivers": [
+                list(driver)
+                for driver in zip(
+                    names, self._milli_miles, self._minutes,
+                    self._trip_counts
+                )
+            ],
+            "discarded_trips": self._discarded_trip_count,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "SummaryEngine":
+        try:
+            engine = cls(state["slow_threshold"], state["fast_threshold"])
+            for name, *totals in state["drivers"]:
+                # Older states held float miles and hours
+                if any(total.__class__ != int for total in totals):
+                    raise ValueError("totals should be integers")
+                engine.add_summary(DriverSummary(name, *totals))
+            for driver_name in state["registered"]:
+                engine.register_driver(driver_name)
+            # Absent from states saved before trips were counted
+            engine._discarded_trip_count = int(
+                state.get("discarded_trips", 0)
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError("invalid SummaryEngine state: {!r}".format(e))
+        return engine
+
+    def _summary_of(self, driver_id: int) -> DriverSummary:
+        return DriverSummary(
+            self._symbols.get_name(driver_id),
+            self._milli_miles[driver_id],
+            self._minutes[driver_id],
+            self._trip_counts[driver_id],
+        )
+
+
+def filtered_trip_minutes(
+        start_minute: int,
+        end_minute: int,
+        milli_miles: int,
+        speed_filter: SpeedFilter = DEFAULT_SPEED_FILTER
+) -> Optional[int]:
+    """Returns the trip's duration in minutes, or None if its average speed
+    is outside of the filter's thresholds."""
+    minutes = end_minute - start_minute
+    if minutes <= 0:
+        raise ValueError("start_time should be before end_time")
+
+    if speed_filter.accepts(milli_miles, minutes):
+        return minutes
+    return None
@@ -0,0 +1,47 @@
+"""Contains the DriverSymbols object definition"""
+
+from typing import Dict, Iterator, List, Optional
+
+import attr
+
+
+@attr.s(slots=True)
+class DriverSymbols(object):
+    """Numbers driver names densely (0, 1, 2, ...) in order of first sight.
+
+    Aggregates can then be kept in lists or arrays indexed by driver id,
+    and names are only looked up again when a report is rendered. Every
+    name is stored once, however many records repeat it.
+    """
+    _ids: Dict[str, int] = attr.ib(init=False, default=attr.Factory(dict))
+    _names: List[str] = attr.ib(init=False, default=attr.Factory(list))
+
+    @property
+    def names(self) -> List[str]:
+        """The interned names, indexed by driver id."""
+        return list(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __contains__(self, driver_name: str) -> bool:
+        return driver_name in self._ids
+
+    def intern(self, driver_name: str) -> int:
+        """The id of ``driver_name``, assigning the next one if it is new."""
+        driver_id = self._ids.get(driver_name)
+        if driver_id is None:
+            driver_id = self._ids[driver_name] = len(self._names)
+            self._names.append(driver_name)
+        return driver_id
+
+    def get_id(self, driver_name: str) -> Optional[int]:
+        return self._ids.get(driver_name)
+
+    def get_name(self, driver_id: int) -> str:
+        if not 0 <= driver_id < len(self._names):
+            raise IndexError("unknown driver id {}".format(driver_id))
+        return self._names[driver_id]
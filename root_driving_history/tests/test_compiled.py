@@ -0,0 +1,133 @@
+"""Provides unit tests for compiled logs"""
+
+import gzip
+import os
+
+import pytest
+
+from root_driving_history.compiled import cached_log
+from root_driving_history.compiled import compile_log
+from root_driving_history.compiled import open_compiled
+from root_driving_history.parser import parse_input_log
+from root_driving_history.report import create_driving_report
+from root_driving_history.report import create_summary_report
+
+
+RAW_DATA = "".join([
+    "Driver Dan\n",
+    "Trip Dan 07:15 07:45 17.3\n",
+    "Trip Lauren 12:01 13:16 42.0\n",
+    "Trip Bobby 12:01 13:16 12.0\n",
+    "Driver Lauren\n",
+    "Trip Dan 06:12 06:32 21.8\n",
+    "Driver Kumi\n",
+    "Trip Kumi 06:12 06:32 0.1\n",
+])
+
+
+@pytest.fixture
+def paths(tmp_path):
+    log_path = str(tmp_path / "log.txt")
+    with open(log_path, "w") as f:
+        f.write(RAW_DATA)
+    return log_path, str(tmp_path / "log.rdhc")
+
+
+class TestCompileLog:
+
+    def test_columns_hold_registered_drivers_in_logged_order(self, paths):
+        compile_log(*paths)
+        with open_compiled(paths[1]) as compiled_log:
+            assert compiled_log.driver_names == ["Dan", "Lauren", "Kumi"]
+            assert list(compiled_log.driver_ids) == [0, 1, 0, 2]
+            assert list(compiled_log.milli_miles) == [17300, 42000, 21800, 100]
+            assert list(compiled_log.start_minutes) == [435, 721, 372, 372]
+            assert list(compiled_log.end_minutes) == [465, 796, 392, 392]
+
+    def test_summary_matches_parsing_the_text(self, paths):
+        compile_log(*paths)
+        with open_compiled(paths[1]) as compiled_log:
+            for thresholds in [(5, 100), (0, 1000), (30, 40)]:
+                assert create_summary_report(
+                    compiled_log.to_summary(*thresholds)
+                ) == create_driving_report(
+                    parse_input_log(RAW_DATA), None, *thresholds
+                )
+
+    def test_empty_log(self, paths):
+        with open(paths[0], "w"):
+            pass
+        compile_log(*paths)
+        with open_compiled(paths[1]) as compiled_log:
+            assert len(compiled_log) == 0
+            assert create_summary_report(compiled_log.to_summary()) == \
+                "No data collected"
+
+    def test_trip_ending_before_it_starts_raises_error(self, paths):
+        with open(paths[0], "w") as f:
+            f.write("Driver Dan\nTrip Dan 07:45 07:15 17.3\n")
+        with pytest.raises(ValueError):
+            compile_log(*paths)
+        assert not os.path.exists(paths[1])
+
+    def test_compressed_log_matches_the_text(self, paths):
+        compressed_path = paths[0] + ".gz"
+        with open(paths[0], "rb") as f, open(compressed_path, "wb") as out:
+            out.write(gzip.compress(f.read()))
+        compile_log(compressed_path, paths[1])
+        with open_compiled(paths[1]) as compiled_log:
+            assert create_summary_report(compiled_log.to_summary()) == \
+                create_driving_report(parse_input_log(RAW_DATA))
+
+
+class TestOpenCompiled:
+
+    def test_other_files_raise_error(self, paths):
+        with pytest.raises(ValueError):
+            with open_compiled(paths[0]):
+                pass
+
+    def test_truncated_file_raises_error(self, paths):
+        compile_log(*paths)
+        with open(paths[1], "rb+") as f:
+            f.truncate(os.path.getsize(paths[1]) - 1)
+        with pytest.raises(ValueError):
+            with open_compiled(paths[1]):
+                pass
+
+
+class TestCachedLog:
+
+    def test_missing_cache_is_compiled(self, paths):
+        with cached_log(*paths) as compiled_log:
+            assert len(compiled_log) == 4
+        assert os.path.exists(paths[1])
+
+    def test_up_to_date_cache_is_reused(self, paths):
+        compile_log(*paths)
+        modified = os.stat(paths[1]).st_mtime_ns
+        os.utime(paths[1], ns=(0, 0))
+        with cached_log(*paths):
+            pass
+        assert os.stat(paths[1]).st_mtime_ns == 0 != modified
+
+    def test_changed_log_is_compiled_again(self, paths):
+        compile_log(*paths)
+        with open(paths[0], "a") as f:
+            f.write("Trip Kumi 08:00 09:00 50\n")
+        with cached_log(*paths) as compiled_log:
+            assert len(compiled_log) == 5
+            assert compiled_log.milli_miles[-1] == 50000
+
+    def test_refuses_to_overwrite_other_files(self, paths):
+        with pytest.raises(ValueError):
+            with cached_log(paths[0], paths[0]):
+                pass
+        with open(paths[0]) as f:
+            assert f.read() == RAW_DATA
+
+    def test_table_matches_summary(self, paths):
+        pytest.importorskip("numpy")
+        with cached_log(*paths) as compiled_log:
+            assert compiled_log.to_table().create_report(top=2) == \
+                create_summary_report(compiled_log.to_summary(), top=2)
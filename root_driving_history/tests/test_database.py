@@ -0,0 +1,189 @@
+"""Provides unit tests for the TripDatabase object"""
+
+import gzip
+import sqlite3
+
+import pytest
+
+from root_driving_history.database import SCHEMA_VERSION, SUMMARIES
+from root_driving_history.database import TripDatabase
+from root_driving_history.parser import parse_input_log
+from root_driving_history.report import create_driving_report
+from root_driving_history.summary import DriverSummary, SpeedFilter
+
+
+RAW_DATA = "\n".join([
+    "Driver Dan",
+    "Trip Dan 07:15 07:45 17.3",
+    "Trip Lauren 12:01 13:16 42.0",
+    "Trip Bobby 12:01 13:16 12.0",
+    "Driver Lauren",
+    "Trip Dan 06:12 06:32 21.8",
+    "Driver Kumi",
+    "Driver Dan",
+    "Trip Kumi 06:12 06:32 0.1",
+])
+
+
+@pytest.fixture
+def database():
+    with TripDatabase(":memory:") as trip_database:
+        yield trip_database
+
+
+class TestStorage:
+
+    def test_drivers_are_registered_once_in_order(self, database):
+        database.add_lines(RAW_DATA.splitlines())
+        assert len(database) == 3
+        assert "Kumi" in database
+        assert "Bobby" not in database
+        assert [summary.name for summary in database.get_summaries()] == \
+            ["Dan", "Lauren", "Kumi"]
+
+    def test_unregistered_trips_are_kept(self, database):
+        database.add_lines(RAW_DATA.splitlines())
+        assert database.get_trip_count() == 5
+
+    def test_buffers_are_accepted(self, database):
+        database.add_lines(RAW_DATA.encode())
+        assert database.get_trip_count() == 5
+
+    def test_single_records(self, database):
+        database.register_driver("Dan").add_trip("Dan", 60, 120, 30000)
+        assert database.get_summaries() == \
+            [DriverSummary("Dan", 30000, 60, 1)]
+
+    def test_bad_trip_rolls_back_the_whole_load(self, database):
+        with pytest.raises(ValueError):
+            database.add_lines(["Driver Dan", "Trip Dan 07:45 07:15 17.3"])
+        assert len(database) == 0
+        assert database.get_trip_count() == 0
+
+    def test_history_is_kept_across_connections(self, tmp_path):
+        path = str(tmp_path / "history.db")
+        with TripDatabase(path) as trip_database:
+            trip_database.add_lines(RAW_DATA.splitlines())
+        with TripDatabase(path) as trip_database:
+            trip_database.add_lines(["Driver Bobby"])
+            assert len(trip_database) == 4
+            assert trip_database.get_summaries()[-1] == \
+                DriverSummary("Bobby", 12000, 75, 1)
+
+    @pytest.mark.parametrize("version", [1, SCHEMA_VERSION + 1])
+    def test_databases_of_other_versions_are_refused(self, tmp_path, version):
+        path = str(tmp_path / "history.db")
+        with TripDatabase(path):
+            pass
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute("PRAGMA user_version = {}".format(version))
+        connection.close()
+        with pytest.raises(ValueError):
+            TripDatabase(path)
+
+    def test_databases_without_sources_are_upgraded(self, tmp_path):
+        path = str(tmp_path / "history.db")
+        with TripDatabase(path) as trip_database:
+            trip_database.add_lines(RAW_DATA.splitlines())
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute("DROP TABLE sources")
+            connection.execute("PRAGMA user_version = 2")
+        connection.close()
+        with TripDatabase(path) as trip_database:
+            assert trip_database.get_trip_count() == 5
+            assert not trip_database.has_log(b"")
+
+
+class TestAddLog:
+
+    @pytest.fixture(params=["plain", "gzip"])
+    def log_path(self, request, tmp_path):
+        path = tmp_path / "log.txt"
+        if request.param == "gzip":
+            path.write_bytes(gzip.compress(RAW_DATA.encode()))
+        else:
+            path.write_text(RAW_DATA)
+        return str(path)
+
+    def test_same_log_is_only_added_once(self, database, log_path):
+        assert database.add_log(log_path)
+        summaries = database.get_summaries()
+        assert not database.add_log(log_path)
+        assert database.get_summaries() == summaries
+        assert database.get_trip_count() == 5
+
+    def test_log_added_under_another_name_is_skipped(
+            self, database, log_path, tmp_path
+    ):
+        copy_path = tmp_path / "copy.txt"
+        with open(log_path, "rb") as f:
+            copy_path.write_bytes(f.read())
+        database.add_log(log_path)
+        assert not database.add_log(str(copy_path))
+        assert database.get_trip_count() == 5
+
+    def test_streamed_log_is_only_added_once(self, database, tmp_path):
+        path = tmp_path / "log.txt.gz"
+        path.write_bytes(gzip.compress(RAW_DATA.encode()))
+        assert database.add_log(str(path))
+        # The second copy is parsed before it is known to be added already
+        path.write_bytes(gzip.compress(RAW_DATA.encode(), mtime=1))
+        assert not database.add_log(str(path))
+        assert database.get_trip_count() == 5
+        assert len(database) == 3
+
+    def test_other_logs_are_added(self, database, tmp_path):
+        first, second = tmp_path / "first.txt", tmp_path / "second.txt"
+        first.write_text(RAW_DATA)
+        second.write_text("Driver Bobby\n")
+        assert database.add_log(str(first))
+        assert database.add_log(str(second))
+        assert len(database) == 4
+
+    def test_bad_log_is_not_recorded(self, database, tmp_path):
+        path = tmp_path / "log.txt"
+        path.write_text("Driver Dan\nTrip Dan 07:45 07:15 17.3\n")
+        with pytest.raises(ValueError):
+            database.add_log(str(path))
+        path.write_text("Driver Dan\n")
+        assert database.add_log(str(path))
+
+
+class TestReport:
+
+    def test_report_matches_trip_logs(self, database):
+        database.add_lines(RAW_DATA.splitlines())
+        trip_logs = parse_input_log(RAW_DATA)
+        for thresholds in [(5, 100), (0, 1000), (50, 60)]:
+            assert create_driving_report(database, None, *thresholds) == \
+                create_driving_report(trip_logs, None, *thresholds)
+        assert create_driving_report(database, top=1) == \
+            create_driving_report(trip_logs, top=1)
+
+    def test_empty_database(self, database):
+        assert create_driving_report(database) == "No data collected"
+
+    def test_totals_and_filter_are_exact(self, database):
+        database.register_driver("Dan")
+        for milli_miles in [100, 200, 300000, 2**50]:
+            database.add_trip("Dan", 0, 60, milli_miles)
+        # 0.3 mph is exactly 300 thousandths of a mile in an hour
+        assert database.get_summaries(0.3, 300) == \
+            [DriverSummary("Dan", 300000, 60, 1)]
+        assert database.get_summaries(0.1, 300) == \
+            [DriverSummary("Dan", 300300, 180, 3)]
+
+    def test_aggregate_query_uses_the_driver_index(self, database):
+        plan = database._connection.execute(
+            "EXPLAIN QUERY PLAN " + SUMMARIES,
+            SpeedFilter().get_bounds()
+        ).fetchall()
+        assert any("trips_by_driver" in row[-1] for row in plan)
+
+    def test_closed_database_cannot_be_used(self):
+        trip_database = TripDatabase(":memory:")
+        trip_database.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            len(trip_database)
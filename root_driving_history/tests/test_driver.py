@@ -1,5 +1,6 @@
 """Provides unit tests for the Driver object"""
 
+import attr
 import pytest
 
 from root_driving_history.driver import Driver
@@ -13,3 +14,9 @@ class TestInterface:
 
     def test_one_character_name_works(self):
         assert Driver("1")
+
+    def test_driver_is_immutable_and_slotted(self):
+        driver = Driver("Dan")
+        assert not hasattr(driver, "__dict__")
+        with pytest.raises(attr.exceptions.FrozenInstanceError):
+            driver.name = "Lauren"
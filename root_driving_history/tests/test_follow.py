@@ -0,0 +1,134 @@
+"""Provides unit tests for the ReportFollower and follow loop"""
+
+import io
+import os
+import threading
+import time
+
+from root_driving_history.follow import ReportFollower, follow
+from root_driving_history.parser import parse_input_log
+from root_driving_history.report import create_driving_report
+
+
+LINES = [
+    "Driver Dan\n",
+    "Driver Lauren\n",
+    "Driver Kumi\n",
+    "Trip Dan 07:15 07:45 17.3\n",
+    "Trip Dan 06:12 06:32 21.8\n",
+    "Trip Lauren 12:01 13:16 42.0\n",
+]
+
+
+class TestReportFollower:
+
+    def test_first_poll_always_reports(self):
+        assert ReportFollower().poll(0) == "No data collected"
+
+    def test_report_matches_driving_report(self):
+        follower = ReportFollower()
+        for index, line in enumerate(LINES):
+            follower.feed(line)
+            assert follower.report == create_driving_report(
+                parse_input_log("".join(LINES[:index + 1]))
+            )
+
+    def test_ranking_change_is_reported_immediately(self):
+        follower = ReportFollower(interval=60)
+        follower.feed("Driver Dan\n").feed("Driver Lauren\n")
+        assert follower.poll(0) is not None
+        assert follower.poll(1) is None
+
+        follower.feed("Trip Lauren 01:00 02:00 50\n")
+        assert follower.poll(2).startswith("Lauren")
+
+    def test_other_changes_are_throttled(self):
+        follower = ReportFollower(interval=60)
+        follower.feed("Driver Dan\n")
+        follower.poll(0)
+
+        follower.feed("Trip Dan 01:00 02:00 50\n")
+        assert follower.poll(1) is None
+        assert follower.poll(60) == "Dan: 50 miles @ 50 mph"
+        assert follower.poll(200) is None
+
+    def test_flush_reports_pending_changes(self):
+        follower = ReportFollower(interval=60)
+        follower.feed("Driver Dan\n")
+        follower.poll(0)
+        follower.feed("Trip Dan 01:00 02:00 50\n")
+        assert follower.poll(1, flush=True) == "Dan: 50 miles @ 50 mph"
+
+    def test_discarded_and_unregistered_trips_do_not_trigger_reports(self):
+        follower = ReportFollower(interval=0)
+        follower.feed("Driver Dan\n")
+        follower.poll(0)
+
+        follower.feed("Trip Dan 01:00 02:00 1\n")
+        follower.feed("Trip Lauren 01:00 02:00 50\n")
+        assert follower.poll(10) is None
+
+        follower.feed("Driver Lauren\n")
+        assert follower.poll(11) == "Lauren: 50 miles @ 50 mph\nDan: 0 miles"
+
+    def test_top_only_reports_and_watches_leading_drivers(self):
+        follower = ReportFollower(interval=60, top=1)
+        follower.feed("Driver Dan\n").feed("Driver Lauren\n")
+        follower.feed("Trip Dan 01:00 02:00 50\n")
+        assert follower.poll(0) == "Dan: 50 miles @ 50 mph"
+
+        follower.feed("Driver Kumi\n")
+        follower.feed("Trip Kumi 01:00 02:00 20\n")
+        assert follower.poll(100) is None
+
+        follower.feed("Trip Lauren 01:00 02:00 60\n")
+        assert follower.poll(101) == "Lauren: 60 miles @ 60 mph"
+
+
+class TestFollow:
+
+    def test_stream_is_reported_until_eof(self):
+        reports = []
+        follow(
+            io.StringIO("".join(LINES)), ReportFollower(), reports.append,
+            stop_at_eof=True
+        )
+        assert reports[-1] == create_driving_report(
+            parse_input_log("".join(LINES))
+        )
+
+    def test_unterminated_last_line_is_fed_at_eof(self):
+        reports = []
+        follow(
+            io.StringIO("Driver Dan\nTrip Dan 01:00 02:00 50"),
+            ReportFollower(), reports.append, stop_at_eof=True
+        )
+        assert reports[-1] == "Dan: 50 miles @ 50 mph"
+
+    def test_idle_pipe_still_gets_due_reports(self):
+        read_fd, write_fd = os.pipe()
+        reports = []
+        with os.fdopen(read_fd, "r") as reader, \
+                os.fdopen(write_fd, "w") as writer:
+            following = threading.Thread(target=follow, args=(
+                reader, ReportFollower(interval=0.2), reports.append, 0.05,
+                True
+            ))
+            following.start()
+
+            def wait_for(report):
+                deadline = time.monotonic() + 5
+                while report not in reports and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                return report in reports
+
+            writer.write("Driver Dan\n")
+            writer.flush()
+            assert wait_for("Dan: 0 miles")
+            # Throttled when it arrives, then due while the pipe is quiet
+            writer.write("Trip Dan 07:15 07:45 17.3\n")
+            writer.flush()
+            assert wait_for("Dan: 17 miles @ 35 mph")
+
+            writer.close()
+            following.join()
@@ -0,0 +1,131 @@
+"""Provides unit tests for the incremental summarizer"""
+
+import gzip
+import json
+
+import pytest
+
+from root_driving_history.incremental import update_summary
+from root_driving_history.inputs import LineCounter
+from root_driving_history.parser import parse_input_log
+from root_driving_history.report import create_driving_report
+from root_driving_history.report import create_summary_report
+
+
+LINES = [
+    "Driver Dan\n",
+    "Trip Dan 07:15 07:45 17.3\n",
+    "Trip Lauren 12:01 13:16 42.0\n",
+    "Driver Lauren\n",
+    "Trip Dan 06:12 06:32 21.8\n",
+    "Driver Kumi\n",
+    "Trip Kumi 06:12 06:32 0.1\n",
+]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "log.txt"), str(tmp_path / "state.json")
+
+
+def _expected_report(raw_data):
+    return create_driving_report(parse_input_log(raw_data))
+
+
+class TestUpdateSummary:
+
+    def test_first_run_summarizes_whole_log(self, paths):
+        log_path, state_path = paths
+        with open(log_path, "w") as f:
+            f.write("".join(LINES))
+
+        engine = update_summary(log_path, state_path)
+        assert create_summary_report(engine) == \
+            _expected_report("".join(LINES))
+
+        with open(state_path) as f:
+            assert json.load(f)["source"]["offset"] == len("".join(LINES))
+
+    def test_appended_lines_match_a_full_run(self, paths):
+        log_path, state_path = paths
+        for index in range(len(LINES)):
+            with open(log_path, "a") as f:
+                f.write(LINES[index])
+            engine = update_summary(log_path, state_path)
+            assert create_summary_report(engine) == \
+                _expected_report("".join(LINES[:index + 1]))
+
+    def test_only_new_bytes_are_scanned(self, paths):
+        log_path, state_path = paths
+        with open(log_path, "w") as f:
+            f.write("".join(LINES[:2]))
+        update_summary(log_path, state_path)
+
+        # Counting the first trip twice would change Dan's miles
+        with open(log_path, "a") as f:
+            f.write(LINES[4])
+        engine = update_summary(log_path, state_path)
+        assert engine.summaries[0].trip_count == 2
+
+    def test_lines_scanned_by_each_run_are_counted(self, paths):
+        log_path, state_path = paths
+        with open(log_path, "w") as f:
+            f.write("".join(LINES[:2]) + "Trip Dan 06:12")
+        line_counter = LineCounter()
+        update_summary(log_path, state_path, line_counter=line_counter)
+        assert line_counter.lines == 3
+
+        with open(log_path, "a") as f:
+            f.write(" 06:32 21.8\n")
+        line_counter = LineCounter()
+        update_summary(log_path, state_path, line_counter=line_counter)
+        assert line_counter.lines == 1
+
+    def test_unterminated_last_line_is_not_committed(self, paths):
+        log_path, state_path = paths
+        with open(log_path, "w") as f:
+            f.write("Driver Dan\nTrip Dan 07:15 07:45 17")
+        assert update_summary(log_path, state_path).summaries[0].trip_count \
+            == 1
+
+        with open(log_path, "a") as f:
+            f.write(".3\n")
+        engine = update_summary(log_path, state_path)
+        assert engine.summaries[0].trip_count == 1
+        assert engine.summaries[0].total_miles == 17.3
+
+    def test_rewritten_log_starts_over(self, paths):
+        log_path, state_path = paths
+        with open(log_path, "w") as f:
+            f.write("".join(LINES))
+        update_summary(log_path, state_path)
+
+        with open(log_path, "w") as f:
+            f.write("Driver Kumi\n")
+        assert create_summary_report(update_summary(log_path, state_path)) \
+            == "Kumi: 0 miles"
+
+    def test_changed_thresholds_start_over(self, paths):
+        log_path, state_path = paths
+        with open(log_path, "w") as f:
+            f.write("".join(LINES))
+        update_summary(log_path, state_path)
+
+        engine = update_summary(log_path, state_path, 0, 100)
+        assert engine.summaries[2].trip_count == 1
+
+    def test_invalid_state_file_raises_error(self, paths):
+        log_path, state_path = paths
+        with open(log_path, "w") as f:
+            f.write("".join(LINES))
+        with open(state_path, "w") as f:
+            f.write("not json")
+        with pytest.raises(ValueError):
+            update_summary(log_path, state_path)
+
+    def test_compressed_log_raises_error(self, paths):
+        log_path, state_path = paths
+        with open(log_path, "wb") as f:
+            f.write(gzip.compress("".join(LINES).encode()))
+        with pytest.raises(ValueError):
+            update_summary(log_path, state_path)
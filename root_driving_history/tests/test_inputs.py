@@ -0,0 +1,210 @@
+"""Provides unit tests for the input helpers"""
+
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import threading
+
+import pytest
+
+from root_driving_history.inputs import LineCounter, detect_compression
+from root_driving_history.inputs import expand_paths
+from root_driving_history.inputs import mapped_file, open_log
+from root_driving_history.inputs import replacing_file
+from root_driving_history.inputs import stream_blocks
+
+
+LOG = b"".join(
+    b"Driver D%d\nTrip D%d 07:15 07:45 17.3\n" % (index, index)
+    for index in range(1000)
+)
+CODECS = {"gzip": gzip, "bzip2": bz2, "xz": lzma}
+
+
+class TestMappedFile:
+
+    def test_regular_file_is_memory_mapped(self, tmp_path):
+        path = tmp_path / "log.txt"
+        path.write_text("Driver Dan\n")
+        with mapped_file(str(path)) as buffer:
+            assert isinstance(buffer, mmap.mmap)
+            assert buffer[:] == b"Driver Dan\n"
+
+    def test_empty_file_is_an_empty_buffer(self, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_text("")
+        with mapped_file(str(path)) as buffer:
+            assert buffer == b""
+
+    def test_non_regular_file_cannot_be_mapped(self):
+        with mapped_file("/dev/null") as buffer:
+            assert buffer is None
+
+
+class TestLineCounter:
+
+    @pytest.mark.parametrize("data", [
+        b"Driver Dan\nDriver Lauren\n",
+        memoryview(b"Driver Dan\nDriver Lauren\n"),
+    ])
+    def test_lines_of_buffers_are_counted(self, data):
+        line_counter = LineCounter()
+        assert line_counter.counting(data) is data
+        assert line_counter.lines == 2
+
+    def test_last_line_without_newline_counts(self):
+        line_counter = LineCounter()
+        line_counter.count(b"Driver Dan\nDriver Lauren")
+        assert line_counter.lines == 2
+
+    def test_empty_buffer(self):
+        line_counter = LineCounter()
+        line_counter.count(b"")
+        assert line_counter.lines == 0
+
+    def test_blocks_are_counted_as_they_are_taken(self):
+        line_counter = LineCounter()
+        blocks = line_counter.counting(iter([b"Driver Dan\n", b"Driver L"]))
+        assert line_counter.lines == 0
+        assert next(blocks) == b"Driver Dan\n"
+        assert line_counter.lines == 1
+        assert list(blocks) == [b"Driver L"]
+        assert line_counter.lines == 2
+
+    def test_lines_of_compressed_files_are_counted(self, tmp_path):
+        path = tmp_path / "log.txt.gz"
+        path.write_bytes(gzip.compress(LOG))
+        line_counter = LineCounter()
+        with open_log(str(path)) as log:
+            assert b"".join(line_counter.counting(log)) == LOG
+        assert line_counter.lines == 2000
+
+    def test_lines_of_memory_maps_are_counted(self, tmp_path):
+        path = tmp_path / "log.txt"
+        path.write_bytes(LOG)
+        line_counter = LineCounter()
+        with mapped_file(str(path)) as buffer:
+            line_counter.count(buffer)
+        assert line_counter.lines == 2000
+
+
+class TestOpenLog:
+
+    def test_plain_regular_file_is_memory_mapped(self, tmp_path):
+        path = tmp_path / "log.txt"
+        path.write_bytes(LOG)
+        with open_log(str(path)) as log:
+            assert isinstance(log, mmap.mmap)
+
+    @pytest.mark.parametrize("compression", sorted(CODECS))
+    def test_compressed_file_is_decompressed(self, tmp_path, compression):
+        path = tmp_path / "log"
+        path.write_bytes(CODECS[compression].compress(LOG))
+        with open(str(path), "rb") as f:
+            assert detect_compression(f.read(16)) == compression
+        with open_log(str(path)) as log:
+            assert b"".join(log) == LOG
+
+    def test_uncompressed_data_is_detected(self):
+        assert detect_compression(LOG) is None
+        assert detect_compression(b"") is None
+
+
+class TestStreamBlocks:
+
+    @pytest.mark.parametrize("compression", [None, "gzip", "xz"])
+    def test_blocks_end_on_line_boundaries(self, compression):
+        data = LOG + b"Driver Kumi"
+        if compression is not None:
+            data = CODECS[compression].compress(data)
+        blocks = list(stream_blocks(io.BufferedReader(io.BytesIO(data)), 7))
+        assert b"".join(blocks) == LOG + b"Driver Kumi"
+        assert all(block.endswith(b"\n") for block in blocks[:-1])
+
+    def test_concatenated_streams_are_decompressed(self):
+        data = gzip.compress(LOG[:100]) + gzip.compress(LOG[100:])
+        blocks = stream_blocks(io.BufferedReader(io.BytesIO(data)))
+        assert b"".join(blocks) == LOG
+
+    def test_truncated_stream_raises_error(self):
+        data = bz2.compress(LOG)[:-10]
+        with pytest.raises(EOFError):
+            list(stream_blocks(io.BufferedReader(io.BytesIO(data)), 64))
+
+    def test_closing_early_stops_the_reader_thread(self):
+        threads = threading.active_count()
+        blocks = stream_blocks(io.BufferedReader(io.BytesIO(LOG)), 7)
+        next(blocks)
+        blocks.close()
+        assert threading.active_count() == threads
+
+
+class TestExpandPaths:
+
+    @pytest.fixture
+    def log_directory(self, tmp_path):
+        for name in ["b.txt", "a.txt", "c.log"]:
+            (tmp_path / name).write_text("Driver Dan\n")
+        (tmp_path / "nested.txt").mkdir()
+        return tmp_path
+
+    def test_directory_becomes_its_files_in_order(self, log_directory):
+        assert expand_paths([str(log_directory)]) == [
+            str(log_directory / name) for name in ["a.txt", "b.txt", "c.log"]
+        ]
+
+    def test_glob_becomes_the_files_it_matches(self, log_directory):
+        assert expand_paths([str(log_directory / "*.txt")]) == [
+            str(log_directory / name) for name in ["a.txt", "b.txt"]
+        ]
+
+    def test_other_paths_are_kept_in_order(self, log_directory):
+        paths = ["missing.txt", "-", str(log_directory / "c.log")]
+        assert expand_paths(paths) == paths
+
+    def test_pattern_without_files_raises(self, log_directory):
+        with pytest.raises(FileNotFoundError):
+            expand_paths([str(log_directory / "*.csv")])
+        with pytest.raises(FileNotFoundError):
+            expand_paths([str(log_directory / "nested.txt")])
+
+
+class TestReplacingFile:
+
+    def test_file_is_replaced_once_written(self, tmp_path):
+        path = tmp_path / "state.json"
+        path.write_text("old")
+        with replacing_file(str(path)) as f:
+            f.write("new")
+            assert path.read_text() == "old"
+        assert path.read_text() == "new"
+        assert [entry.name for entry in tmp_path.iterdir()] == ["state.json"]
+
+    def test_file_gets_the_permissions_of_open(self, tmp_path):
+        with replacing_file(str(tmp_path / "opened")) as f:
+            f.write("new")
+        with open(str(tmp_path / "created"), "w") as f:
+            f.write("new")
+        assert (tmp_path / "opened").stat().st_mode == \
+            (tmp_path / "created").stat().st_mode
+
+    def test_failed_write_leaves_file_as_it_was(self, tmp_path):
+        path = tmp_path / "state.json"
+        path.write_text("old")
+        with pytest.raises(RuntimeError):
+            with replacing_file(str(path)) as f:
+                f.write("half")
+                raise RuntimeError
+        assert path.read_text() == "old"
+        assert [entry.name for entry in tmp_path.iterdir()] == ["state.json"]
+
+    def test_concurrent_writers_get_their_own_file(self, tmp_path):
+        path = tmp_path / "log.rdhc"
+        with replacing_file(str(path), "wb") as first, \
+                replacing_file(str(path), "wb") as second:
+            assert first.name != second.name
+            first.write(b"first")
+            second.write(b"second")
+        assert path.read_bytes() == b"first"
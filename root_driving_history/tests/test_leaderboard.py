@@ -0,0 +1,102 @@
+"""Provides unit tests for the Leaderboard object"""
+
+import random
+
+from root_driving_history import leaderboard as leaderboard_module
+from root_driving_history.leaderboard import Leaderboard
+
+
+class TestLeaderboard:
+
+    def test_leaderboard_is_initially_empty(self):
+        leaderboard = Leaderboard()
+        assert len(leaderboard) == 0
+        assert list(leaderboard) == []
+
+    def test_drivers_are_ranked_by_most_miles(self):
+        leaderboard = Leaderboard()
+        leaderboard.add("Dan", 39100)
+        leaderboard.add("Lauren", 42000)
+        leaderboard.add("Kumi", 0)
+        assert list(leaderboard) == ["Lauren", "Dan", "Kumi"]
+        assert leaderboard.rank_of("Kumi") == 2
+
+    def test_ties_keep_the_order_drivers_were_added_in(self):
+        leaderboard = Leaderboard()
+        for name in ["Dan", "Lauren", "Kumi"]:
+            leaderboard.add(name, 0)
+        assert list(leaderboard) == ["Dan", "Lauren", "Kumi"]
+
+        leaderboard.update("Dan", 10)
+        leaderboard.update("Dan", 0)
+        assert list(leaderboard) == ["Dan", "Lauren", "Kumi"]
+
+    def test_adding_a_ranked_driver_again_is_ignored(self):
+        leaderboard = Leaderboard()
+        assert leaderboard.add("Dan", 0)
+        assert not leaderboard.add("Dan", 10)
+        assert len(leaderboard) == 1
+        assert "Dan" in leaderboard
+
+    def test_update_reports_whether_the_rank_changed(self):
+        leaderboard = Leaderboard()
+        leaderboard.add("Dan", 0)
+        leaderboard.add("Lauren", 0)
+
+        assert not leaderboard.update("Dan", 5)
+        assert leaderboard.update("Lauren", 10)
+        assert list(leaderboard) == ["Lauren", "Dan"]
+        assert not leaderboard.update("Lauren", 10)
+
+    def test_top_returns_the_first_k_drivers(self):
+        leaderboard = Leaderboard()
+        for miles, name in enumerate(["Dan", "Lauren", "Kumi"]):
+            leaderboard.add(name, miles)
+        assert leaderboard.top(2) == ["Kumi", "Lauren"]
+        assert leaderboard.top(10) == ["Kumi", "Lauren", "Dan"]
+        assert leaderboard.top(0) == []
+
+    def test_rank_of_can_stop_early(self):
+        leaderboard = Leaderboard()
+        for miles, name in enumerate(["Dan", "Lauren", "Kumi"]):
+            leaderboard.add(name, miles)
+        assert leaderboard.rank_of("Lauren", 2) == 1
+        assert leaderboard.rank_of("Dan", 2) is None
+
+
+class TestManyDrivers:
+
+    def test_random_updates_match_a_full_sort(self, monkeypatch):
+        # Tiny buckets so that splitting and emptying buckets is exercised
+        monkeypatch.setattr(leaderboard_module, "LOAD", 2)
+        rng = random.Random(0)
+        leaderboard = Leaderboard()
+        totals = {}
+        for step in range(2000):
+            name = "D{}".format(rng.randrange(60))
+            miles = float(rng.randrange(30))
+            if name not in leaderboard:
+                leaderboard.add(name, miles)
+                totals[name] = (len(totals), miles)
+                continue
+
+            expected_before = _ranking(totals)
+            rank_changed = leaderboard.update(name, miles)
+            totals[name] = (totals[name][0], miles)
+            expected = _ranking(totals)
+
+            assert list(leaderboard) == expected
+            assert rank_changed == (
+                expected.index(name) != expected_before.index(name)
+            )
+            assert leaderboard.rank_of(name) == expected.index(name)
+            assert leaderboard.top(5) == expected[:5]
+
+
+def _ranking(totals):
+    return [
+        name
+        for name, _ in sorted(
+            totals.items(), key=lambda item: (-item[1][1], item[1][0])
+        )
+    ]
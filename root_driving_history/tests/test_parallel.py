@@ -0,0 +1,139 @@
+"""Provides unit tests for the multi-process summarizer"""
+
+import gzip
+
+import pytest
+
+from root_driving_history.inputs import LineCounter
+from root_driving_history.parallel import report_files
+from root_driving_history.parallel import split_into_line_ranges
+from root_driving_history.parallel import summarize_file
+from root_driving_history.parallel import summarize_files
+from root_driving_history.parser import parse_input_log, parse_into_summary
+from root_driving_history.report import create_driving_report
+from root_driving_history.report import create_summary_report
+from root_driving_history.summary import SummaryEngine
+
+
+RAW_DATA = "\n".join([
+    "Trip Kumi 01:00 02:00 30",
+    "Driver Dan",
+    "Trip Dan 07:15 07:45 17.3",
+    "Driver Lauren",
+    "Trip Dan 06:12 06:32 21.8",
+    "Trip Lauren 12:01 13:16 42.0",
+    "Driver Dan",
+    "Trip Lauren 12:01 13:16 420.0",
+    "Trip Dan 06:12 06:32 0.1",
+    "Driver Kumi",
+    "Trip Bob 06:12 06:32 10",
+]) + "\n"
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_text(RAW_DATA)
+    return str(path)
+
+
+class TestSplitIntoLineRanges:
+
+    def test_empty_buffer_has_no_ranges(self):
+        assert split_into_line_ranges(b"", 4) == []
+
+    def test_ranges_cover_the_buffer_and_start_on_lines(self):
+        raw_bytes = RAW_DATA.encode()
+        for chunks in range(1, 20):
+            ranges = split_into_line_ranges(raw_bytes, chunks)
+            assert 1 <= len(ranges) <= chunks
+            assert ranges[0][0] == 0
+            assert ranges[-1][1] == len(raw_bytes)
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                assert end == start
+                assert raw_bytes[start - 1:start] == b"\n"
+
+
+class TestSummarizeFile:
+
+    def test_workers_need_to_be_positive(self, log_file):
+        with pytest.raises(ValueError):
+            summarize_file(log_file, 0)
+
+    @pytest.mark.parametrize("workers", [1, 2, 3, 8])
+    def test_report_is_identical_to_serial_report(self, log_file, workers):
+        expected = create_driving_report(parse_input_log(RAW_DATA))
+        assert create_summary_report(
+            summarize_file(log_file, workers)
+        ) == expected
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_trip_counts_match_serial_counts(self, log_file, workers):
+        engine = summarize_file(log_file, workers)
+        assert engine.accepted_trip_count == 5
+        assert engine.discarded_trip_count == 2
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_lines_are_counted_while_parsing(self, log_file, workers):
+        line_counter = LineCounter()
+        summarize_file(log_file, workers, line_counter=line_counter)
+        assert line_counter.lines == len(RAW_DATA.splitlines())
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_text("")
+        assert summarize_file(str(path), 2).summaries == []
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_compressed_file_is_streamed(self, tmp_path, workers):
+        path = tmp_path / "log.txt.gz"
+        path.write_bytes(gzip.compress(RAW_DATA.encode()))
+        assert create_summary_report(summarize_file(str(path), workers)) == \
+            create_driving_report(parse_input_log(RAW_DATA))
+
+
+@pytest.fixture
+def log_files(tmp_path):
+    lines = RAW_DATA.splitlines(keepends=True)
+    paths = []
+    for index, start in enumerate([0, 3, 7, 7]):
+        path = tmp_path / "log{}.txt".format(index)
+        path.write_text("".join(lines[start:start + 4]))
+        paths.append(str(path))
+    return paths
+
+
+class TestBatches:
+
+    @pytest.mark.parametrize("workers", [1, 2, 8])
+    def test_merged_report_is_the_report_of_all_files(
+            self, log_files, workers
+    ):
+        serial = SummaryEngine()
+        for path in log_files:
+            with open(path) as f:
+                parse_into_summary(f, serial)
+        engine = summarize_files(log_files, workers)
+        assert create_summary_report(engine) == create_summary_report(serial)
+        assert engine.accepted_trip_count == serial.accepted_trip_count
+        assert engine.discarded_trip_count == serial.discarded_trip_count
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_one_report_per_file_in_order(self, log_files, workers):
+        reports = list(report_files(log_files, workers, top=2))
+        assert [path for path, _ in reports] == log_files
+        for path, report in reports:
+            with open(path) as f:
+                assert report == create_driving_report(
+                    parse_input_log(f.read()), top=2
+                )
+
+    def test_workers_need_to_be_positive(self, log_files):
+        with pytest.raises(ValueError):
+            summarize_files(log_files, 0)
+        with pytest.raises(ValueError):
+            report_files(log_files, 0)
+
+    def test_missing_file_raises(self, log_files):
+        with pytest.raises(FileNotFoundError):
+            summarize_files(log_files + ["missing.txt"], 2)
@@ -1,8 +1,18 @@
 """Provides unit tests for the Parser object"""
 
+import io
+
 import pytest
 
 from root_driving_history.parser import parse_input_log
+from root_driving_history.parser import parse_input_stream
+from root_driving_history.parser import summarize_input_stream
+from root_driving_history.parser import tokenize
+from root_driving_history.parser import tokenize_buffer
+from root_driving_history.report import create_driving_report
+from root_driving_history.report import create_summary_report
+from root_driving_history.storage import ArrayTripStore
+from root_driving_history.summary import DriverSummary
 from root_driving_history.parser import _create_trip_from_regex_trip_line
 from root_driving_history.parser import _create_driver_from_regex_driver_line
 from root_driving_history.parser import _get_driver_of_regex_trip_line
@@ -122,6 +132,178 @@ class TestParseInputLog:
         assert driver_trip_logs[1].trips[0] == trip
 
 
+class TestParseInputStream:
+
+    def test_parameters_other_than_iterables_of_lines_raise_error(self):
+        with pytest.raises(TypeError):
+            parse_input_stream(42)
+
+        with pytest.raises(TypeError):
+            parse_input_stream("Driver Dan")
+
+    def test_returns_empty_list_when_given_no_lines(self):
+        assert parse_input_stream([]) == []
+        assert parse_input_stream(io.StringIO("")) == []
+
+    def test_reads_lines_from_a_file_object(self):
+        raw_data = "\n".join([
+            "Driver Dan",
+            "Driver Lauren",
+            "Driver Kumi",
+            "Trip Dan 07:15 07:45 17.3",
+            "Trip Dan 06:12 06:32 21.8",
+            "Trip Lauren 12:01 13:16 42.0",
+        ])
+        assert parse_input_stream(io.StringIO(raw_data)) == \
+            parse_input_log(raw_data)
+
+    def test_trip_store_does_not_change_the_report(self):
+        raw_data = "\n".join([
+            "Driver Dan",
+            "Driver Lauren",
+            "Trip Dan 07:15 07:45 17.3",
+            "Trip Dan 06:12 06:32 21.8",
+            "Trip Lauren 12:01 13:16 42.0",
+        ])
+        array_logs = parse_input_log(raw_data, ArrayTripStore)
+        assert array_logs == parse_input_log(raw_data)
+        assert create_driving_report(array_logs) == \
+            create_driving_report(parse_input_log(raw_data))
+
+    def test_trips_before_driver_line_are_attributed_to_driver(self):
+        trip = Trip(TripTime(1, 15), TripTime(2, 35), 10)
+        driver_trip_logs = parse_input_stream(iter([
+            "Trip Dan 01:15 02:35 10",
+            "Driver Dan",
+        ]))
+        assert len(driver_trip_logs) == 1
+        assert driver_trip_logs[0].trips == [trip]
+
+    def test_duplicate_driver_lines_share_one_trip_log(self):
+        trip = Trip(TripTime(1, 15), TripTime(2, 35), 10)
+        driver_trip_logs = parse_input_stream([
+            "Driver Dan",
+            "Driver Lauren",
+            "Trip Dan 01:15 02:35 10",
+            "Driver Dan",
+        ])
+        assert [log.driver.name for log in driver_trip_logs] == \
+            ["Dan", "Lauren"]
+        assert driver_trip_logs[0].trips == [trip]
+
+    def test_trips_of_unregistered_drivers_are_dropped(self):
+        driver_trip_logs = parse_input_stream([
+            "Driver Dan",
+            "Trip Lauren 01:15 02:35 10",
+        ])
+        assert len(driver_trip_logs) == 1
+        assert driver_trip_logs[0].isempty()
+
+
+class TestSummarizeInputStream:
+
+    def test_parameters_other_than_iterables_of_lines_raise_error(self):
+        with pytest.raises(TypeError):
+            summarize_input_stream(42)
+
+    def test_returns_empty_list_when_given_no_lines(self):
+        assert summarize_input_stream([]) == []
+
+    def test_summaries_only_include_registered_drivers(self):
+        summaries = summarize_input_stream([
+            "Trip Lauren 12:01 13:16 42.0",
+            "Driver Dan",
+            "Trip Dan 01:00 02:00 60",
+            "Trip Dan 02:00 03:00 1",
+        ])
+        assert summaries == [DriverSummary("Dan", 60000, 60, 1)]
+
+    def test_report_matches_report_from_trip_logs(self):
+        raw_data = "\n".join([
+            "Driver Dan",
+            "Driver Lauren",
+            "Driver Kumi",
+            "Trip Dan 07:15 07:45 17.3",
+            "Trip Dan 06:12 06:32 21.8",
+            "Trip Dan 06:12 06:32 0.1",
+            "Trip Lauren 12:01 13:16 42.0",
+        ])
+        assert create_summary_report(
+            summarize_input_stream(raw_data.splitlines())
+        ) == create_driving_report(parse_input_log(raw_data))
+
+
+class TestTokenize:
+
+    def test_lines_without_keywords_yield_nothing(self):
+        assert list(tokenize(["", "no keywords here", "driver Dan"])) == []
+
+    def test_driver_line_yields_driver_name(self):
+        assert list(tokenize(["Driver Dan"])) == [("Driver", "Dan")]
+
+    def test_trip_line_yields_minutes_and_miles(self):
+        assert list(tokenize(["Trip Dan 07:15 07:45 17.3\n"])) == [
+            ("Trip", "Dan", 435, 465, 17300)
+        ]
+
+    def test_bytes_blocks_of_whole_lines_are_scanned(self):
+        lines = ["Driver Dan\n", "Trip Dan 07:15 07:45 17.3\n"]
+        assert list(tokenize([b"".join(map(str.encode, lines))])) == \
+            list(tokenize(lines))
+
+    def test_miles_are_read_in_thousandths(self):
+        tokens = tokenize([
+            "Trip Dan 07:15 07:45 17",
+            "Trip Dan 07:15 07:45 17.",
+            "Trip Dan 07:15 07:45 0.001",
+            "Trip Dan 07:15 07:45 0.00200",
+        ])
+        assert [token[4] for token in tokens] == [17000, 17000, 1, 2]
+
+    @pytest.mark.parametrize("miles", ["0.0005", "181.4994", "4.99961"])
+    def test_miles_with_more_than_three_decimals_raise_error(self, miles):
+        with pytest.raises(ValueError):
+            list(tokenize(["Trip Dan 07:15 07:45 " + miles]))
+
+    def test_lines_are_classified_in_order(self):
+        tokens = list(tokenize([
+            "Trip Dan 00:00 01:00 60",
+            "Driver Dan",
+        ]))
+        assert [token[0] for token in tokens] == ["Trip", "Driver"]
+
+    def test_out_of_range_times_raise_error(self):
+        with pytest.raises(ValueError):
+            list(tokenize(["Trip Dan 24:00 24:30 10"]))
+
+        with pytest.raises(ValueError):
+            list(tokenize(["Trip Dan 07:60 08:30 10"]))
+
+
+class TestTokenizeBuffer:
+
+    def test_tokens_match_tokenize(self):
+        lines = [
+            "Driver Dan\n",
+            "Trip Dan 07:15 07:45 17.3\n",
+            "no keywords here\n",
+            "Trip Lauren 12:01 13:16 42\n",
+        ]
+        buffer = "".join(lines).encode()
+        assert list(tokenize_buffer(buffer)) == list(tokenize(lines))
+
+    def test_only_the_given_range_is_scanned(self):
+        buffer = b"Driver Dan\nDriver Lauren\nDriver Kumi\n"
+        assert list(tokenize_buffer(buffer, 11, 25)) == [("Driver", "Lauren")]
+
+    def test_buffers_are_accepted_by_parse_functions(self):
+        raw_data = "Driver Dan\nTrip Dan 07:15 07:45 17.3\n"
+        assert parse_input_stream(raw_data.encode()) == \
+            parse_input_log(raw_data)
+        assert summarize_input_stream(memoryview(raw_data.encode())) == \
+            summarize_input_stream(raw_data.splitlines())
+
+
 class TestCreateDriverFromRegexDriverLine:
 
     def test_input_that_does_not_match_regex_returns_none(self):
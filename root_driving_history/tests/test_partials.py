@@ -0,0 +1,88 @@
+"""Provides unit tests for the partial aggregate files"""
+
+import io
+import json
+
+import pytest
+
+from root_driving_history.parser import parse_input_log
+from root_driving_history.parser import parse_into_summary
+from root_driving_history.partials import PARTIAL_VERSION
+from root_driving_history.partials import dump_partial, load_partial
+from root_driving_history.partials import merge_partials
+from root_driving_history.report import create_driving_report
+from root_driving_history.report import create_summary_report
+from root_driving_history.summary import SummaryEngine
+
+
+LINES = [
+    "Trip Lauren 12:01 13:16 42.0",
+    "Driver Dan",
+    "Trip Dan 07:15 07:45 17.3",
+    "Trip Dan 06:12 06:32 21.8",
+    "Driver Lauren",
+    "Trip Bobby 06:12 06:32 12.0",
+    "Driver Kumi",
+    "Trip Kumi 06:12 06:32 0.1",
+    "Driver Bobby",
+]
+
+
+def _round_trip(engine):
+    f = io.StringIO()
+    dump_partial(engine, f)
+    f.seek(0)
+    return load_partial(f)
+
+
+class TestPartials:
+
+    def test_partial_round_trips(self):
+        engine = parse_into_summary(LINES, SummaryEngine(1, 90))
+        restored = _round_trip(engine)
+        assert restored == engine
+        assert restored.summaries == engine.summaries
+
+    @pytest.mark.parametrize("splits", [[0], [3], [1, 5], [2, 4, 6, 8]])
+    def test_merged_shards_report_like_the_whole_log(self, splits):
+        bounds = [0] + splits + [len(LINES)]
+        partials = [
+            _round_trip(parse_into_summary(LINES[start:end]))
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        assert create_summary_report(merge_partials(partials)) == \
+            create_driving_report(parse_input_log("\n".join(LINES)))
+
+    def test_merged_partials_can_be_merged_again(self):
+        shards = [parse_into_summary([line]) for line in LINES]
+        merged = merge_partials([
+            _round_trip(merge_partials(shards[:4])),
+            _round_trip(merge_partials(shards[4:])),
+        ])
+        assert merged == merge_partials(shards)
+
+    def test_thresholds_have_to_match(self):
+        with pytest.raises(ValueError):
+            merge_partials([SummaryEngine(), SummaryEngine(1, 90)])
+
+    def test_nothing_to_merge_raises_error(self):
+        with pytest.raises(ValueError):
+            merge_partials([])
+
+    @pytest.mark.parametrize("content", [
+        "not json",
+        "[]",
+        json.dumps({"summary": SummaryEngine().to_state()}),
+        json.dumps({
+            "format": "root-driving-history-partial",
+            "version": PARTIAL_VERSION + 1,
+            "summary": SummaryEngine().to_state(),
+        }),
+        json.dumps({
+            "format": "root-driving-history-partial",
+            "version": PARTIAL_VERSION,
+        }),
+    ])
+    def test_invalid_partials_raise_error(self, content):
+        with pytest.raises(ValueError):
+            load_partial(io.StringIO(content))
@@ -0,0 +1,66 @@
+"""Provides unit tests for the DriverRegistry object"""
+
+import pytest
+
+from root_driving_history.driver import Driver
+from root_driving_history.registry import DriverRegistry
+from root_driving_history.storage import ArrayTripStore
+from root_driving_history.trip import Trip
+from root_driving_history.trip import TripTime
+from root_driving_history.trip_log import TripLog
+
+
+class TestRegister:
+
+    def test_non_driver_parameter_raises_error(self):
+        with pytest.raises(TypeError):
+            DriverRegistry().register("Dan")
+
+    def test_registry_is_initially_empty(self):
+        registry = DriverRegistry()
+        assert len(registry) == 0
+        assert registry.trip_logs == []
+
+    def test_registering_returns_the_drivers_trip_log(self):
+        registry = DriverRegistry()
+        trip_log = registry.register(Driver("Dan"))
+        assert trip_log == TripLog(Driver("Dan"))
+        assert registry.get_trip_log("Dan") is trip_log
+        assert "Dan" in registry
+        assert "Lauren" not in registry
+
+    def test_trip_logs_keep_registration_order(self):
+        registry = DriverRegistry()
+        registry.register(Driver("Lauren"))
+        registry.register(Driver("Dan"))
+        assert [log.driver.name for log in registry] == ["Lauren", "Dan"]
+
+    def test_duplicate_registration_keeps_original_trip_log(self):
+        registry = DriverRegistry()
+        trip_log = registry.register(Driver("Dan"))
+        registry.register(Driver("Lauren"))
+        assert registry.register(Driver("Dan")) is trip_log
+        assert [log.driver.name for log in registry] == ["Dan", "Lauren"]
+
+
+class TestAddTrip:
+
+    def test_trip_is_added_to_registered_driver(self):
+        trip = Trip(TripTime(1, 0), TripTime(2, 0), 60)
+        registry = DriverRegistry()
+        registry.register(Driver("Dan"))
+        registry.add_trip("Dan", trip)
+        assert registry.get_trip_log("Dan").trips == [trip]
+
+    def test_trip_logs_use_the_given_trip_store(self):
+        trip = Trip(TripTime(1, 0), TripTime(2, 0), 60)
+        registry = DriverRegistry(ArrayTripStore).add_trip("Dan", trip)
+        trip_log = registry.register(Driver("Dan"))
+        assert trip_log._trip_store.__class__ == ArrayTripStore
+        assert trip_log.trips == [trip]
+
+    def test_trip_is_held_until_driver_is_registered(self):
+        trip = Trip(TripTime(1, 0), TripTime(2, 0), 60)
+        registry = DriverRegistry().add_trip("Dan", trip)
+        assert len(registry) == 0
+        assert registry.register(Driver("Dan")).trips == [trip]
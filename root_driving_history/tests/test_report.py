@@ -6,9 +6,14 @@ import pytest
 
 from root_driving_history.report import create_driving_report
 from root_driving_history.report import create_summary_for_trip_log
+from root_driving_history.report import create_summary_report
+from root_driving_history.report import rank_summaries
 from root_driving_history.report import _add_no_trips_line
 from root_driving_history.report import _add_had_trips_line
 from root_driving_history.report import _remove_slow_and_fast_trips
+from root_driving_history.registry import DriverRegistry
+from root_driving_history.summary import DriverSummary
+from root_driving_history.summary import SummaryEngine
 from root_driving_history.trip_log import TripLog
 from root_driving_history.driver import Driver
 from root_driving_history.trip import Trip
@@ -151,6 +156,14 @@ class TestCreateDrivingReport:
         with pytest.raises(TypeError):
             create_driving_report([TripLog(Driver("Dan")), "not a log"])
 
+    def test_driver_registry_is_accepted(self):
+        registry = DriverRegistry()
+        registry.register(Driver("Lauren"))
+        registry.register(Driver("Dan"))
+        registry.add_trip("Dan", Trip(TripTime(0, 0), TripTime(1, 0), 60))
+        expected_output = "Dan: 60 miles @ 60 mph\nLauren: 0 miles"
+        assert create_driving_report(registry) == expected_output
+
     def test_trip_log_with_one_driver_and_no_trips(self):
         trip_logs = [TripLog(Driver("Dan"))]
         expected_output = "Dan: 0 miles"
@@ -249,6 +262,34 @@ class TestCreateDrivingReport:
         ]
         assert create_driving_report(trip_logs) == "Dan: 60 miles @ 60 mph"
 
+    def test_speed_thresholds_can_be_changed(self):
+        slow_trip = Trip(TripTime(0, 0), TripTime(1, 0), 4)
+        good_trip = Trip(TripTime(0, 0), TripTime(1, 0), 60)
+
+        trip_logs = [
+            TripLog(Driver("Dan")).add_trip(good_trip).add_trip(slow_trip)
+        ]
+        assert create_driving_report(trip_logs, slow_threshold=0) == \
+            "Dan: 64 miles @ 32 mph"
+        assert create_driving_report(trip_logs, fast_threshold=50) == \
+            "Dan: 0 miles"
+
+    def test_top_limits_report_to_drivers_with_most_miles(self):
+        trip_logs = [
+            TripLog(Driver("Kumi")),
+            TripLog(Driver("Dan")).add_trip(
+                Trip(TripTime(0, 0), TripTime(1, 0), 60)
+            ),
+            TripLog(Driver("Lauren")),
+        ]
+        assert create_driving_report(trip_logs, top=2) == \
+            "Dan: 60 miles @ 60 mph\nKumi: 0 miles"
+        assert create_driving_report(trip_logs, top=5) == \
+            create_driving_report(trip_logs)
+
+        with pytest.raises(ValueError):
+            create_driving_report(trip_logs, top=-1)
+
     def test_example_given_in_problem_statement(self):
         dan_trip_log = TripLog(Driver("Dan"))
         dan_trip_log.add_trip(Trip(TripTime(7, 15), TripTime(7, 45), 17.3))
@@ -267,3 +308,52 @@ class TestCreateDrivingReport:
 
         trip_logs = [dan_trip_log, lauren_trip_log, kumi_trip_log]
         assert create_driving_report(trip_logs) == expected
+
+
+class TestCreateSummaryReport:
+
+    def test_empty_list_returns_no_data_collected(self):
+        assert create_summary_report([]).lower() == "no data collected"
+
+    def test_parameters_not_list_of_driver_summaries_raises_error(self):
+        with pytest.raises(TypeError):
+            create_summary_report(42)
+
+        with pytest.raises(TypeError):
+            create_summary_report([TripLog(Driver("Dan"))])
+
+    def test_summary_engine_is_accepted(self):
+        engine = SummaryEngine()
+        engine.register_driver("Dan").register_driver("Lauren")
+        engine.register_driver("Kumi")
+        engine.add_trip("Dan", 435, 465, 17300)
+        engine.add_trip("Dan", 372, 392, 21800)
+        engine.add_trip("Lauren", 721, 796, 42000)
+
+        expected = "\n".join([
+            "Lauren: 42 miles @ 34 mph",
+            "Dan: 39 miles @ 47 mph",
+            "Kumi: 0 miles"
+        ])
+        assert create_summary_report(engine) == expected
+        assert create_summary_report(engine, top=2) == "\n".join(
+            expected.splitlines()[:2]
+        )
+
+
+class TestRankSummaries:
+
+    def test_most_miles_first_and_ties_in_original_order(self):
+        summaries = [
+            DriverSummary("Kumi"),
+            DriverSummary("Dan", 10, 1, 1),
+            DriverSummary("Bobby"),
+            DriverSummary("Lauren", 20, 1, 1),
+        ]
+        assert [summary.name for summary in rank_summaries(summaries)] == \
+            ["Lauren", "Dan", "Kumi", "Bobby"]
+        assert rank_summaries(summaries, top=1) == [summaries[3]]
+
+    def test_summary_engine_is_accepted(self):
+        engine = SummaryEngine().register_driver("Dan")
+        assert rank_summaries(engine) == engine.summaries
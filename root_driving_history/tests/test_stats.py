@@ -0,0 +1,50 @@
+"""Provides unit tests for the RunStats recorder"""
+
+import time
+
+import pytest
+
+from root_driving_history.stats import RunStats
+from root_driving_history.stats import peak_rss_bytes
+
+
+class TestRunStats:
+
+    def test_stages_are_recorded_in_order(self):
+        stats = RunStats()
+        with stats.stage("parse") as stage:
+            stage.counts["lines"] = 1200
+            time.sleep(0.01)
+        with stats.stage("render"):
+            pass
+
+        assert [stage.name for stage in stats.stages] == ["parse", "render"]
+        parse = stats.stages[0]
+        assert parse.wall_seconds >= 0.01
+        assert parse.cpu_seconds >= 0
+        assert parse.peak_rss_bytes > 0
+        assert parse.counts == {"lines": 1200}
+
+    def test_failed_stage_is_still_recorded(self):
+        stats = RunStats()
+        with pytest.raises(ValueError):
+            with stats.stage("parse"):
+                raise ValueError("bad line")
+        assert [stage.name for stage in stats.stages] == ["parse"]
+
+    def test_format_has_one_row_per_stage(self):
+        stats = RunStats()
+        with stats.stage("parse") as stage:
+            stage.counts["trips_accepted"] = 1500
+        with stats.stage("sort"):
+            pass
+
+        lines = stats.format().splitlines()
+        assert len(lines) == 3
+        assert lines[1].startswith("parse")
+        assert lines[1].endswith("trips_accepted=1,500")
+        assert lines[2].startswith("sort")
+
+
+def test_peak_rss_is_at_least_a_mebibyte():
+    assert peak_rss_bytes() >= 2 ** 20
@@ -0,0 +1,64 @@
+"""Provides unit tests for the TripStore implementations"""
+
+import pytest
+
+from root_driving_history.storage import ArrayTripStore
+from root_driving_history.storage import ListTripStore
+from root_driving_history.storage import TripStore
+from root_driving_history.trip import Trip
+from root_driving_history.trip import TripTime
+
+
+TRIPS = [
+    Trip(TripTime(7, 15), TripTime(7, 45), 17.3),
+    Trip(TripTime(0, 0), TripTime(23, 59), 60),
+    Trip(TripTime(12, 1), TripTime(13, 16), 42.0),
+]
+
+
+@pytest.fixture(params=[ListTripStore, ArrayTripStore])
+def store(request):
+    return request.param()
+
+
+class TestTripStore:
+
+    def test_interface_cannot_be_instantiated(self):
+        with pytest.raises(TypeError):
+            TripStore()
+
+    def test_new_store_is_empty(self, store):
+        assert len(store) == 0
+        assert list(store) == []
+
+    def test_trips_come_back_in_order(self, store):
+        for trip in TRIPS:
+            store.add_trip(trip)
+        assert len(store) == 3
+        assert list(store) == TRIPS
+        assert [trip.mph for trip in store] == [trip.mph for trip in TRIPS]
+
+    def test_stores_with_the_same_trips_are_equal(self, store):
+        other = ArrayTripStore()
+        for trip in TRIPS:
+            store.add_trip(trip)
+            other.add_trip(trip)
+        assert store == other
+        other.add_trip(TRIPS[0])
+        assert store != other
+        assert store != TRIPS
+
+
+class TestArrayTripStore:
+
+    def test_miles_come_back_as_floats(self):
+        store = ArrayTripStore()
+        store.add_trip(Trip(TripTime(1, 0), TripTime(2, 0), 60))
+        assert [trip.miles_driven.__class__ for trip in store] == [float]
+
+    def test_rejected_trip_is_not_stored(self):
+        store = ArrayTripStore()
+        with pytest.raises(OverflowError):
+            store.add_trip(Trip(TripTime(1, 0), TripTime(2, 0), 1e20))
+        assert len(store) == 0
+        assert list(store) == []
@@ -0,0 +1,188 @@
+"""Provides unit tests for the DriverSummary and SummaryEngine objects"""
+
+import json
+
+import pytest
+
+from root_driving_history.summary import DriverSummary, SpeedFilter
+from root_driving_history.summary import SummaryEngine
+
+
+class TestDriverSummary:
+
+    def test_summary_is_initially_empty(self):
+        summary = DriverSummary("Dan")
+        assert summary.isempty()
+        assert summary.total_miles == 0
+        assert summary.get_average_speed() is None
+
+    def test_trips_are_accumulated(self):
+        summary = DriverSummary("Dan").add_trip(60000, 60)
+        summary.add_trip(120500, 90)
+        assert summary.trip_count == 2
+        assert summary.milli_miles == 180500
+        assert summary.total_miles == 180.5
+        assert summary.total_hours == 2.5
+        assert summary.get_average_speed() == 180.5 / 2.5
+
+    def test_summaries_are_added(self):
+        summary = DriverSummary("Dan", 100, 1, 1)
+        summary.add_summary(DriverSummary("Dan", 200, 2, 2))
+        assert summary == DriverSummary("Dan", 300, 3, 3)
+
+
+class TestSpeedFilter:
+
+    def test_thresholds_are_inclusive(self):
+        speed_filter = SpeedFilter(5, 100)
+        assert speed_filter.accepts(5000, 60)
+        assert speed_filter.accepts(100000, 60)
+        assert not speed_filter.accepts(4999, 60)
+        assert not speed_filter.accepts(100001, 60)
+
+    def test_thresholds_are_taken_at_their_decimal_value(self):
+        # 0.1 and 0.3 mph are exactly 50 and 150 thousandths of a mile in
+        # 30 minutes, though the floats 0.1 and 0.3 are not exactly that
+        speed_filter = SpeedFilter(0.1, 0.3)
+        assert speed_filter.accepts(50, 30)
+        assert speed_filter.accepts(150, 30)
+        assert speed_filter.get_bounds() == {
+            "slow_miles": 30, "slow_minutes": 50,
+            "fast_miles": 30, "fast_minutes": 150,
+        }
+
+    def test_float_subclass_thresholds_are_accepted(self):
+        np = pytest.importorskip("numpy")
+        assert SpeedFilter(np.float64(5), np.float64(100)).get_bounds() == \
+            SpeedFilter(5, 100).get_bounds()
+
+    def test_non_finite_thresholds_raise_error(self):
+        with pytest.raises(ValueError):
+            SpeedFilter(float("nan"))
+        with pytest.raises(ValueError):
+            SpeedFilter(5, float("inf"))
+
+
+class TestSummaryEngine:
+
+    def test_engine_is_initially_empty(self):
+        assert SummaryEngine().summaries == []
+
+    def test_registered_drivers_keep_registration_order(self):
+        engine = SummaryEngine()
+        engine.register_driver("Lauren").register_driver("Dan")
+        engine.register_driver("Lauren")
+        assert [s.name for s in engine.summaries] == ["Lauren", "Dan"]
+
+    def test_trips_are_summed_for_registered_driver(self):
+        engine = SummaryEngine().register_driver("Dan")
+        engine.add_trip("Dan", 0, 60, 60000).add_trip("Dan", 60, 90, 20000)
+        assert engine.summaries == [DriverSummary("Dan", 80000, 90, 2)]
+
+    def test_trips_before_registration_are_kept(self):
+        engine = SummaryEngine().add_trip("Dan", 0, 60, 60000)
+        assert engine.summaries == []
+        engine.register_driver("Dan")
+        assert engine.summaries == [DriverSummary("Dan", 60000, 60, 1)]
+
+    def test_slow_and_fast_trips_are_discarded(self):
+        engine = SummaryEngine().register_driver("Dan")
+        engine.add_trip("Dan", 0, 60, 4999).add_trip("Dan", 0, 60, 100001)
+        assert engine.summaries[0].isempty()
+
+        engine.add_trip("Dan", 0, 60, 5000).add_trip("Dan", 0, 60, 100000)
+        assert engine.summaries[0].trip_count == 2
+
+    def test_accepted_and_discarded_trips_are_counted(self):
+        engine = SummaryEngine().register_driver("Dan")
+        engine.add_trip("Dan", 0, 60, 4000).add_trip("Dan", 0, 60, 50000)
+        engine.add_trip("Lauren", 0, 60, 50000).add_discarded_trips(2)
+        assert engine.accepted_trip_count == 2
+        assert engine.discarded_trip_count == 3
+
+        restored = SummaryEngine.from_state(engine.to_state())
+        assert restored.discarded_trip_count == 3
+
+        state = engine.to_state()
+        del state["discarded_trips"]
+        assert SummaryEngine.from_state(state).discarded_trip_count == 0
+
+    def test_thresholds_are_configurable(self):
+        engine = SummaryEngine(slow_threshold=0, fast_threshold=200)
+        engine.register_driver("Dan").add_trip("Dan", 0, 60, 150000)
+        assert engine.summaries[0].trip_count == 1
+
+    def test_trip_not_ending_after_start_raises_error(self):
+        with pytest.raises(ValueError):
+            SummaryEngine().add_trip("Dan", 60, 60, 10000)
+
+    def test_state_round_trips_through_json(self):
+        engine = SummaryEngine(slow_threshold=1, fast_threshold=90)
+        engine.add_trip("Lauren", 0, 60, 30000).register_driver("Dan")
+        engine.add_trip("Dan", 435, 465, 17300)
+        engine.add_trip("Dan", 372, 392, 21800)
+
+        restored = SummaryEngine.from_state(
+            json.loads(json.dumps(engine.to_state()))
+        )
+        assert restored == engine
+        assert restored.summaries == engine.summaries
+
+        restored.register_driver("Lauren")
+        assert restored.summaries[1] == \
+            DriverSummary("Lauren", 30000, 60, 1)
+
+    def test_states_with_float_totals_raise_error(self):
+        state = SummaryEngine().add_trip("Dan", 0, 60, 30000).to_state()
+        state["drivers"] = [["Dan", 30.0, 1.0, 1]]
+        with pytest.raises(ValueError):
+            SummaryEngine.from_state(state)
+
+    def test_engines_of_a_split_log_merge_exactly(self):
+        first = SummaryEngine().register_driver("Dan")
+        first.add_trip("Dan", 0, 60, 10001).add_trip("Lauren", 0, 60, 1)
+        second = SummaryEngine().add_trip("Dan", 0, 60, 20002)
+        second.register_driver("Lauren").register_driver("Dan")
+        second.add_trip("Kumi", 0, 60, 30003)
+
+        whole = SummaryEngine().register_driver("Dan")
+        whole.add_trip("Dan", 0, 60, 10001).add_trip("Lauren", 0, 60, 1)
+        whole.add_trip("Dan", 0, 60, 20002)
+        whole.register_driver("Lauren").register_driver("Dan")
+        whole.add_trip("Kumi", 0, 60, 30003)
+
+        merged = first.add_engine(second)
+        assert merged.summaries == whole.summaries
+        assert merged.get_summary("Kumi") == whole.get_summary("Kumi")
+        assert merged.discarded_trip_count == whole.discarded_trip_count == 1
+
+    def test_drivers_can_be_fed_by_id(self):
+        engine = SummaryEngine()
+        dan, lauren = engine.driver_id("Dan"), engine.driver_id("Lauren")
+        assert engine.driver_id("Dan") == dan
+        engine.register_id(lauren).register_id(dan)
+        engine.add_trip_for_id(dan, 0, 60, 60000)
+        engine.add_trip("Dan", 60, 90, 20000)
+        assert engine.summaries == [
+            DriverSummary("Lauren"), DriverSummary("Dan", 80000, 90, 2)
+        ]
+
+    def test_unknown_ids_raise_error(self):
+        engine = SummaryEngine()
+        engine.driver_id("Dan")
+        with pytest.raises(IndexError):
+            engine.register_id(1)
+        with pytest.raises(IndexError):
+            engine.add_trip_for_id(-1, 0, 60, 60000)
+
+    def test_summaries_are_copies(self):
+        engine = SummaryEngine().register_driver("Dan")
+        engine.get_summary("Dan").add_trip(60000, 60)
+        engine.summaries[0].add_trip(60000, 60)
+        assert engine.get_summary("Dan").isempty()
+        assert engine.get_summary("Bobby") == DriverSummary("Bobby")
+        assert "Bobby" not in engine
+
+    def test_invalid_state_raises_error(self):
+        with pytest.raises(ValueError):
+            SummaryEngine.from_state({"registered": []})
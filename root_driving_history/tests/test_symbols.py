@@ -0,0 +1,43 @@
+"""Provides unit tests for the DriverSymbols object"""
+
+import pytest
+
+from root_driving_history.symbols import DriverSymbols
+
+
+class TestDriverSymbols:
+
+    def test_table_is_initially_empty(self):
+        symbols = DriverSymbols()
+        assert len(symbols) == 0
+        assert symbols.names == []
+
+    def test_ids_are_dense_in_order_of_first_sight(self):
+        symbols = DriverSymbols()
+        assert [
+            symbols.intern(name) for name in ["Dan", "Lauren", "Dan", "Kumi"]
+        ] == [0, 1, 0, 2]
+        assert list(symbols) == ["Dan", "Lauren", "Kumi"]
+
+    def test_ids_map_back_to_names(self):
+        symbols = DriverSymbols()
+        symbols.intern("Dan")
+        symbols.intern("Lauren")
+        assert symbols.get_id("Lauren") == 1
+        assert symbols.get_name(1) == "Lauren"
+        assert "Dan" in symbols
+
+    def test_unknown_names_and_ids(self):
+        symbols = DriverSymbols()
+        symbols.intern("Dan")
+        assert symbols.get_id("Bobby") is None
+        assert "Bobby" not in symbols
+        for driver_id in [-1, 1]:
+            with pytest.raises(IndexError):
+                symbols.get_name(driver_id)
+
+    def test_names_are_a_copy(self):
+        symbols = DriverSymbols()
+        symbols.intern("Dan")
+        symbols.names.append("Lauren")
+        assert len(symbols) == 1
@@ -1,9 +1,12 @@
 """Provides unit tests for the TripTime and Trip object"""
 
+import attr
 import pytest
 
+from root_driving_history.summary import SpeedFilter
 from root_driving_history.trip import TripTime
 from root_driving_history.trip import Trip
+from root_driving_history.trip import round_ratio, to_milli_miles
 
 
 class TestTripStartTimeBeforeEndTime:
@@ -45,6 +48,51 @@ class TestTripStartTimeBeforeEndTime:
             )
 
 
+class TestCompactRepresentation:
+
+    def test_trip_and_trip_time_are_slotted(self):
+        trip = Trip(TripTime(1, 15), TripTime(2, 35), 10)
+        assert not hasattr(trip, "__dict__")
+        assert not hasattr(trip.start_time, "__dict__")
+
+    def test_trip_and_trip_time_are_immutable(self):
+        trip = Trip(TripTime(1, 15), TripTime(2, 35), 10)
+        with pytest.raises(attr.exceptions.FrozenInstanceError):
+            trip.miles_driven = 20
+
+        with pytest.raises(attr.exceptions.FrozenInstanceError):
+            trip.start_time.hour = 2
+
+    def test_equal_trips_hash_equally(self):
+        assert hash(Trip(TripTime(1, 15), TripTime(2, 35), 10)) == \
+            hash(Trip(TripTime(1, 15), TripTime(2, 35), 10))
+
+
+class TestFromMinutes:
+
+    def test_equals_validated_construction(self):
+        assert Trip.from_minutes(75, 155, 10300) == \
+            Trip(TripTime(1, 15), TripTime(2, 35), 10.3)
+
+    def test_start_not_before_end_raises_error(self):
+        with pytest.raises(ValueError):
+            Trip.from_minutes(75, 75, 10)
+
+        with pytest.raises(ValueError):
+            Trip.from_minutes(75, 74, 10)
+
+    def test_minutes_outside_of_one_day_raise_error(self):
+        with pytest.raises(ValueError):
+            Trip.from_minutes(-1, 10, 10)
+
+        with pytest.raises(ValueError):
+            Trip.from_minutes(0, 24 * 60, 10)
+
+    def test_trip_is_still_immutable(self):
+        with pytest.raises(attr.exceptions.FrozenInstanceError):
+            Trip.from_minutes(75, 155, 10).miles_driven = 20
+
+
 class TestDurationProperty:
 
     def test_duration_property_is_available(self):
@@ -55,6 +103,73 @@ class TestDurationProperty:
         assert Trip(TripTime(1, 15), TripTime(1, 16), 10).duration == 1
 
 
+class TestDerivedMetrics:
+
+    def test_metrics_match_for_both_constructors(self):
+        trip = Trip(TripTime(1, 15), TripTime(3, 0), 80)
+        fast_trip = Trip.from_minutes(75, 180, 80000)
+        assert (trip.duration, trip.mph) == (105, 80 / (105 / 60))
+        assert (fast_trip.duration, fast_trip.mph) == (105, 80 / (105 / 60))
+
+    def test_metrics_are_not_part_of_equality_or_repr(self):
+        trip = Trip(TripTime(1, 15), TripTime(3, 0), 80)
+        assert repr(trip) == \
+            "Trip(start_time=01:15, end_time=03:00, miles_driven=80)"
+
+    def test_milli_miles_are_derived_from_miles_driven(self):
+        assert Trip(TripTime(1, 15), TripTime(3, 0), 17.3).milli_miles == \
+            17300
+        assert Trip.from_minutes(75, 180, 17300).miles_driven == 17.3
+
+
+class TestFixedPoint:
+
+    def test_miles_are_taken_at_their_decimal_value(self):
+        assert to_milli_miles(17.3) == 17300
+        assert to_milli_miles(0.1) == 100
+        assert to_milli_miles(60) == 60000
+        assert to_milli_miles("21.8") == 21800
+
+    def test_float_subclasses_are_taken_at_their_decimal_value(self):
+        np = pytest.importorskip("numpy")
+        assert to_milli_miles(np.float64(17.3)) == 17300
+        assert Trip(TripTime(1, 15), TripTime(3, 0), np.float64(17.3)) \
+            .milli_miles == 17300
+
+    def test_floats_take_the_same_value_on_either_path(self):
+        # Floats below 2**40 miles are read by rounding their product, the
+        # others through their exact decimal value
+        for milli_miles in [1, 999, 17300, 123456789, 2 ** 40 * 1000 - 1]:
+            assert to_milli_miles(milli_miles / 1000) == milli_miles
+        assert to_milli_miles(1e20) == 10 ** 23
+        assert to_milli_miles(-0.5) == -500
+
+    def test_more_than_three_decimals_raise_error(self):
+        assert to_milli_miles("0.00200") == 2
+        for miles in [0.0005, "0.0015", 0.1 + 0.2]:
+            with pytest.raises(ValueError):
+                to_milli_miles(miles)
+        with pytest.raises(ValueError):
+            Trip(TripTime(1, 0), TripTime(2, 0), 4.9996)
+
+    def test_mph_agrees_with_the_speed_filter(self):
+        trip = Trip(TripTime(1, 0), TripTime(1, 3), 0.25)
+        assert trip.mph == 5
+        assert SpeedFilter().accepts(trip.milli_miles, trip.duration)
+
+    def test_non_finite_miles_raise_error(self):
+        with pytest.raises(ValueError):
+            to_milli_miles(float("nan"))
+        with pytest.raises(ValueError):
+            Trip(TripTime(1, 15), TripTime(3, 0), float("inf"))
+
+    def test_ratios_are_rounded_half_to_even(self):
+        assert [round_ratio(n, 2) for n in range(-3, 4)] == \
+            [-2, -1, 0, 0, 0, 1, 2]
+        assert round_ratio(2**70 + 1, 2) == 2**69
+        assert round_ratio(2, 3) == 1
+
+
 class TestMphProperty:
 
     def test_mph_property_is_available(self):
@@ -5,6 +5,8 @@ import pytest
 from root_driving_history.trip import Trip
 from root_driving_history.trip import TripTime
 from root_driving_history.driver import Driver
+from root_driving_history.storage import ArrayTripStore
+from root_driving_history.summary import DriverSummary
 from root_driving_history.trip_log import TripLog
 
 
@@ -34,6 +36,9 @@ class TestInterface:
     def test_provides_a_isempty_method(self):
         assert hasattr(TripLog, "isempty")
 
+    def test_trip_log_is_slotted(self):
+        assert not hasattr(TripLog(Driver("Dan")), "__dict__")
+
 
 class TestTripLogItems:
 
@@ -122,3 +127,76 @@ class TestGetAverageSpeed:
             (trip1.duration / 60 + trip2.duration / 60 + trip3.duration / 60)
         )
         assert trip_log.get_average_speed() == average_speed
+
+
+class TestGetFilteredSummary:
+
+    def test_summary_of_empty_trip_log_is_empty(self):
+        trip_log = TripLog(Driver("Dan"))
+        assert trip_log.get_filtered_summary() == DriverSummary("Dan")
+
+    def test_only_trips_inside_speed_thresholds_are_counted(self):
+        trip_log = TripLog(Driver("Dan"))
+        trip_log.add_trip(Trip(TripTime(1, 0), TripTime(2, 0), 60))
+        trip_log.add_trip(Trip(TripTime(1, 0), TripTime(2, 0), 4))
+        trip_log.add_trip(Trip(TripTime(1, 0), TripTime(2, 0), 101))
+        trip_log.add_trip(Trip(TripTime(4, 0), TripTime(5, 30), 120))
+
+        assert trip_log.get_total_miles_driven() == 285
+        assert trip_log.get_filtered_summary() == \
+            DriverSummary("Dan", 180000, 150, 2)
+
+    def test_other_speed_thresholds_are_summed_on_the_fly(self):
+        trip_log = TripLog(Driver("Dan"))
+        trip_log.add_trip(Trip(TripTime(1, 0), TripTime(2, 0), 60))
+        trip_log.add_trip(Trip(TripTime(1, 0), TripTime(2, 0), 4))
+        trip_log.add_trip(Trip(TripTime(1, 0), TripTime(2, 0), 101))
+
+        assert trip_log.get_filtered_summary(0, 1000) == \
+            DriverSummary("Dan", 165000, 180, 3)
+        assert trip_log.get_filtered_summary(50, 70) == \
+            DriverSummary("Dan", 60000, 60, 1)
+        assert trip_log.get_filtered_summary(5, 100) == \
+            trip_log.get_filtered_summary()
+
+    def test_filtered_trips_is_lazy(self):
+        good_trip = Trip(TripTime(1, 0), TripTime(2, 0), 60)
+        slow_trip = Trip(TripTime(1, 0), TripTime(2, 0), 4)
+        trip_log = TripLog(Driver("Dan"))
+        trip_log.add_trip(good_trip).add_trip(slow_trip)
+
+        filtered = trip_log.filtered_trips()
+        assert not isinstance(filtered, list)
+        assert list(filtered) == [good_trip]
+        assert list(trip_log.filtered_trips(0, 5)) == [slow_trip]
+        assert trip_log.trips == [good_trip, slow_trip]
+
+    def test_trip_store_can_be_chosen(self):
+        trip = Trip(TripTime(1, 0), TripTime(2, 0), 60)
+        array_log = TripLog(Driver("Dan"), trip_store=ArrayTripStore())
+        array_log.add_trip(trip)
+        assert array_log.trips == [trip]
+        assert array_log == TripLog(Driver("Dan")).add_trip(trip)
+        assert array_log.get_filtered_summary() == \
+            DriverSummary("Dan", 60000, 60, 1)
+
+        with pytest.raises(TypeError):
+            TripLog(Driver("Dan"), trip_store=[trip])
+
+    def test_filled_trip_store_is_counted(self):
+        store = ArrayTripStore()
+        store.add_trip(Trip(TripTime(1, 0), TripTime(2, 0), 60))
+        trip_log = TripLog(Driver("Dan"), trip_store=store)
+        assert trip_log.get_total_miles_driven() == 60
+        assert trip_log.get_filtered_summary() == \
+            DriverSummary("Dan", 60000, 60, 1)
+
+    def test_returned_summary_is_a_copy(self):
+        trip_log = TripLog(Driver("Dan"))
+        trip_log.get_filtered_summary().add_trip(60000, 60)
+        assert trip_log.get_filtered_summary().isempty()
+
+    def test_running_totals_do_not_affect_equality(self):
+        trip = Trip(TripTime(1, 0), TripTime(2, 0), 60)
+        assert TripLog(Driver("Dan")).add_trip(trip) == \
+            TripLog(Driver("Dan")).add_trip(trip)
@@ -0,0 +1,171 @@
+"""Provides unit tests for the TripTable object"""
+
+import pytest
+
+from root_driving_history.driver import Driver
+from root_driving_history.parser import parse_input_log
+from root_driving_history.report import _remove_slow_and_fast_trips
+from root_driving_history.report import create_driving_report
+from root_driving_history.trip import Trip
+from root_driving_history.trip import TripTime
+from root_driving_history.trip_log import TripLog
+
+np = pytest.importorskip("numpy")
+from root_driving_history.trip_table import TripTable  # noqa: E402
+
+
+PROBLEM_EXAMPLE = "\n".join([
+    "Driver Dan",
+    "Driver Lauren",
+    "Driver Kumi",
+    "Trip Dan 07:15 07:45 17.3",
+    "Trip Dan 06:12 06:32 21.8",
+    "Trip Lauren 12:01 13:16 42.0",
+    "Trip Lauren 12:01 13:16 200.0",
+])
+
+
+class TestInterface:
+
+    def test_columns_need_the_same_length(self):
+        with pytest.raises(ValueError):
+            TripTable(["Dan"], [0, 0], [0], [60], [60000])
+
+    def test_driver_ids_need_to_index_driver_names(self):
+        with pytest.raises(ValueError):
+            TripTable(["Dan"], [1], [0], [60], [60000])
+
+    def test_empty_table(self):
+        table = TripTable([], [], [], [], [])
+        assert len(table) == 0
+        assert table.to_summaries() == []
+
+
+class TestConstruction:
+
+    def test_from_trip_logs_keeps_trips_in_order(self):
+        trip_logs = [
+            TripLog(Driver("Dan")).add_trip(
+                Trip(TripTime(1, 15), TripTime(2, 35), 10)
+            ),
+            TripLog(Driver("Lauren")),
+        ]
+        table = TripTable.from_trip_logs(trip_logs)
+        assert table.driver_names == ["Dan", "Lauren"]
+        assert table.driver_ids.tolist() == [0]
+        assert table.start_minutes.tolist() == [75]
+        assert table.end_minutes.tolist() == [155]
+        assert table.miles_driven.tolist() == [10.0]
+
+    def test_from_trip_logs_rejects_other_objects(self):
+        with pytest.raises(TypeError):
+            TripTable.from_trip_logs(["not", "trip", "logs"])
+
+    def test_from_lines_matches_from_trip_logs(self):
+        from_lines = TripTable.from_lines(PROBLEM_EXAMPLE.splitlines())
+        from_logs = TripTable.from_trip_logs(parse_input_log(PROBLEM_EXAMPLE))
+        assert from_lines.driver_names == from_logs.driver_names
+        assert from_lines.driver_ids.tolist() == from_logs.driver_ids.tolist()
+        assert from_lines.miles_driven.tolist() == \
+            from_logs.miles_driven.tolist()
+
+    def test_from_lines_accepts_buffers(self):
+        from_buffer = TripTable.from_lines(PROBLEM_EXAMPLE.encode())
+        from_lines = TripTable.from_lines(PROBLEM_EXAMPLE.splitlines())
+        assert from_buffer.driver_names == from_lines.driver_names
+        assert from_buffer.miles_driven.tolist() == \
+            from_lines.miles_driven.tolist()
+
+    def test_from_lines_drops_unregistered_drivers(self):
+        table = TripTable.from_lines([
+            "Trip Lauren 01:00 02:00 60",
+            "Trip Dan 01:00 02:00 30",
+            "Driver Dan",
+        ])
+        assert table.driver_names == ["Dan"]
+        assert table.miles_driven.tolist() == [30.0]
+
+
+class TestReductions:
+
+    def test_duration_and_mph(self):
+        table = TripTable(
+            ["Dan"], [0, 0], [75, 75], [155, 135], [10000, 60000]
+        )
+        assert table.duration.tolist() == [80, 60]
+        assert table.mph.tolist() == [
+            Trip(TripTime(1, 15), TripTime(2, 35), 10).mph, 60.0
+        ]
+
+    def test_filter_by_speed_matches_remove_slow_and_fast_trips(self):
+        trip_logs = parse_input_log(PROBLEM_EXAMPLE)
+        table = TripTable.from_trip_logs(trip_logs).filter_by_speed()
+        expected = TripTable.from_trip_logs([
+            _remove_slow_and_fast_trips(trip_log) for trip_log in trip_logs
+        ])
+        assert table.miles_driven.tolist() == expected.miles_driven.tolist()
+        assert table.driver_ids.tolist() == expected.driver_ids.tolist()
+
+    def test_per_driver_sums_match_trip_logs(self):
+        trip_logs = parse_input_log(PROBLEM_EXAMPLE)
+        table = TripTable.from_trip_logs(trip_logs)
+        assert table.get_total_miles_driven().tolist() == [
+            trip_log.get_total_miles_driven() for trip_log in trip_logs
+        ]
+        assert table.get_trip_counts().tolist() == [2, 2, 0]
+
+        average_speed = table.get_average_speed()
+        assert average_speed[:2].tolist() == [
+            trip_logs[0].get_average_speed(), trip_logs[1].get_average_speed()
+        ]
+        assert np.isnan(average_speed[2])
+
+    def test_to_summaries_only_counts_trips_inside_limits(self):
+        summaries = TripTable.from_lines(
+            PROBLEM_EXAMPLE.splitlines()
+        ).to_summaries()
+        assert [summary.trip_count for summary in summaries] == [2, 1, 0]
+        assert summaries[1].total_miles == 42.0
+
+
+class TestCreateReport:
+
+    def test_matches_create_driving_report(self):
+        table = TripTable.from_lines(PROBLEM_EXAMPLE.splitlines())
+        trip_logs = parse_input_log(PROBLEM_EXAMPLE)
+        assert table.create_report() == create_driving_report(trip_logs)
+        assert table.create_report(top=1) == \
+            create_driving_report(trip_logs, top=1)
+        assert table.create_report(None, 0, 1000) == \
+            create_driving_report(trip_logs, None, 0, 1000)
+
+    def test_rounds_half_to_even_and_keeps_ties_in_order(self):
+        table = TripTable.from_lines([
+            "Driver Kumi",
+            "Driver Dan",
+            "Driver Lauren",
+            "Trip Dan 01:00 02:00 10.5",
+            "Trip Lauren 01:00 02:00 11.5",
+            "Trip Kumi 01:00 02:00 10.5",
+        ])
+        assert table.create_report() == "\n".join([
+            "Lauren: 12 miles @ 12 mph",
+            "Kumi: 10 miles @ 10 mph",
+            "Dan: 10 miles @ 10 mph",
+        ])
+
+    def test_empty_table(self):
+        assert TripTable.from_lines([]).create_report() == \
+            "No data collected"
+
+    def test_negative_top_raises_error(self):
+        with pytest.raises(ValueError):
+            TripTable.from_lines([]).create_report(top=-1)
+
+    def test_sums_past_float_precision_are_exact(self):
+        table = TripTable(
+            ["Dan", "Kumi"], [0, 1, 0], [0, 0, 0], [60, 60, 60],
+            [2 ** 53 + 1, 5, 1]
+        )
+        assert table.get_total_milli_miles().tolist() == [2 ** 53 + 2, 5]
+        assert table.get_total_minutes().tolist() == [120, 60]
@@ -66,3 +66,18 @@ def test_subtraction_between_two_times():
 def test_addition_not_implemented():
     with pytest.raises(NotImplementedError):
         TripTime(2, 35) + TripTime(3, 0)
+
+
+def test_from_minute_of_day():
+    assert TripTime.from_minute_of_day(0) == TripTime(0, 0)
+    assert TripTime.from_minute_of_day(75) == TripTime(1, 15)
+    assert TripTime.from_minute_of_day(1439) == TripTime(23, 59)
+    assert TripTime.from_minute_of_day(75) is TripTime.from_minute_of_day(75)
+
+
+def test_from_minute_of_day_outside_of_one_day_raises_error():
+    with pytest.raises(ValueError):
+        TripTime.from_minute_of_day(-1)
+
+    with pytest.raises(ValueError):
+        TripTime.from_minute_of_day(24 * 60)
@@ -1,11 +1,78 @@
 """Contains the Trip object definition"""
 
-from typing import Any, Optional
+from fractions import Fraction
+from typing import Any, Optional, Union
 
 import attr
 
 
-@attr.s(repr=False)
+# Trips averaging a speed outside of this range (in mph) are discarded
+SLOW_THRESHOLD = 5
+FAST_THRESHOLD = 100
+
+MINUTES_PER_DAY = 24 * 60
+
+# Distances are counted in whole thousandths of a mile (and durations in
+# whole minutes), so totals are exact integers whatever order they are
+# added up in
+MILLI_MILES_PER_MILE = 1000
+# Below this many miles floats are more than four times finer than a
+# thousandth, so no two distances of three decimals share a float and
+# to_milli_miles can skip the exact Fraction for them
+_FLOAT_FAST_PATH_LIMIT = 2.0 ** 40
+
+
+def decimal_fraction(value: Union[int, float, str]) -> Fraction:
+    """Returns ``value`` as an exact fraction.
+
+    Floats are taken at their shortest decimal representation, so 17.3 is
+    173/10 rather than the binary float closest to it.
+    """
+    if isinstance(value, float):
+        value = float.__repr__(value)
+    try:
+        return Fraction(value)
+    except ValueError:
+        raise ValueError(
+            "{!r} is not a finite decimal number".format(value)
+        )
+
+
+def to_milli_miles(miles_driven: Union[int, float, str]) -> int:
+    """Returns ``miles_driven`` in whole thousandths of a mile, so 17.3 is
+    exactly 17300.
+
+    Distances with more than three decimals raise ValueError: rounding
+    them would shift the totals and disagree with the trip's own mph.
+    """
+    if isinstance(miles_driven, float) and \
+            -_FLOAT_FAST_PATH_LIMIT < miles_driven < _FLOAT_FAST_PATH_LIMIT:
+        # A float of at most three decimals is the float closest to its
+        # thousandths, which the product rounds back to
+        milli_miles = round(miles_driven * MILLI_MILES_PER_MILE)
+        if milli_miles / MILLI_MILES_PER_MILE == miles_driven:
+            return milli_miles
+    milli_miles = decimal_fraction(miles_driven) * MILLI_MILES_PER_MILE
+    if milli_miles.denominator != 1:
+        raise ValueError(
+            "{!r} miles has more than three decimals".format(miles_driven)
+        )
+    return milli_miles.numerator
+
+
+def round_ratio(numerator: int, denominator: int) -> int:
+    """Rounds ``numerator / denominator`` half to even, like ``round`` does
+    for floats, but exactly."""
+    quotient, remainder = divmod(numerator, denominator)
+    doubled_remainder = 2 * remainder
+    if doubled_remainder > denominator or (
+            doubled_remainder == denominator and quotient % 2
+    ):
+        quotient += 1
+    return quotient
+
+
+@attr.s(repr=False, slots=True, frozen=True)
 class TripTime(object):
     hour: int = attr.ib()
     min: int = attr.ib()
@@ -24,6 +91,21 @@ class TripTime(object):
         if value < 0 or value > 59:
             raise ValueError("'hour' should be between 0 and 59, inclusive")
 
+    @classmethod
+    def from_minute_of_day(cls, minute: int) -> "TripTime":
+        """Returns the shared TripTime for ``minute`` minutes past midnight.
+
+        TripTimes are immutable, so every one of the 1440 possible values is
+        built (and validated) once and then reused.
+        """
+        if not 0 <= minute < MINUTES_PER_DAY:
+            raise ValueError(
+                "'minute' should be between 0 and {}, inclusive".format(
+                    MINUTES_PER_DAY - 1
+                )
+            )
+        return _TRIP_TIMES[minute]
+
     def __sub__(self, other: "TripTime") -> int:
         """Returns the number of minutes difference between two times."""
         hours_difference = self.hour - other.hour
@@ -37,11 +119,23 @@ class TripTime(object):
         return "{:02}:{:02}".format(self.hour, self.min)
 
 
-@attr.s
+_TRIP_TIMES = [
+    TripTime(*divmod(minute, 60)) for minute in range(MINUTES_PER_DAY)
+]
+# Shared int objects for every possible duration (CPython only caches the
+# ints up to 256)
+_DURATIONS = list(range(MINUTES_PER_DAY))
+
+
+@attr.s(slots=True, frozen=True)
 class Trip(object):
     start_time: TripTime = attr.ib()
     end_time: TripTime = attr.ib()
     miles_driven: float = attr.ib()
+    # Derived once from the fields above, see __attrs_post_init__. Both are
+    # ints (the durations shared), so they cost a slot each and no object
+    _milli_miles: int = attr.ib(init=False, eq=False, repr=False)
+    _duration: int = attr.ib(init=False, eq=False, repr=False)
 
     @start_time.validator
     def starts_before_end_time(
@@ -52,10 +146,55 @@ class Trip(object):
                 'start_time should be before end_time'
             )
 
+    @classmethod
+    def from_minutes(
+            cls, start_minute: int, end_minute: int, milli_miles: int
+    ) -> "Trip":
+        """Trusted constructor for already tokenized input.
+
+        A single fused range check replaces the attrs validator chain of
+        Trip and both TripTimes; the result is equal to the validated
+        ``Trip(TripTime(...), TripTime(...), milli_miles / 1000)``.
+        """
+        if not 0 <= start_minute < end_minute < MINUTES_PER_DAY:
+            raise ValueError(
+                "start_time should be before end_time, both within one day"
+            )
+
+        trip = object.__new__(cls)
+        _set = object.__setattr__
+        _set(trip, "start_time", _TRIP_TIMES[start_minute])
+        _set(trip, "end_time", _TRIP_TIMES[end_minute])
+        _set(trip, "miles_driven", milli_miles / MILLI_MILES_PER_MILE)
+        _set(trip, "_milli_miles", milli_miles)
+        _set(trip, "_duration", _DURATIONS[end_minute - start_minute])
+        return trip
+
+    def __attrs_post_init__(self) -> None:
+        object.__setattr__(
+            self, "_milli_miles", to_milli_miles(self.miles_driven)
+        )
+        duration = self.end_time - self.start_time
+        object.__setattr__(
+            self, "_duration",
+            _DURATIONS[duration] if 0 <= duration < MINUTES_PER_DAY
+            else duration
+        )
+
+    @property
+    def milli_miles(self) -> int:
+        """``miles_driven`` in whole thousandths of a mile."""
+        return self._milli_miles
+
     @property
     def duration(self) -> int:
-        return self.end_time - self.start_time
+        return self._duration
 
     @property
     def mph(self) -> float:
-        return self.miles_driven / ((self.end_time - self.start_time) / 60)
+        # Worked out on every read: a float per trip would cost more memory
+        # than the division does time. The exact integers give the speed
+        # SpeedFilter compares, correctly rounded
+        return self._milli_miles * 60 / (
+            self._duration * MILLI_MILES_PER_MILE
+        )
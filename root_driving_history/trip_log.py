@@ -1,41 +1,105 @@
 """Contains the TripLog and TripLogItem definition"""
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import attr
 
 from .driver import Driver
+from .storage import ListTripStore, TripStore
+from .summary import DEFAULT_SPEED_FILTER, DriverSummary, SpeedFilter
+from .trip import FAST_THRESHOLD, SLOW_THRESHOLD
 from .trip import Trip
 
 
-@attr.s
+@attr.s(slots=True)
 class TripLog(object):
     driver: Driver = attr.ib()
-    _trips: List[Trip] = attr.ib(init=False, default=attr.Factory(list))
+    _trip_store: TripStore = attr.ib(
+        default=attr.Factory(ListTripStore), kw_only=True
+    )
+    # Running totals kept up to date by add_trip; the filtered ones only
+    # count trips inside the default speed thresholds
+    _summary: DriverSummary = attr.ib(init=False, eq=False, repr=False)
+    _filtered_summary: DriverSummary = attr.ib(
+        init=False, eq=False, repr=False
+    )
 
     @driver.validator
     def is_a_driver(self, attribute, value) -> Optional[TypeError]:
         if value.__class__ != Driver:
             raise TypeError("'driver' needs to be a Driver object")
 
+    @_trip_store.validator
+    def is_a_trip_store(self, attribute, value) -> Optional[TypeError]:
+        if not isinstance(value, TripStore):
+            raise TypeError("'trip_store' needs to be a TripStore object")
+
+    def __attrs_post_init__(self) -> None:
+        self._summary = DriverSummary(self.driver.name)
+        self._filtered_summary = DriverSummary(self.driver.name)
+        # A store that already holds trips is taken over as is
+        for trip in self._trip_store:
+            self._count_trip(trip)
+
     @property
     def trips(self) -> List[Trip]:
-        return self._trips
+        """A list of the logged trips, built from the TripStore."""
+        return list(self._trip_store)
 
     def isempty(self) -> bool:
-        return len(self._trips) == 0
+        return len(self._trip_store) == 0
 
     def add_trip(self, trip: Trip) -> "TripLog":
-        self._trips.append(trip)
+        self._trip_store.add_trip(trip)
+        self._count_trip(trip)
         return self
 
+    def _count_trip(self, trip: Trip) -> None:
+        milli_miles = trip.milli_miles
+        duration = trip.duration
+        self._summary.add_trip(milli_miles, duration)
+        if DEFAULT_SPEED_FILTER.accepts(milli_miles, duration):
+            self._filtered_summary.add_trip(milli_miles, duration)
+
+    def get_summary(self) -> DriverSummary:
+        """Totals of all logged trips, whatever their speed."""
+        return attr.evolve(self._summary)
+
     def get_total_miles_driven(self) -> float:
-        return sum([trip.miles_driven for trip in self._trips])
+        return self._summary.total_miles
 
     def get_average_speed(self) -> Optional[float]:
-        if self.isempty():
-            return None
+        return self._summary.get_average_speed()
+
+    def filtered_trips(
+            self,
+            slow_threshold: float = SLOW_THRESHOLD,
+            fast_threshold: float = FAST_THRESHOLD
+    ) -> Iterator[Trip]:
+        """Lazily yields the trips inside the speed thresholds."""
+        accepts = SpeedFilter(slow_threshold, fast_threshold).accepts
         return (
-            sum([trip.miles_driven for trip in self._trips]) /
-            sum([trip.duration / 60 for trip in self._trips])
+            trip
+            for trip in self._trip_store
+            if accepts(trip.milli_miles, trip.duration)
         )
+
+    def get_filtered_summary(
+            self,
+            slow_threshold: float = SLOW_THRESHOLD,
+            fast_threshold: float = FAST_THRESHOLD
+    ) -> DriverSummary:
+        """Totals of the trips inside the speed thresholds.
+
+        The totals for the default thresholds are kept up to date by
+        ``add_trip``; other thresholds are summed on the fly, without
+        copying any trips.
+        """
+        defaults = (SLOW_THRESHOLD, FAST_THRESHOLD)
+        if (slow_threshold, fast_threshold) == defaults:
+            return attr.evolve(self._filtered_summary)
+
+        summary = DriverSummary(self.driver.name)
+        for trip in self.filtered_trips(slow_threshold, fast_threshold):
+            summary.add_trip(trip.milli_miles, trip.duration)
+        return summary
@@ -0,0 +1,306 @@
+"""Contains the TripTable definition, a columnar alternative to TripLogs
+
+Requires NumPy, which is only needed when this module is imported.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import attr
+import numpy as np
+
+from .parser import BUFFER_TYPES, Buffer, DRIVER_TOKEN
+from .parser import tokenize, tokenize_buffer
+from .report import HAD_TRIPS_LINE, NO_DATA_REPORT, NO_TRIPS_LINE
+from .summary import DriverSummary, SpeedFilter
+from .symbols import DriverSymbols
+from .trip import FAST_THRESHOLD, MILLI_MILES_PER_MILE, SLOW_THRESHOLD
+from .trip_log import TripLog
+
+
+@attr.s(eq=False, slots=True)
+class TripTable(object):
+    """Trips of many drivers held in contiguous arrays.
+
+    Row ``i`` is a trip of ``driver_names[driver_ids[i]]`` and rows keep the
+    order the trips were logged in. Distances are whole thousandths of a
+    mile, so per-driver totals are exact integer sums, equal to the totals
+    of the equivalent TripLogs.
+    """
+    driver_names: List[str] = attr.ib(converter=list)
+    driver_ids: np.ndarray = attr.ib(
+        converter=lambda values: np.asarray(values, dtype=np.int64)
+    )
+    start_minutes: np.ndarray = attr.ib(
+        converter=lambda values: np.asarray(values, dtype=np.int16)
+    )
+    end_minutes: np.ndarray = attr.ib(
+        converter=lambda values: np.asarray(values, dtype=np.int16)
+    )
+    milli_miles: np.ndarray = attr.ib(
+        converter=lambda values: np.asarray(values, dtype=np.int64)
+    )
+
+    @driver_ids.validator
+    def has_one_row_per_trip(
+            self, attribute: attr.Attribute, value: Any
+    ) -> Optional[ValueError]:
+        lengths = {
+            len(value), len(self.start_minutes),
+            len(self.end_minutes), len(self.milli_miles)
+        }
+        if len(lengths) != 1:
+            raise ValueError("every TripTable column needs the same length")
+        if len(value) and (
+                value.min() < 0 or value.max() >= len(self.driver_names)
+        ):
+            raise ValueError("'driver_ids' need to index 'driver_names'")
+
+    @classmethod
+    def from_trip_logs(cls, trip_logs: Iterable[TripLog]) -> "TripTable":
+        trip_logs = list(trip_logs)
+        if any([trip_log.__class__ != TripLog for trip_log in trip_logs]):
+            raise TypeError("'trip_logs' should be a list of TripLog objects")
+
+        columns = _Columns()
+        for driver_id, trip_log in enumerate(trip_logs):
+            for trip in trip_log.trips:
+                columns.append(
+                    driver_id,
+                    trip.start_time.hour * 60 + trip.start_time.min,
+                    trip.end_time.hour * 60 + trip.end_time.min,
+                    trip.milli_miles
+                )
+
+        return columns.to_table(
+            [trip_log.driver.name for trip_log in trip_logs]
+        )
+
+    @classmethod
+    def from_lines(
+            cls, lines: Union[Iterable[str], Buffer]
+    ) -> "TripTable":
+        """Tokenizes a log straight into columns, without Trip objects.
+
+        ``lines`` is an iterable of text lines or a bytes-like buffer such
+        as an ``mmap``. Drivers are numbered in registration order; trips of
+        names that are never registered are dropped, as in
+        ``parse_input_log``.
+        """
+        tokens = tokenize_buffer(lines) \
+            if isinstance(lines, BUFFER_TYPES) \
+            else tokenize(lines)
+        symbols = DriverSymbols()
+        registered: Dict[int, None] = {}
+        columns = _Columns()
+        for token in tokens:
+            driver_id = symbols.intern(token[1])
+            if token[0] == DRIVER_TOKEN:
+                registered[driver_id] = None
+            else:
+                columns.append(driver_id, *token[2:])
+
+        table = columns.to_table(symbols.names)
+        new_ids = np.full(len(symbols), -1, dtype=np.int64)
+        new_ids[list(registered)] = np.arange(len(registered))
+        rows = new_ids[table.driver_ids] >= 0
+        return cls(
+            list(map(symbols.get_name, registered)),
+            new_ids[table.driver_ids][rows],
+            table.start_minutes[rows],
+            table.end_minutes[rows],
+            table.milli_miles[rows],
+        )
+
+    def __len__(self) -> int:
+        return len(self.driver_ids)
+
+    @property
+    def duration(self) -> np.ndarray:
+        return self.end_minutes.astype(np.int64) - self.start_minutes
+
+    @property
+    def miles_driven(self) -> np.ndarray:
+        return self.milli_miles / MILLI_MILES_PER_MILE
+
+    @property
+    def mph(self) -> np.ndarray:
+        return self.miles_driven / (self.duration / 60)
+
+    def filter_by_speed(
+            self,
+            slow_threshold: float = SLOW_THRESHOLD,
+            fast_threshold: float = FAST_THRESHOLD
+    ) -> "TripTable":
+        """Keeps the trips inside the thresholds, compared exactly like
+        ``SpeedFilter`` does."""
+        bounds = SpeedFilter(slow_threshold, fast_threshold).get_bounds()
+        milli_miles, duration = self.milli_miles, self.duration
+        largest_value = max(
+            np.abs(milli_miles).max(initial=0), duration.max(initial=0)
+        )
+        if max(bounds.values()) * int(largest_value) >= 2 ** 63:
+            # Python ints where the products could overflow int64
+            milli_miles = milli_miles.astype(object)
+            duration = duration.astype(object)
+        rows = (
+            bounds["slow_minutes"] * duration
+            <= bounds["slow_miles"] * milli_miles
+        ) & (
+            bounds["fast_miles"] * milli_miles
+            <= bounds["fast_minutes"] * duration
+        )
+        rows = np.asarray(rows, dtype=bool)
+        return TripTable(
+            self.driver_names,
+            self.driver_ids[rows],
+            self.start_minutes[rows],
+            self.end_minutes[rows],
+            self.milli_miles[rows],
+        )
+
+    def get_trip_counts(self) -> np.ndarray:
+        return np.bincount(self.driver_ids, minlength=len(self.driver_names))
+
+    def get_total_milli_miles(self) -> np.ndarray:
+        return self._sum_by_driver(self.milli_miles)
+
+    def get_total_minutes(self) -> np.ndarray:
+        return self._sum_by_driver(self.duration)
+
+    def get_total_miles_driven(self) -> np.ndarray:
+        return self.get_total_milli_miles() / MILLI_MILES_PER_MILE
+
+    def get_total_hours(self) -> np.ndarray:
+        return self.get_total_minutes() / 60
+
+    def get_average_speed(self) -> np.ndarray:
+        """Per-driver average mph, NaN for drivers without trips."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.get_total_milli_miles() * 60 / (
+                self.get_total_minutes() * MILLI_MILES_PER_MILE
+            )
+
+    def to_summaries(
+            self,
+            slow_threshold: float = SLOW_THRESHOLD,
+            fast_threshold: float = FAST_THRESHOLD
+    ) -> List[DriverSummary]:
+        """Per-driver totals of the trips inside the speed limits, ready
+        for ``create_summary_report``."""
+        table = self.filter_by_speed(slow_threshold, fast_threshold)
+        return [
+            DriverSummary(name, milli_miles, minutes, count)
+            for name, milli_miles, minutes, count in zip(
+                table.driver_names,
+                table.get_total_milli_miles().tolist(),
+                table.get_total_minutes().tolist(),
+                table.get_trip_counts().tolist(),
+            )
+        ]
+
+    def create_report(
+            self,
+            top: Optional[int] = None,
+            slow_threshold: float = SLOW_THRESHOLD,
+            fast_threshold: float = FAST_THRESHOLD
+    ) -> str:
+        """Renders the same report as ``create_driving_report`` with the
+        totals, rounding and ranking done on whole columns."""
+        if top is not None and top < 0:
+            raise ValueError("'top' should not be negative")
+        if not self.driver_names:
+            return NO_DATA_REPORT
+
+        table = self.filter_by_speed(slow_threshold, fast_threshold)
+        milli_miles = table.get_total_milli_miles()
+        minutes = table.get_total_minutes()
+        trip_counts = table.get_trip_counts()
+        rounded_miles = _round_ratio(
+            milli_miles, np.full_like(milli_miles, MILLI_MILES_PER_MILE)
+        ).tolist()
+        # Drivers without trips get a placeholder denominator; their line
+        # has no speed
+        rounded_speeds = _round_ratio(
+            milli_miles * 60,
+            np.where(minutes > 0, minutes, 1) * MILLI_MILES_PER_MILE
+        ).tolist()
+        # A stable sort of the negated totals keeps ties in registration
+        # order like sorted(..., reverse=True)
+        ranking = np.argsort(-milli_miles, kind="stable")[:top].tolist()
+        return "\n".join([
+            HAD_TRIPS_LINE.format(
+                name=table.driver_names[index],
+                total_miles=rounded_miles[index],
+                avg_speed=rounded_speeds[index]
+            )
+            if trip_counts[index]
+            else NO_TRIPS_LINE.format(name=table.driver_names[index])
+            for index in ranking
+        ])
+
+    def _sum_by_driver(self, values: np.ndarray) -> np.ndarray:
+        # bincount sums its weights as float64, which is exact as long as
+        # no partial sum can reach 2**53
+        largest_value = int(np.abs(values).max(initial=0))
+        if largest_value * len(values) < 2 ** 53:
+            return np.bincount(
+                self.driver_ids, weights=values,
+                minlength=len(self.driver_names)
+            ).astype(np.int64)
+
+        # Otherwise group the rows by driver and sum each group in int64
+        # (add.at would be exact too, but is slow before NumPy 1.25)
+        trip_counts = self.get_trip_counts()
+        starts = np.cumsum(trip_counts) - trip_counts
+        has_trips = trip_counts > 0
+        order = np.argsort(self.driver_ids, kind="stable")
+        totals = np.zeros(len(self.driver_names), dtype=np.int64)
+        totals[has_trips] = np.add.reduceat(values[order], starts[has_trips])
+        return totals
+
+
+def _round_ratio(
+        numerators: np.ndarray, denominators: np.ndarray
+) -> np.ndarray:
+    """``trip.round_ratio`` over whole columns: exact, half to even."""
+    quotients, remainders = np.divmod(numerators, denominators)
+    doubled_remainders = 2 * remainders
+    return quotients + (
+        (doubled_remainders > denominators)
+        | ((doubled_remainders == denominators) & (quotients % 2 == 1))
+    )
+
+
+class _Columns(object):
+    """Compact append-only buffers used while building a TripTable."""
+
+    def __init__(self):
+        self.driver_ids = array("q")
+        self.start_minutes = array("h")
+        self.end_minutes = array("h")
+        self.milli_miles = array("q")
+
+    def append(
+            self,
+            driver_id: int,
+            start_minute: int,
+            end_minute: int,
+            milli_miles: int
+    ) -> None:
+        if start_minute >= end_minute:
+            raise ValueError("start_time should be before end_time")
+
+        self.driver_ids.append(driver_id)
+        self.start_minutes.append(start_minute)
+        self.end_minutes.append(end_minute)
+        self.milli_miles.append(milli_miles)
+
+    def to_table(self, driver_names: List[str]) -> TripTable:
+        return TripTable(
+            driver_names,
+            np.frombuffer(self.driver_ids, dtype=np.int64),
+            np.frombuffer(self.start_minutes, dtype=np.int16),
+            np.frombuffer(self.end_minutes, dtype=np.int16),
+            np.frombuffer(self.milli_miles, dtype=np.int64),
+        )